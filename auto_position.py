@@ -5,184 +5,261 @@ the NFL game playing in the user's browser.
 Public API:
 
     decide_position() -> Decision
+    decide_positions() -> [Decision, ...]   one per NFL game window
 
     Decision is a dataclass:
-      kind:    'ticker' | 'no_ticker' | 'unreviewed' | 'no_game' | 'unsupported'
-      rect:    Optional[(x, y, w, h)] in absolute screen pixels (only for 'ticker')
+      kind:    'ticker' | 'ticker_guess' | 'no_ticker' | 'unreviewed' |
+               'no_game' | 'unsupported'
+      rect:    Optional[(x, y, w, h)] in absolute screen pixels (only for
+               'ticker' and 'ticker_guess')
       detail:  short human-readable message (for logging)
+      window:  the browser window the decision is about, if any
+      monitor: (left, top, width, height) of the monitor that window is on
+      timings: milliseconds spent per stage: 'enumerate' and 'filter'
+               (listing windows and the title checks, only when the
+               watcher's snapshot wasn't used), 'parse' (titles),
+               'resolve' (game and ticker lookups), 'monitor' (window rect
+               and monitor) and 'geometry' (placement); callers may add
+               their own, e.g. ScoreBlocker's 'import'
+      windows_examined: top-level windows the enumeration looked at
 
 ScoreBlocker calls decide_position() on double-click and uses `kind` to pick
-a flash colour and whether to move the overlay.
-
-Windows-only for now (browser-window enumeration uses Win32 APIs). On other
-OSes decide_position() returns kind='unsupported'.
+a flash colour and whether to move the overlay. In follow mode it then
+passes `window` to follow_window(), which re-decides (decide_for_window())
+whenever that window moves, changes monitor or switches to another game.
+Its "place all" key resolves every game at once with decide_positions() and
+pairs the running overlays with them (plan_overlays()).
+
+'ticker_guess' covers the start of a new season, before the data has been
+regenerated: the game's (network, year) cell isn't annotated yet, so the rect
+comes from the nearest year the same network has a ticker annotated.
+
+Windows and monitors come from a WindowSource backend (see window_sources):
+Win32 on Windows, X11 (libxcb) elsewhere when $DISPLAY is set. Without one,
+decide_position() returns kind='unsupported'. set_window_source() swaps the
+backend.
+
+After the first call, a background WindowWatcher keeps the list of candidate
+browser windows current from window-change events, and decide_position()
+reads that list instead of enumerating windows itself. warm_up() does all of
+that ahead of time, so even the first call is as fast as later ones.
 """
 
 from __future__ import annotations
 
-import re
 import sys
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from time import perf_counter
+
+from title_rules import DEFAULT_RULES, GameTitle, TitleRules
+from window_sources import (
+    WindowFollower, WindowSource, WindowWatcher, default_source,
+)
 
+# Lookup tables come from the compiled data pack (auto_scoreblock_data.sbpack)
+# when present; scoreblock_pack falls back to the auto_scoreblock_data literal.
 try:
-    from auto_scoreblock_data import SCORE_REGIONS, GAMES, NETWORK_SLUG
+    from scoreblock_pack import load_data
+    _data = load_data()
+    SCORE_REGIONS = _data.SCORE_REGIONS
+    GAMES = _data.GAMES
+    NETWORK_SLUG = _data.NETWORK_SLUG
 except ImportError:
+    _data = None
     SCORE_REGIONS = {}
     GAMES = {}
     NETWORK_SLUG = {}
 
 
-BROWSER_EXES = ('chrome.exe', 'firefox.exe', 'msedge.exe')
+# Game pages are recognised by their browser tab titles, one rule per site
+# (nfl.com, ESPN, YouTube TV, NFL+, Sunday Ticket, Fubo; see title_rules).
+# set_title_rules() swaps the rule set.
+TITLE_RULES = TitleRules(DEFAULT_RULES)
 
-# nfl.com Game Center page titles look like:
-#   "Los Angeles Chargers at Denver Broncos 2024 REG 6 - Game Center"
-# Browsers append their own suffix (" - Google Chrome", " — Mozilla Firefox",
-# " - Microsoft​Edge"). The regex matches the embedded page title.
-TITLE_RE = re.compile(
-    r'(.+?) at (.+?) (\d{4}) (REG|POST) (\d+)',
-    re.IGNORECASE,
-)
+# Parsed titles kept by _parse_title(); more than a busy desktop has windows,
+# so re-reading unchanged titles never misses.
+TITLE_CACHE_SIZE = 1024
 
 EDGE_SNAP_THRESHOLD = 0.01
 
+# Height in pixels of each browser's tab strip and toolbar (no bookmarks
+# bar) at 100% scaling, for playback in a normal browser window where the
+# page area can't be measured. ScoreBlocker isn't DPI-aware, so Windows
+# reports every window in these unscaled units. Other backends' rects are in
+# physical pixels at whatever scale the desktop uses, so they aren't
+# subtracted there (see WindowSource.unscaled_rects): X11 has no
+# content_rect(), and its videos are placed in the whole client area.
+BROWSER_CHROME_HEIGHTS = {
+    'chrome': 87, 'chromium': 87, 'chromium-browser': 87,
+    'msedge': 83,
+    'firefox': 85, 'firefox-bin': 85, 'firefox-esr': 85,
+}
+DEFAULT_CHROME_HEIGHT = 85
+
 
 @dataclass
 class Decision:
     kind: str
     rect: tuple[int, int, int, int] | None = None
     detail: str = ''
+    window: int | None = None
+    monitor: tuple[int, int, int, int] | None = None
+    # Milliseconds per lookup stage (see decide_position) and how many
+    # top-level windows the window enumeration looked at.
+    timings: dict[str, float] = field(default_factory=dict)
+    windows_examined: int = 0
+
+
+# ----- Window source ----------------------------------------------------------
+
+_source: WindowSource | None = None
+_source_ready = False
+_watcher: WindowWatcher | None = None
+# decide_position() may run on more than one thread (ScoreBlocker runs it
+# on a worker); this keeps them from starting two watchers.
+_watcher_lock = threading.Lock()
+_source_lock = threading.Lock()
+# hwnd -> (exe, window rect, monitor, video container); see _video_container.
+_containers: dict[int, tuple] = {}
+_CONTAINER_CACHE_SIZE = 32
+
+
+def get_window_source() -> WindowSource | None:
+    """The backend decide_position() reads windows and monitors from:
+    default_source() on first use, unless set_window_source() chose one."""
+    global _source, _source_ready
+    if not _source_ready:
+        with _source_lock:
+            if not _source_ready:
+                _source = default_source()
+                _source_ready = True
+    return _source
+
+
+def set_window_source(source: WindowSource | None) -> None:
+    """Use `source` for all later lookups (None disables auto-position)."""
+    global _source, _source_ready
+    stop_watching()
+    _containers.clear()
+    if _source is not None and _source is not source:
+        _source.close()
+    _source = source
+    _source_ready = True
+
+
+def start_watching() -> bool:
+    """Keep the candidate browser windows up to date on a background thread
+    (see window_sources.WindowWatcher), so decide_position() reads a ready
+    list instead of enumerating. Only live sources are watched. Returns
+    whether a watcher is running."""
+    global _watcher
+    source = get_window_source()
+    with _watcher_lock:
+        if _watcher is None and source is not None and source.live:
+            _watcher = WindowWatcher(source, TITLE_STAGES).start()
+        return _watcher is not None
+
+
+def warm_up(wait: float | None = 5.0) -> None:
+    """Do now what the first decide_position() would otherwise pay for. The
+    data is already loaded by importing this module. This opens the window
+    source, loads the current season's games and enumerates the monitors.
+    It then starts the watcher and waits up to `wait` seconds for its first
+    window snapshot. Meant to run on a background thread at startup."""
+    source = get_window_source()
+    if source is None:
+        return
+    if _data is not None and _data.seasons:
+        # Most likely the current season (January and February playoffs
+        # belong to the previous year's), else the latest we have games for.
+        today = date.today()
+        current = today.year if today.month >= 3 else today.year - 1
+        _data.season_games(current if current in _data.seasons
+                           else _data.seasons[-1])
+    source.monitor_layout()
+    if start_watching():
+        watcher = _current_watcher()
+        if watcher is not None:
+            watcher.windows(timeout=wait)
+
+
+def _current_watcher() -> WindowWatcher | None:
+    """The running watcher, read under the lock set_window_source() and
+    stop_watching() replace it under."""
+    with _watcher_lock:
+        return _watcher
+
+
+def stop_watching() -> None:
+    global _watcher
+    with _watcher_lock:
+        if _watcher is not None:
+            _watcher.stop()
+            _watcher = None
 
 
-# ----- Windows browser/window enumeration -----------------------------------
-
-def _enumerate_browser_windows():
-    """Yield (hwnd, title, exe_basename) for visible top-level browser windows.
-
-    Uses ctypes to call Win32 APIs directly so we don't take a pywin32 dep.
-    """
-    import ctypes
-    from ctypes import wintypes
+def _monitor_for_point(x: int, y: int) -> tuple[int, int, int, int] | None:
+    """Return (left, top, width, height) of the monitor containing (x, y),
+    or None if no monitor was found."""
+    source = get_window_source()
+    return source.monitor_for_point(x, y) if source is not None else None
 
-    user32 = ctypes.windll.user32
-    kernel32 = ctypes.windll.kernel32
-    psapi = ctypes.windll.psapi
 
-    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+# ----- Title parsing & game lookup ------------------------------------------
 
-    EnumWindowsProc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def _parse_title(title: str) -> GameTitle | None:
+    """The title_rules.GameTitle for a browser window title, or None if it
+    isn't a game page we recognise or a team name isn't in the nfl_teams
+    registry. Results are cached by title, so an unchanged window title
+    costs a dict lookup."""
+    return TITLE_RULES.parse(title)
 
-    found: list[tuple[int, str, str]] = []
 
-    def _exe_for_pid(pid: int) -> str:
-        h = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
-        if not h:
-            return ''
-        try:
-            buf = ctypes.create_unicode_buffer(1024)
-            size = wintypes.DWORD(len(buf))
-            if kernel32.QueryFullProcessImageNameW(h, 0, buf, ctypes.byref(size)):
-                full = buf.value
-                # Basename only
-                return full.rsplit('\\', 1)[-1].lower()
-            return ''
-        finally:
-            kernel32.CloseHandle(h)
-
-    def _callback(hwnd, _lparam):
-        if not user32.IsWindowVisible(hwnd):
-            return True
-        length = user32.GetWindowTextLengthW(hwnd)
-        if length == 0:
-            return True
-        buf = ctypes.create_unicode_buffer(length + 1)
-        user32.GetWindowTextW(hwnd, buf, length + 1)
-        title = buf.value
-        pid = wintypes.DWORD()
-        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
-        exe = _exe_for_pid(pid.value)
-        if exe in BROWSER_EXES:
-            found.append((hwnd, title, exe))
-        return True
-
-    user32.EnumWindows(EnumWindowsProc(_callback), 0)
-    return found
-
-
-def _window_rect(hwnd: int) -> tuple[int, int, int, int] | None:
-    import ctypes
-    from ctypes import wintypes
-
-    user32 = ctypes.windll.user32
-    rect = wintypes.RECT()
-    if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
-        return None
-    return (rect.left, rect.top, rect.right, rect.bottom)
+def set_title_rules(rules) -> None:
+    """Recognise game pages by `rules` (TitleRule objects) from now on."""
+    global TITLE_RULES
+    TITLE_RULES = TitleRules(rules)
+    _parse_title.cache_clear()
 
 
-def _monitor_for_point(x: int, y: int) -> tuple[int, int, int, int] | None:
-    """Return (left, top, width, height) of the monitor containing (x, y),
-    or None if no monitor was found."""
-    import ctypes
-    from ctypes import wintypes
-
-    user32 = ctypes.windll.user32
-    MONITOR_DEFAULTTONEAREST = 2
-
-    class POINT(ctypes.Structure):
-        _fields_ = [('x', wintypes.LONG), ('y', wintypes.LONG)]
-
-    class MONITORINFO(ctypes.Structure):
-        _fields_ = [
-            ('cbSize', wintypes.DWORD),
-            ('rcMonitor', wintypes.RECT),
-            ('rcWork', wintypes.RECT),
-            ('dwFlags', wintypes.DWORD),
-        ]
-
-    pt = POINT(x, y)
-    hmon = user32.MonitorFromPoint(pt, MONITOR_DEFAULTTONEAREST)
-    if not hmon:
-        return None
-    info = MONITORINFO()
-    info.cbSize = ctypes.sizeof(MONITORINFO)
-    if not user32.GetMonitorInfoW(hmon, ctypes.byref(info)):
-        return None
-    r = info.rcMonitor
-    return (r.left, r.top, r.right - r.left, r.bottom - r.top)
+def _title_is_nfl(title: str) -> bool:
+    """True if the window title is an NFL game page on a site we know."""
+    return _parse_title(title) is not None
 
 
-# ----- Title parsing & game lookup ------------------------------------------
-
-def _title_is_nfl(title: str) -> bool:
-    """True if the window title looks like an NFL.com Game Center page."""
-    return TITLE_RE.search(title) is not None
+# Title filters applied by the window source between the window-class check
+# and the process lookup, cheapest first (see WindowSource.browser_windows).
+TITLE_STAGES = (
+    ('title parse', _title_is_nfl),
+)
 
 
-def _find_record_for_title(title: str):
-    """Parse an NFL.com Game Center title and return (away, home, network, year)
-    from the embedded data, or None if we can't disambiguate (e.g. the year /
-    week isn't in our games lookup, or the team names don't match)."""
-    m = TITLE_RE.search(title)
-    if not m:
-        return None
-    away_full, home_full, year, season_type, week = m.groups()
-    try:
-        year = int(year)
-        week = int(week)
-    except ValueError:
+def _lookup_game(parsed: GameTitle | None):
+    """(away, home, network, year, cell_key) for a _parse_title() result,
+    or None if the game isn't in the embedded data. Titles without a week
+    are looked up by their date, or today's."""
+    if parsed is None or _data is None:
         return None
-    season_type = season_type.lower()
+    for year, season_type, week, away_id, home_id in parsed.lookups(date.today()):
+        match = _data.find_game_ids(year, season_type, week, away_id, home_id)
+        if match is not None:
+            away, home, network, cell_key = match
+            return (away, home, network, year, cell_key)
+    return None
 
-    candidates = GAMES.get((year, season_type, week))
-    if not candidates:
-        return None
 
-    away_lower = away_full.lower()
-    home_lower = home_full.lower()
-    for away, home, network in candidates:
-        if away.lower() in away_lower and home.lower() in home_lower:
-            return (away, home, network, year)
-    return None
+def _find_record_for_title(title: str):
+    """Parse a game page title and return
+    (away, home, network, year, cell_key) from the embedded data, or None if
+    we can't disambiguate (e.g. the year / week isn't in our games lookup, or
+    the team names aren't in the nfl_teams registry). Team names resolve to
+    team ids by dict lookups, and the game by one more in its season's index
+    (see scoreblock_pack.DataPack.find_game)."""
+    return _lookup_game(_parse_title(title))
 
 
 # ----- Coordinate math ------------------------------------------------------
@@ -195,29 +272,24 @@ def _snap_to_edge(v: float) -> float:
     return v
 
 
-def latest_ticker_rect_for(network_slug: str):
+def latest_ticker_rect_for(network_slug: str, as_of: int | None = None):
     """Return the most-recent ticker rect for a network slug, or None.
 
-    Searches SCORE_REGIONS for keys "<slug>_<year>" with status='ticker' and
-    returns the rect for the highest year. Used by the c/f keyboard
-    shortcuts to "snap to the most-recent CBS/FOX ticker position".
+    With `as_of`, only years <= as_of are considered. Used by the c/f
+    keyboard shortcuts to "snap to the most-recent CBS/FOX ticker position".
+    A bisect into the per-network year index built at data load.
     """
-    best_year = -1
-    best_rect = None
-    prefix = f'{network_slug}_'
-    for key, val in SCORE_REGIONS.items():
-        if not key.startswith(prefix):
-            continue
-        if val.get('status') != 'ticker':
-            continue
-        try:
-            year = int(key[len(prefix):])
-        except ValueError:
-            continue
-        if year > best_year:
-            best_year = year
-            best_rect = val['rect']
-    return best_rect
+    if _data is None:
+        return None
+    return _data.latest_ticker_rect(network_slug, as_of)
+
+
+def nearest_annotated_year(network_slug: str, year: int) -> int | None:
+    """Return the SCORE_REGIONS year closest to `year` that has been
+    annotated for a network slug (ties go to the later year), or None."""
+    if _data is None:
+        return None
+    return _data.nearest_annotated_year(network_slug, year)
 
 
 def monitor_for_point(x: int, y: int):
@@ -225,15 +297,9 @@ def monitor_for_point(x: int, y: int):
     return _monitor_for_point(x, y)
 
 
-def normalized_to_screen(rect_norm, monitor) -> tuple[int, int, int, int]:
-    """Convert a normalized [xmin, ymin, xmax, ymax] (relative to the 16:9
-    video frame) into absolute screen pixels for the given monitor.
-
-    Assumes fullscreen playback: video occupies the full width of the monitor
-    and is vertically centered. If the monitor is narrower than 16:9 (rare),
-    falls back to full-height with horizontal centering.
-    """
-    x_min, y_min, x_max, y_max = (_snap_to_edge(v) for v in rect_norm)
+def _video_frame(monitor) -> tuple[float, float, float, float]:
+    """(x, y, w, h) of a 16:9 video fitted into a monitor (or any other
+    (x, y, w, h) container)."""
     M_x, M_y, M_w, M_h = monitor
 
     video_w = M_w
@@ -246,6 +312,21 @@ def normalized_to_screen(rect_norm, monitor) -> tuple[int, int, int, int]:
     else:
         video_x = M_x
         video_y = M_y + (M_h - video_h) / 2
+    return video_x, video_y, video_w, video_h
+
+
+def normalized_to_screen(rect_norm, monitor) -> tuple[int, int, int, int]:
+    """Convert a normalized [xmin, ymin, xmax, ymax] (relative to the 16:9
+    video frame) into absolute screen pixels for the given monitor.
+
+    Assumes the video fills the full width of `monitor` and is vertically
+    centered; if it's narrower than 16:9 (rare), falls back to full-height
+    with horizontal centering. `monitor` may be any (x, y, w, h) the video
+    plays in, such as the page area of a browser window (see
+    _video_container()).
+    """
+    x_min, y_min, x_max, y_max = (_snap_to_edge(v) for v in rect_norm)
+    video_x, video_y, video_w, video_h = _video_frame(monitor)
 
     sx = round(video_x + x_min * video_w)
     sy = round(video_y + y_min * video_h)
@@ -254,64 +335,327 @@ def normalized_to_screen(rect_norm, monitor) -> tuple[int, int, int, int]:
     return sx, sy, sw, sh
 
 
+def normalized_to_screen_array(rects_norm, monitor):
+    """Vectorized normalized_to_screen(): convert an (..., 4) array of
+    normalized rects into an int32 (..., 4) array of (x, y, w, h) screen
+    pixels. Needs numpy."""
+    import numpy as np
+
+    # Round like the SCORE_REGIONS view does, so both paths agree to the pixel.
+    r = np.asarray(rects_norm, dtype=np.float64).round(5)
+    r = np.where(r < EDGE_SNAP_THRESHOLD, 0.0,
+                 np.where(r > 1.0 - EDGE_SNAP_THRESHOLD, 1.0, r))
+    video_x, video_y, video_w, video_h = _video_frame(monitor)
+    x_min, y_min, x_max, y_max = np.moveaxis(r, -1, 0)
+    return np.rint(np.stack([
+        video_x + x_min * video_w,
+        video_y + y_min * video_h,
+        (x_max - x_min) * video_w,
+        (y_max - y_min) * video_h,
+    ], axis=-1)).astype(np.int32)
+
+
+def ticker_screen_rects(monitor, year: int | None = None):
+    """Return (cells, rects) for every annotated ticker, or only those of
+    `year`, on a monitor: a list of (network_slug, year) and an int32 (n, 4)
+    array of (x, y, w, h) screen pixels. Needs numpy."""
+    if _data is None:
+        import numpy as np
+        return [], np.empty((0, 4), dtype=np.int32)
+    cells, rects = _data.regions.ticker_cells(year)
+    return cells, normalized_to_screen_array(rects, monitor)
+
+
+def missing_score_regions() -> list[tuple[str, int]]:
+    """(network_slug, year) cells not yet annotated since each network's
+    first annotated year. Needs numpy."""
+    return _data.regions.missing_cells() if _data is not None else []
+
+
 # ----- Public entry point ---------------------------------------------------
 
-def decide_position() -> Decision:
-    if sys.platform != 'win32':
-        return Decision('unsupported', None,
-                        f'Auto-position is Windows-only (running on {sys.platform})')
+def _lap(timings: dict[str, float], stage: str, start: float) -> float:
+    """Add the milliseconds since `start` to timings[stage]; return now."""
+    now = perf_counter()
+    timings[stage] = timings.get(stage, 0.0) + (now - start) * 1000
+    return now
+
+
+def _timed_stages(stages, timings: dict[str, float]):
+    """`stages` with the time spent in their predicates added up under
+    timings['filter']."""
+    timings.setdefault('filter', 0.0)
+
+    def timed(predicate):
+        def stage(title):
+            start = perf_counter()
+            try:
+                return predicate(title)
+            finally:
+                _lap(timings, 'filter', start)
+        return stage
+
+    return tuple((name, timed(predicate)) for name, predicate in stages)
+
+
+def _finish(decision: Decision, timings, source) -> Decision:
+    decision.timings = {stage: round(ms, 3) for stage, ms in timings.items()}
+    if source is not None:
+        decision.windows_examined = source.last_pass.get('windows', 0)
+    return decision
+
+
+def _game_windows(timings: dict[str, float]):
+    """(source, [(hwnd, title, exe), ...]) of the browser windows that look
+    like NFL games, or (None, Decision) when there's nothing to look at.
+    Enumerating here (rather than reading the watcher's snapshot) adds
+    'enumerate' and 'filter' timings."""
+    source = get_window_source()
+    if source is None:
+        return None, Decision('unsupported', None,
+                              f'Auto-position needs Windows or an X11 session '
+                              f'(running on {sys.platform})')
 
     if not SCORE_REGIONS or not GAMES:
-        return Decision('unsupported', None,
-                        'auto_scoreblock_data not loaded')
+        return None, Decision('unsupported', None,
+                              'auto_scoreblock_data not loaded')
+
+    watcher = _current_watcher()
+    windows = watcher.windows(timeout=0) if watcher is not None else None
+    if windows is None:
+        start = perf_counter()
+        try:
+            windows = source.browser_windows(_timed_stages(TITLE_STAGES, timings))
+        except Exception as e:
+            return None, Decision('no_game', None,
+                                  f'Window enumeration failed: {e}')
+        _lap(timings, 'enumerate', start)
+        timings['enumerate'] -= timings['filter']
+        # Answer later calls from a background snapshot.
+        start_watching()
+    return source, windows
 
-    try:
-        windows = _enumerate_browser_windows()
-    except Exception as e:
-        return Decision('no_game', None, f'Window enumeration failed: {e}')
+
+def decide_position() -> Decision:
+    timings: dict[str, float] = {}
+    source, windows = _game_windows(timings)
+    if source is None:
+        return _finish(windows, timings, None)
 
     saw_nfl_tab = False
 
-    for hwnd, title, _exe in windows:
-        if not _title_is_nfl(title):
-            continue
+    for hwnd, title, exe in windows:
         saw_nfl_tab = True
-        match = _find_record_for_title(title)
-        if not match:
-            # NFL game tab, but year/week not in our lookup or no team-name
-            # match. Treat as "haven't annotated this cell yet."
-            continue
-        away, home, network, year = match
-        slug = NETWORK_SLUG.get(network)
-        if slug is None:
-            continue  # Unknown network → also unreviewed-ish
-        cell_key = f'{slug}_{year}'
-        cell = SCORE_REGIONS.get(cell_key)
-
-        wrect = _window_rect(hwnd)
-        if wrect is None:
-            return Decision('no_game', None, 'Could not get window rect')
-        wl, wt, wr, wb = wrect
-        cx = (wl + wr) // 2
-        cy = (wt + wb) // 2
-        monitor = _monitor_for_point(cx, cy)
-        if monitor is None:
-            return Decision('no_game', None, 'No monitor found for window')
-
-        if cell is None:
-            return Decision('unreviewed', None,
-                            f'{cell_key}: not yet annotated')
-        if cell['status'] == 'no_ticker':
-            return Decision('no_ticker', None,
-                            f'{cell_key}: known no ticker')
-        if cell['status'] == 'ticker':
-            sx, sy, sw, sh = normalized_to_screen(cell['rect'], monitor)
-            return Decision('ticker', (sx, sy, sw, sh),
-                            f'{cell_key}: {away} @ {home}')
-
-        return Decision('unreviewed', None, f'{cell_key}: unknown status')
+        decision = _decide_for_window(source, hwnd, title, exe, timings)
+        if decision is not None:
+            return _finish(decision, timings, source)
 
     if saw_nfl_tab:
+        decision = Decision('unreviewed', None,
+                            'Found NFL game tab but cell not in data')
+    else:
+        decision = Decision('no_game', None,
+                            'No NFL game found in any browser window')
+    return _finish(decision, timings, source)
+
+
+def decide_positions() -> list[Decision]:
+    """A Decision for every NFL game window, from one enumeration (or the
+    watcher's snapshot), ordered by monitor and then by position on it.
+
+    Games not in the lookup come back as 'unreviewed' with their `window`
+    set. If there are no NFL windows the list is empty; if windows can't be
+    looked at, it holds the one Decision decide_position() would return.
+    Every decision carries the timings of the whole call.
+    """
+    timings: dict[str, float] = {}
+    source, windows = _game_windows(timings)
+    if source is None:
+        return [_finish(windows, timings, None)]
+    decisions = []
+    for hwnd, title, exe in windows:
+        decision = _decide_for_window(source, hwnd, title, exe, timings)
+        if decision is None:
+            decision = Decision('unreviewed', None,
+                                'Found NFL game tab but cell not in data', hwnd)
+        decisions.append(decision)
+    return [_finish(d, timings, source) for d in sorted(decisions, key=_decision_order)]
+
+
+def _decision_order(decision: Decision):
+    # Monitors left to right (unknown last), then windows on each.
+    monitor = decision.monitor
+    rect = decision.rect or (0, 0, 0, 0)
+    return (monitor is None, monitor or (), rect[1], rect[0])
+
+
+def plan_overlays(overlays, decisions) -> list[tuple[int, Decision]]:
+    """Pair overlay windows with decide_positions() results.
+
+    `overlays` is [(handle, (left, top, right, bottom)), ...]. Each overlay
+    first takes a game on the monitor it's already on; the rest take the
+    remaining games in order, left to right. Overlays left over (more
+    overlays than games) aren't in the result.
+    """
+    games = [d for d in decisions if d.window is not None]
+    pending = sorted(overlays, key=lambda o: (o[1][0], o[1][1]))
+    plan = []
+    for overlay in list(pending):
+        handle, (left, top, right, bottom) = overlay
+        monitor = _monitor_for_point((left + right) // 2, (top + bottom) // 2)
+        for decision in games:
+            if decision.monitor is not None and decision.monitor == monitor:
+                plan.append((handle, decision))
+                games.remove(decision)
+                pending.remove(overlay)
+                break
+    plan.extend((handle, decision) for (handle, _), decision in zip(pending, games))
+    return plan
+
+
+def _decide_for_window(source: WindowSource, hwnd: int, title: str,
+                       exe: str | None = None, timings=None):
+    """The Decision for one NFL game window, or None if its game (or the
+    game's network) isn't in our lookup. Time spent is added to `timings`
+    under 'parse', 'resolve', 'monitor' and 'geometry'."""
+    if timings is None:
+        timings = {}
+    start = perf_counter()
+    parsed = _parse_title(title)
+    start = _lap(timings, 'parse', start)
+    match = _lookup_game(parsed)
+    if not match:
+        # NFL game tab, but year/week not in our lookup or no team-name
+        # match. Treat as "haven't annotated this cell yet."
+        _lap(timings, 'resolve', start)
+        return None
+    away, home, network, year, cell_key = match
+    slug = NETWORK_SLUG.get(network)
+    if slug is None:
+        _lap(timings, 'resolve', start)
+        return None  # Unknown network → also unreviewed-ish
+    cell = _data.regions.get(slug, year)
+    guess = _data.nearest_ticker(slug, year) if cell is None else None
+    start = _lap(timings, 'resolve', start)
+
+    wrect = source.window_rect(hwnd)
+    if wrect is None:
+        _lap(timings, 'monitor', start)
+        return Decision('no_game', None, 'Could not get window rect')
+    wl, wt, wr, wb = wrect
+    cx = (wl + wr) // 2
+    cy = (wt + wb) // 2
+    monitor = source.monitor_for_point(cx, cy)
+    if monitor is None:
+        _lap(timings, 'monitor', start)
+        return Decision('no_game', None, 'No monitor found for window')
+    start = _lap(timings, 'monitor', start)
+    video = _video_container(source, hwnd, exe, wrect, monitor)
+    decision = _decision_for_cell(cell, guess, video, cell_key, away, home,
+                                  hwnd, monitor)
+    _lap(timings, 'geometry', start)
+    return decision
+
+
+def _decision_for_cell(cell, guess, video, cell_key, away, home, hwnd, monitor):
+    """The Decision for a game's SCORE_REGIONS cell placed in `video`. If
+    the cell isn't annotated, `guess` is (year, rect) of the network's
+    nearest year with a ticker, or None."""
+    if cell is None:
+        if guess is not None:
+            guess_year, guess_rect = guess
+            sx, sy, sw, sh = normalized_to_screen(guess_rect, video)
+            return Decision('ticker_guess', (sx, sy, sw, sh),
+                            f'{cell_key}: not yet annotated, using '
+                            f'{guess_year}: {away} @ {home}', hwnd, monitor)
         return Decision('unreviewed', None,
-                        'Found NFL game tab but cell not in data')
-    return Decision('no_game', None, 'No NFL game found in any browser window')
+                        f'{cell_key}: not yet annotated', hwnd, monitor)
+    if cell['status'] == 'no_ticker':
+        return Decision('no_ticker', None,
+                        f'{cell_key}: known no ticker', hwnd, monitor)
+    if cell['status'] == 'ticker':
+        sx, sy, sw, sh = normalized_to_screen(cell['rect'], video)
+        return Decision('ticker', (sx, sy, sw, sh),
+                        f'{cell_key}: {away} @ {home}', hwnd, monitor)
+
+    return Decision('unreviewed', None, f'{cell_key}: unknown status',
+                    hwnd, monitor)
+
+
+def _video_container(source: WindowSource, hwnd: int, exe: str | None,
+                     wrect, monitor) -> tuple[int, int, int, int]:
+    """(x, y, w, h) the game's video plays in: the monitor when the window
+    is fullscreen, else the window's page area, measured by the source or
+    estimated as the client area less the browser's chrome height (on
+    Win32; elsewhere the client area itself).
+
+    Cached per window and recomputed only when the window's rect or monitor
+    changes. The cache also remembers the window's executable for callers
+    that only know the handle (decide_for_window()).
+    """
+    cached = _containers.get(hwnd)
+    if cached is not None:
+        if exe is None:
+            exe = cached[0]
+        if cached[1:3] == (wrect, monitor):
+            return cached[3]
+    container = _measure_container(source, hwnd, exe, monitor)
+    if len(_containers) >= _CONTAINER_CACHE_SIZE:
+        _containers.clear()
+    _containers[hwnd] = (exe, wrect, monitor, container)
+    return container
+
+
+def _measure_container(source: WindowSource, hwnd: int, exe: str | None,
+                       monitor) -> tuple[int, int, int, int]:
+    content = source.content_rect(hwnd)
+    if content is None:
+        client = source.client_rect(hwnd)
+        if client is None:
+            return monitor
+        left, top, right, bottom = client
+        m_x, m_y, m_w, m_h = monitor
+        if left <= m_x and top <= m_y and right >= m_x + m_w and bottom >= m_y + m_h:
+            return monitor  # fullscreen: no browser chrome showing
+        if source.unscaled_rects:
+            name = (exe or '').removesuffix('.exe')
+            top += BROWSER_CHROME_HEIGHTS.get(name, DEFAULT_CHROME_HEIGHT)
+        content = (left, top, right, bottom)
+    left, top, right, bottom = content
+    if right <= left or bottom <= top:
+        return monitor  # minimized
+    return (left, top, right - left, bottom - top)
+
+
+def decide_for_window(handle: int) -> Decision:
+    """decide_position() for one browser window (typically the `window` of
+    an earlier Decision), from its current title, rect and monitor."""
+    source = get_window_source()
+    if source is None or not SCORE_REGIONS or not GAMES:
+        return Decision('unsupported', None, 'Auto-position unavailable')
+    title = source.window_title(handle)
+    if title is None:
+        return Decision('no_game', None, 'Game window has closed')
+    if not _title_is_nfl(title):
+        return Decision('no_game', None, 'Window is not showing an NFL game',
+                        handle)
+    timings: dict[str, float] = {}
+    decision = _decide_for_window(source, handle, title, timings=timings)
+    if decision is None:
+        decision = Decision('unreviewed', None,
+                            'Found NFL game tab but cell not in data', handle)
+    return _finish(decision, timings, None)
+
+
+def follow_window(handle: int, on_decision) -> WindowFollower | None:
+    """Re-decide for a game window whenever it moves, resizes, changes
+    monitor or is retitled (e.g. the tab switches to another game), passing
+    each new Decision to on_decision() on a background thread. The last
+    call, after the window has closed, has window=None. Returns the
+    running WindowFollower (stop() it to end following), or None if there
+    is no window source."""
+    source = get_window_source()
+    if source is None:
+        return None
+    return WindowFollower(
+        source, handle, lambda: on_decision(decide_for_window(handle))).start()
@@ -1,8 +1,9 @@
 """
 Embedded auto-scoreblock data — DO NOT EDIT BY HAND.
 
-Generated by c:/git/auto-scoreblock/build_scoreblocker_data.py.
-Re-run that script after updating annotations / capturing new seasons.
+Generated by build_scoreblocker_data.py from the CSV sources in data/.
+Edit those and re-run `python build_scoreblocker_data.py build` after
+updating annotations / capturing new seasons.
 
 SCORE_REGIONS: keyed by f"{network_slug}_{year}", e.g. "cbs_2024".
   status="ticker"    -> rect = [xmin, ymin, xmax, ymax] normalized to the
@@ -20,9 +21,14 @@ NETWORK_SLUG: maps the lookup's display network names ("CBS", "Amazon Prime
 Video", "ESPN+", "Yahoo!", ...) to the slug used in SCORE_REGIONS keys
 ("cbs", "amazon-prime-video", "espn-plus", "yahoo"). Mirrors the slug
 function in capture_frames.py.
+
+CONTENT_HASH: SHA-256 content hash of the tables, identical to the one
+stamped into auto_scoreblock_data.sbpack.
 """
 
 
+CONTENT_HASH = 'f3aa2df689859965e9345c45c91ac4111d2552ac5551ec87b08cd66bcd5246ab'
+
 NETWORK_SLUG = {
     'ABC': 'abc',
     'Amazon Prime Video': 'amazon-prime-video',
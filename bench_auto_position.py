@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the auto-position lookup path.
+
+    python bench_auto_position.py resolve
+    python bench_auto_position.py memory
+    python bench_auto_position.py titles [--titles N]
+    python bench_auto_position.py decide [--desktops N] [--snapshot FILE ...]
+
+resolve: per-title game resolution cost across every game in the 2009-2025
+table, comparing the original linear scan over a week's candidates (with
+case-folded substring tests) against the per-season index auto_position uses.
+
+memory: heap allocated (tracemalloc) by the GAMES table as a Python literal
+versus the data pack's decoded seasons, with every season decoded and with
+the default season cache.
+
+titles: title-parsing throughput (titles/sec) over a generated stream of
+--titles window titles (a million by default), read the way the window
+watcher reads them: repeated passes over a desktop of browser windows whose
+tabs occasionally change. The titles mix game pages on every site
+title_rules knows (nfl.com "at" and "vs", REG / POST / PRE, unread-count
+prefixes; ESPN, YouTube TV, NFL+, Sunday Ticket, Fubo) with long ordinary
+page titles. Compares the original two lazy-regex passes per title (the
+filter check, then the parse) against auto_position's single-pass parser,
+with and without its title cache. Then times the uncached parser with only
+the nfl.com rule, with the default rules and with 30 extra made-up sites,
+to show that the cost doesn't grow with the number of rules.
+
+decide: end-to-end decide_position() latency (p50 / p99 / max) over
+synthetic desktops replayed through window_sources.ReplaySource: many
+browsers and tabs with no NFL game, one NFL tab, several NFL tabs, and a busy
+desktop with hundreds of windows and the game tab last. Desktops are
+generated from a fixed seed, so runs are comparable; --snapshot replays
+recorded desktops (python window_sources.py record) as well. Also shows how
+many windows survive each filter stage of the window source.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import random
+import re
+import sys
+import time
+import tracemalloc
+
+from nfl_teams import full_name, team_id, team_id_suffix
+from title_rules import DEFAULT_RULES, TitleRule, TitleRules
+
+
+def game_titles(games) -> list[str]:
+    """A browser window title for every game in a GAMES mapping."""
+    titles = []
+    for (year, season_type, week), records in sorted(games.items()):
+        for away, home, _network in records:
+            titles.append(
+                f'{full_name(team_id(away), year)} at '
+                f'{full_name(team_id(home), year)} '
+                f'{year} {season_type.upper()} {week} - Game Center'
+                f' - Google Chrome')
+    return titles
+
+
+# The title regex auto_position used before its single-pass parser.
+LEGACY_TITLE_RE = re.compile(
+    r'(.+?) at (.+?) (\d{4}) (REG|POST) (\d+)',
+    re.IGNORECASE,
+)
+_LEGACY_YEAR_RE = re.compile(r'\d{4}')
+
+
+def _legacy_resolve(games, away_full, home_full, year, season_type, week):
+    """The pre-index resolver: linear scan with substring tests."""
+    candidates = games.get((year, season_type, week))
+    if not candidates:
+        return None
+    away_lower = away_full.lower()
+    home_lower = home_full.lower()
+    for away, home, network in candidates:
+        if away.lower() in away_lower and home.lower() in home_lower:
+            return (away, home, network, year)
+    return None
+
+
+def _time_per_call(fn, args_list, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for args in args_list:
+            fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(args_list)
+
+
+def bench_resolve(repeat: int):
+    import auto_position
+    import scoreblock_pack
+    from auto_scoreblock_data import GAMES
+    from nfl_teams import team_id
+
+    # Keep every season decoded so the index side measures steady-state
+    # lookups rather than shard decoding.
+    scoreblock_pack.SEASON_CACHE_SIZE = len(GAMES)
+    data = auto_position._data
+
+    titles = game_titles(GAMES)
+    parsed = []
+    for title in titles:
+        away, home, year, season_type, week = (
+            LEGACY_TITLE_RE.search(title).groups())
+        parsed.append((away, home, int(year), season_type.lower(), int(week)))
+    misses = sum(data.find_game(y, st, w, a, h) is None
+                 for a, h, y, st, w in parsed)
+
+    legacy = _time_per_call(
+        lambda *p: _legacy_resolve(GAMES, *p), parsed, repeat)
+    indexed = _time_per_call(
+        lambda a, h, y, st, w: data.find_game(y, st, w, a, h), parsed, repeat)
+    ids = [(team_id(a), team_id(h), y, st, w) for a, h, y, st, w in parsed]
+    by_id = _time_per_call(
+        lambda a, h, y, st, w: data.find_game_ids(y, st, w, a, h), ids, repeat)
+    full = _time_per_call(
+        auto_position._find_record_for_title, [(t,) for t in titles], repeat)
+
+    print(f'{len(titles)} titles, {misses} unresolved by the index')
+    print(f'  linear scan:  {legacy * 1e6:8.3f} us/title')
+    print(f'  indexed:      {indexed * 1e6:8.3f} us/title '
+          f'(linear scan / indexed = {legacy / indexed:.1f})')
+    print(f'  index by ids: {by_id * 1e6:8.3f} us/title')
+    print(f'  parse + index:{full * 1e6:8.3f} us/title')
+
+
+def _traced(fn):
+    """Return (result, bytes still allocated by fn once it returns)."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def bench_memory():
+    import scoreblock_pack
+
+    def literal_games():
+        sys.modules.pop('auto_scoreblock_data', None)
+        module = importlib.import_module('auto_scoreblock_data')
+        # Only GAMES survives; the module's other tables are dropped.
+        games = module.GAMES
+        del sys.modules['auto_scoreblock_data'], module
+        return games
+
+    games, literal = _traced(literal_games)
+    years = sorted({year for year, _, _ in games})
+    del games
+
+    pack, opened = _traced(
+        lambda: scoreblock_pack.DataPack(scoreblock_pack.DEFAULT_PACK_PATH))
+
+    def decode(cache_size):
+        scoreblock_pack.SEASON_CACHE_SIZE = cache_size
+        for year in years:
+            pack.season_games(year)
+
+    default_size = scoreblock_pack.SEASON_CACHE_SIZE
+    _, cached = _traced(lambda: decode(default_size))
+    _, all_seasons = _traced(lambda: decode(len(years)))
+    pack.close()
+
+    print(f'GAMES heap, {len(years)} seasons')
+    for label, size in (
+            ('module literal', literal),
+            ('pack opened (all tables)', opened),
+            (f'+ {default_size} cached seasons decoded', cached),
+            ('+ every season decoded', cached + all_seasons)):
+        print(f'  {label + ":":<32}{size / 1024:8.1f} KiB')
+
+
+def _legacy_parse_title(title: str):
+    """The original title path: a cheap pre-check and the regex as the
+    window filter, then the regex again to parse."""
+    if ' at ' not in title.lower() or _LEGACY_YEAR_RE.search(title) is None:
+        return None
+    if LEGACY_TITLE_RE.search(title) is None:
+        return None
+    away_full, home_full, year, season_type, week = (
+        LEGACY_TITLE_RE.search(title).groups())
+    away_id = team_id_suffix(away_full)
+    home_id = team_id(home_full)
+    if away_id is None or home_id is None:
+        return None
+    return away_id, home_id, int(year), season_type.lower(), int(week)
+
+
+LONG_TITLES = (
+    'Live updates: Chiefs at Ravens in the 2024 season opener at M&T Bank '
+    'Stadium, with analysis from our writers at the game - The Athletic',
+    'Best places to eat at the airport at 5am in 2024 (ranked) at a glance '
+    '- Travel at its best - Medium',
+    'Full Game Highlights | Weekly recap at the end of Week 6 2024 at '
+    'NFL.com and around the league - YouTube',
+    'Meeting notes at 10:30 - Q4 planning at HQ, 2024 review at team level '
+    '- Google Docs',
+)
+
+
+def title_corpus(rng: random.Random, games, n: int, desktop_size: int = 40,
+                 change_rate: float = 0.02, nfl_share: float = 0.2) -> list[str]:
+    """n window titles, as successive passes over a desktop of
+    `desktop_size` browser windows where each pass retitles a window with
+    probability `change_rate`. About `nfl_share` of the titles are games."""
+    others = OTHER_TITLES + LONG_TITLES
+    pool = []
+    for (year, season_type, week), records in sorted(games.items()):
+        for away, home, _network in records:
+            away_name = full_name(team_id(away), year)
+            home_name = full_name(team_id(home), year)
+            pool.append(f'{away_name} at {home_name} {year} '
+                        f'{season_type.upper()} {week} - Game Center')
+            pool.append(f'{rng.choice(("", "(2) ", "(14) "))}{home_name} '
+                        f'{rng.choice(("vs", "vs."))} {away_name} {year} '
+                        f'{season_type.upper()} {week} - Game Center')
+            if season_type == 'reg' and week <= 3:
+                pool.append(f'{away_name} at {home_name} {year} PRE {week} '
+                            f'- Game Center')
+            away_short, home_short = away_name.split()[-1], home_name.split()[-1]
+            day = rng.randint(1, 28)
+            pool.append(rng.choice((
+                f'{away_short} vs. {home_short} (Oct {day}, {year}) '
+                f'Live Score - ESPN',
+                f'{away_name} at {home_name} - YouTube TV',
+                f'{away_name} at {home_name} | NFL+',
+                f'{away_name} vs. {home_name} - NFL Sunday Ticket - YouTube',
+                f'{away_name} at {home_name} | Fubo',
+            )))
+    suffixes = list(BROWSER_SUFFIXES.values())
+
+    def title():
+        page = rng.choice(pool if rng.random() < nfl_share else others)
+        return page + rng.choice(suffixes)
+
+    desktop = [title() for _ in range(desktop_size)]
+    titles = []
+    while len(titles) < n:
+        for i in range(desktop_size):
+            if rng.random() < change_rate:
+                desktop[i] = title()
+        titles.extend(desktop)
+    return titles[:n]
+
+
+def bench_titles(n: int, repeat: int):
+    import auto_position
+    from auto_scoreblock_data import GAMES
+
+    titles = title_corpus(random.Random(2000), GAMES, n)
+    parse = auto_position._parse_title
+    matched = sum(parse.__wrapped__(t) is not None for t in set(titles))
+
+    def run(fn):
+        best = float('inf')
+        for _ in range(repeat):
+            parse.cache_clear()
+            t0 = time.perf_counter()
+            for title in titles:
+                fn(title)
+            best = min(best, time.perf_counter() - t0)
+        return len(titles) / best
+
+    legacy = run(_legacy_parse_title)
+    single = run(parse.__wrapped__)
+    cached = run(parse)
+    info = parse.cache_info()
+
+    extra_sites = tuple(TitleRule(f'site{i}', (f'Stream{i} TV',), '', 'live')
+                        for i in range(30))
+    by_rules = [(len(rules), run(TitleRules(rules).parse))
+                for rules in (DEFAULT_RULES[:1], DEFAULT_RULES,
+                              DEFAULT_RULES + extra_sites)]
+
+    print(f'{len(titles)} titles, {len(set(titles))} distinct, '
+          f'{matched} of them NFL games')
+    print(f'  two regex passes:    {legacy:12,.0f} titles/s')
+    print(f'  single pass:         {single:12,.0f} titles/s '
+          f'({single / legacy:.1f}x)')
+    print(f'  single pass, cached: {cached:12,.0f} titles/s '
+          f'({cached / legacy:.1f}x, '
+          f'{info.hits / (info.hits + info.misses):.1%} hits)')
+    for n_rules, rate in by_rules:
+        print(f'  single pass, {n_rules:2} rules: {rate:12,.0f} titles/s')
+
+BROWSER_SUFFIXES = {
+    'chrome.exe': ' - Google Chrome',
+    'firefox.exe': ' \u2014 Mozilla Firefox',
+    'msedge.exe': ' - Microsoft\u200bEdge',
+}
+
+WINDOW_CLASSES = {
+    'chrome.exe': 'Chrome_WidgetWin_1',
+    'firefox.exe': 'MozillaWindowClass',
+    'msedge.exe': 'Chrome_WidgetWin_1',
+    'explorer.exe': 'CabinetWClass',
+    # Electron apps share Chrome's window class.
+    'code.exe': 'Chrome_WidgetWin_1',
+    'slack.exe': 'Chrome_WidgetWin_1',
+    'outlook.exe': 'rctrl_renwnd32',
+    'spotify.exe': 'Chrome_WidgetWin_0',
+}
+
+OTHER_TITLES = (
+    'Inbox (3) - user@example.com - Gmail',
+    'YouTube',
+    'Fantasy Football 2024 - ESPN',
+    'NFL Scores - Week 6 2024 | NFL.com',
+    'r/nfl - Reddit',
+    'Pull requests \u00b7 GitHub',
+    'Weather at Lambeau Field 2024 - Google Search',
+    'Untitled document - Google Docs',
+)
+
+OTHER_WINDOWS = (
+    ('explorer.exe', 'Downloads'),
+    ('code.exe', 'score_blocker.py - Visual Studio Code'),
+    ('slack.exe', 'Slack | general'),
+    ('outlook.exe', 'Inbox - Outlook'),
+    ('spotify.exe', 'Spotify Premium'),
+)
+
+MONITOR_LAYOUTS = (
+    [[0, 0, 1920, 1080]],
+    [[0, 0, 2560, 1440], [2560, 0, 1920, 1080]],
+    [[-1920, 0, 1920, 1080], [0, 0, 3840, 2160], [3840, -400, 1080, 1920]],
+)
+
+# scenario: (browser windows, other windows, NFL tabs, NFL tab last)
+DESKTOP_SCENARIOS = {
+    'no NFL tab': ((5, 40), (10, 60), 0, False),
+    'one NFL tab': ((5, 40), (10, 60), 1, False),
+    'several NFL tabs': ((5, 40), (10, 60), 4, False),
+    'busy, game last': ((150, 300), (100, 200), 1, True),
+}
+
+
+def synthetic_desktop(rng: random.Random, nfl_titles: list[str],
+                      scenario: str) -> dict:
+    """A ReplaySource snapshot for one of DESKTOP_SCENARIOS."""
+    n_browsers, n_others, n_nfl, nfl_last = DESKTOP_SCENARIOS[scenario]
+    monitors = rng.choice(MONITOR_LAYOUTS)
+    windows = []
+
+    def add(exe, title):
+        left, top, width, height = rng.choice(monitors)
+        x = left + rng.randrange(width // 2)
+        y = top + rng.randrange(height // 2)
+        windows.append({'handle': None, 'title': title, 'exe': exe,
+                        'class': WINDOW_CLASSES[exe],
+                        'rect': [x, y, x + width // 2, y + height // 2]})
+
+    for _ in range(rng.randint(*n_browsers)):
+        exe = rng.choice(list(BROWSER_SUFFIXES))
+        add(exe, rng.choice(OTHER_TITLES) + BROWSER_SUFFIXES[exe])
+    for _ in range(rng.randint(*n_others)):
+        add(*rng.choice(OTHER_WINDOWS))
+    rng.shuffle(windows)
+    for _ in range(n_nfl):
+        exe = rng.choice(list(BROWSER_SUFFIXES))
+        add(exe, rng.choice(nfl_titles) + BROWSER_SUFFIXES[exe])
+        if not nfl_last:
+            windows.insert(rng.randrange(len(windows)), windows.pop())
+    for handle, window in enumerate(windows, 0x10000):
+        window['handle'] = handle
+    return {'backend': 'win32', 'windows': windows, 'monitors': monitors}
+
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1,
+                             int(p / 100 * len(sorted_values)))]
+
+
+def _time_decisions(auto_position, snapshots, repeat: int):
+    """Return ([seconds per call], {decision kind: count},
+    {filter stage: windows surviving, summed over desktops})."""
+    from window_sources import ReplaySource
+
+    times = []
+    kinds: dict[str, int] = {}
+    stages: dict[str, int] = {}
+    for snapshot in snapshots:
+        source = ReplaySource(snapshot)
+        auto_position.set_window_source(source)
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            decision = auto_position.decide_position()
+            times.append(time.perf_counter() - t0)
+        kinds[decision.kind] = kinds.get(decision.kind, 0) + 1
+        for stage, n in source.last_pass.items():
+            stages[stage] = stages.get(stage, 0) + n
+    return times, kinds, stages
+
+
+def bench_decide(desktops: int, repeat: int, snapshot_paths: list[str]):
+    import json
+
+    import auto_position
+    import scoreblock_pack
+    from auto_scoreblock_data import GAMES
+
+    scoreblock_pack.SEASON_CACHE_SIZE = len(GAMES)
+    nfl_titles = [title.rsplit(' - Google Chrome', 1)[0]
+                  for title in game_titles(GAMES)]
+    rng = random.Random(2000)
+    runs = [(scenario, [synthetic_desktop(rng, nfl_titles, scenario)
+                        for _ in range(desktops)])
+            for scenario in DESKTOP_SCENARIOS]
+    for path in snapshot_paths:
+        with open(path, encoding='utf-8') as f:
+            runs.append((path, [json.load(f)]))
+
+    print(f'decide_position(), {repeat} calls per desktop')
+    print(f'  {"desktops":<22}{"n":>6}{"p50 us":>10}{"p99 us":>10}'
+          f'{"max us":>10}  decisions')
+    for name, snapshots in runs:
+        times, kinds, stages = _time_decisions(auto_position, snapshots, repeat)
+        times.sort()
+        summary = ', '.join(f'{k} {v}' for k, v in sorted(kinds.items()))
+        print(f'  {name:<22}{len(snapshots):>6}'
+              f'{_percentile(times, 50) * 1e6:>10.1f}'
+              f'{_percentile(times, 99) * 1e6:>10.1f}'
+              f'{times[-1] * 1e6:>10.1f}  {summary}')
+        print('    windows left per desktop: ' + ' -> '.join(
+            f'{stage} {n / len(snapshots):.1f}' for stage, n in stages.items()))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('benchmark', choices=['resolve', 'memory', 'titles', 'decide'])
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Timing runs per benchmark (best is reported; '
+                             'for decide, calls per desktop)')
+    parser.add_argument('--desktops', type=int, default=1000,
+                        help='Synthetic desktops per scenario (decide)')
+    parser.add_argument('--titles', type=int, default=1_000_000,
+                        help='Window titles in the generated stream (titles)')
+    parser.add_argument('--snapshot', nargs='*', default=[],
+                        help='Recorded snapshot files to replay as well (decide)')
+    args = parser.parse_args()
+
+    if args.benchmark == 'resolve':
+        bench_resolve(args.repeat)
+    elif args.benchmark == 'memory':
+        bench_memory()
+    elif args.benchmark == 'titles':
+        bench_titles(args.titles, args.repeat)
+    elif args.benchmark == 'decide':
+        bench_decide(args.desktops, args.repeat, args.snapshot)
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Compile the auto-scoreblock sources into auto_scoreblock_data.py and the
+binary data pack (auto_scoreblock_data.sbpack).
+
+Sources live in data/ as plain CSV so they diff and merge cleanly:
+
+    data/networks.csv        network,slug
+    data/score_regions.csv   slug,year,status,xmin,ymin,xmax,ymax
+    data/games.csv           year,season_type,week,away,home,network
+
+Usage:
+
+    python build_scoreblocker_data.py build     # validate, then emit both outputs
+    python build_scoreblocker_data.py check     # validate only
+    python build_scoreblocker_data.py export    # rewrite data/ from the current
+                                                # auto_scoreblock_data.py
+    python build_scoreblocker_data.py apply-delta DELTA.json [--update-sources]
+    python build_scoreblocker_data.py compact   # drop sections superseded by
+                                                # applied deltas from the pack
+
+apply-delta adds a season delta (new games, new or changed SCORE_REGIONS
+cells) to the existing pack in place, without rewriting historic seasons;
+see scoreblock_pack.apply_delta for the JSON format. The pack records the
+applied deltas in its manifest. With --update-sources the delta is merged
+into data/ too, so the next full build includes it. The Python module is
+only the fallback and isn't touched by apply-delta. Each delta appends its
+new sections to the pack; compact rewrites the pack without the ones later
+deltas replaced (a full build does too, but drops the delta manifest).
+
+All validation happens here, once: rects within [0, 1], every GAMES network
+present in NETWORK_SLUG, every SCORE_REGIONS slug known, every team in the
+nfl_teams registry, no duplicate games and no team playing twice in a week.
+Both outputs are deterministic and carry the same content hash, so the
+runtime loader can trust them without re-checking anything.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import scoreblock_pack
+from nfl_teams import team_id
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(SCRIPT_DIR, 'data')
+MODULE_PATH = os.path.join(SCRIPT_DIR, 'auto_scoreblock_data.py')
+
+NETWORKS_CSV = 'networks.csv'
+SCORE_REGIONS_CSV = 'score_regions.csv'
+GAMES_CSV = 'games.csv'
+
+
+# ----- Sources ---------------------------------------------------------------
+
+def _read_csv(path: str) -> list[dict]:
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def _write_csv(path: str, fields: list[str], rows) -> None:
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(fields)
+        writer.writerows(rows)
+
+
+def read_sources(source_dir: str = SOURCE_DIR):
+    """Read the CSV sources into (NETWORK_SLUG, SCORE_REGIONS, GAMES) with
+    the same shapes as auto_scoreblock_data."""
+    network_slug = {row['network']: row['slug']
+                    for row in _read_csv(os.path.join(source_dir, NETWORKS_CSV))}
+
+    score_regions = {}
+    for row in _read_csv(os.path.join(source_dir, SCORE_REGIONS_CSV)):
+        cell = {'status': row['status']}
+        if row['status'] == 'ticker':
+            cell['rect'] = [float(row[k]) for k in ('xmin', 'ymin', 'xmax', 'ymax')]
+        score_regions[f"{row['slug']}_{row['year']}"] = cell
+
+    games: dict[tuple, list] = {}
+    for row in _read_csv(os.path.join(source_dir, GAMES_CSV)):
+        key = (int(row['year']), row['season_type'], int(row['week']))
+        games.setdefault(key, []).append((row['away'], row['home'], row['network']))
+
+    return network_slug, score_regions, games
+
+
+def export_sources(network_slug, score_regions, games,
+                   source_dir: str = SOURCE_DIR) -> None:
+    """Write the three tables out as CSV sources."""
+    os.makedirs(source_dir, exist_ok=True)
+    _write_csv(os.path.join(source_dir, NETWORKS_CSV), ['network', 'slug'],
+               sorted(network_slug.items()))
+    rows = []
+    for key in sorted(score_regions):
+        slug, _, year = key.rpartition('_')
+        cell = score_regions[key]
+        rows.append([slug, year, cell['status'], *cell.get('rect', [''] * 4)])
+    _write_csv(os.path.join(source_dir, SCORE_REGIONS_CSV),
+               ['slug', 'year', 'status', 'xmin', 'ymin', 'xmax', 'ymax'], rows)
+    _write_csv(os.path.join(source_dir, GAMES_CSV),
+               ['year', 'season_type', 'week', 'away', 'home', 'network'],
+               ([year, season_type, week, *record]
+                for (year, season_type, week) in sorted(games)
+                for record in games[(year, season_type, week)]))
+
+
+# ----- Validation ------------------------------------------------------------
+
+def validate(network_slug, score_regions, games) -> list[str]:
+    """Return a list of problems with the tables (empty if they're valid)."""
+    errors = []
+    slugs = set(network_slug.values())
+    if len(slugs) != len(network_slug):
+        errors.append('NETWORK_SLUG: two networks share a slug')
+
+    for key, cell in score_regions.items():
+        slug, _, year = key.rpartition('_')
+        if slug not in slugs:
+            errors.append(f'SCORE_REGIONS {key}: unknown network slug {slug!r}')
+        if not year.isdigit():
+            errors.append(f'SCORE_REGIONS {key}: bad year {year!r}')
+        status = cell.get('status')
+        if status not in scoreblock_pack.STATUS_CODES:
+            errors.append(f'SCORE_REGIONS {key}: unknown status {status!r}')
+        rect = cell.get('rect')
+        if status == 'ticker':
+            if rect is None or len(rect) != 4:
+                errors.append(f'SCORE_REGIONS {key}: ticker without a 4-value rect')
+            elif not all(0.0 <= v <= 1.0 for v in rect):
+                errors.append(f'SCORE_REGIONS {key}: rect {rect} outside [0, 1]')
+            elif not (rect[0] < rect[2] and rect[1] < rect[3]):
+                errors.append(f'SCORE_REGIONS {key}: rect {rect} is empty')
+        elif rect is not None:
+            errors.append(f'SCORE_REGIONS {key}: {status} cell has a rect')
+
+    for (year, season_type, week), records in games.items():
+        where = f'GAMES {year} {season_type} {week}'
+        if season_type not in scoreblock_pack.SEASON_TYPE_CODES:
+            errors.append(f'{where}: unknown season type')
+        if not 1 <= week <= 255:
+            errors.append(f'{where}: week out of range')
+        seen_games = set()
+        seen_teams = set()
+        for away, home, network in records:
+            if network not in network_slug:
+                errors.append(f'{where}: {away} at {home}: network {network!r} '
+                              f'not in NETWORK_SLUG')
+            ids = (team_id(away), team_id(home))
+            for name, tid in zip((away, home), ids):
+                if tid is None:
+                    errors.append(f'{where}: unknown team {name!r}')
+                elif tid in seen_teams:
+                    errors.append(f'{where}: {name} plays twice')
+                seen_teams.add(tid)
+            if ids in seen_games:
+                errors.append(f'{where}: duplicate game {away} at {home}')
+            seen_games.add(ids)
+    return errors
+
+
+def validate_delta(pack: scoreblock_pack.DataPack, delta: dict) -> list[str]:
+    """Validate a delta against the pack it's going to be applied to.
+
+    Only the networks, the delta's own cells and the weeks it touches are
+    checked, so this doesn't decode historic seasons. A delta the pack has
+    already applied is reported as such, without checking its games (they'd
+    all be duplicates).
+    """
+    if not isinstance(delta.get('id'), str) or not delta['id']:
+        return ['delta: missing id']
+    if any(d['id'] == delta['id'] for d in pack.deltas):
+        return [f"delta {delta['id']!r}: already applied to this pack"]
+    network_slug = dict(pack.NETWORK_SLUG)
+    network_slug.update(delta.get('networks', {}))
+    errors = []
+    games: dict[tuple, list] = {}
+    try:
+        for row in delta.get('games', []):
+            year, season_type, week, away, home, network = row
+            if not all(type(v) is int for v in (year, week)):
+                errors.append(f'delta game {row}: year and week must be integers')
+                continue
+            if not all(isinstance(v, str)
+                       for v in (season_type, away, home, network)):
+                errors.append(f'delta game {row}: season_type, teams and '
+                              f'network must be strings')
+                continue
+            key = (year, season_type, week)
+            if key not in games:
+                games[key] = list(pack.GAMES.get(key, []))
+            games[key].append((away, home, network))
+    except (TypeError, ValueError):
+        return ['delta: games must be [year, season_type, week, away, home, '
+                'network] rows']
+    return errors + validate(network_slug, delta.get('score_regions', {}), games)
+
+
+def merge_delta(network_slug, score_regions, games, delta: dict) -> None:
+    """Merge a delta into source tables, in place."""
+    network_slug.update(delta.get('networks', {}))
+    score_regions.update(delta.get('score_regions', {}))
+    for year, season_type, week, away, home, network in delta.get('games', []):
+        games.setdefault((year, season_type, week), []).append(
+            (away, home, network))
+
+
+# ----- Outputs ---------------------------------------------------------------
+
+_MODULE_HEADER = '''\
+"""
+Embedded auto-scoreblock data — DO NOT EDIT BY HAND.
+
+Generated by build_scoreblocker_data.py from the CSV sources in data/.
+Edit those and re-run `python build_scoreblocker_data.py build` after
+updating annotations / capturing new seasons.
+
+SCORE_REGIONS: keyed by f"{network_slug}_{year}", e.g. "cbs_2024".
+  status="ticker"    -> rect = [xmin, ymin, xmax, ymax] normalized to the
+                                video frame (16:9), per-coord median across
+                                that cell's hand-labeled boxes.
+  status="no_ticker" -> the user reviewed captures from this cell and
+                                confirmed no other-games ticker is shown
+                                (e.g. NBC Sunday Night Football).
+
+GAMES: keyed by (year, season_type, week) -> list of (away_short, home_short,
+network). Used to find the broadcast network for a game given the team names
+parsed out of a browser window title. season_type is "reg" or "post".
+
+NETWORK_SLUG: maps the lookup's display network names ("CBS", "Amazon Prime
+Video", "ESPN+", "Yahoo!", ...) to the slug used in SCORE_REGIONS keys
+("cbs", "amazon-prime-video", "espn-plus", "yahoo"). Mirrors the slug
+function in capture_frames.py.
+
+CONTENT_HASH: SHA-256 content hash of the tables, identical to the one
+stamped into auto_scoreblock_data.sbpack.
+"""
+
+'''
+
+
+def render_module(network_slug, score_regions, games, content_hash: str) -> str:
+    """Render the auto_scoreblock_data.py source for the tables."""
+    lines = [_MODULE_HEADER, f"CONTENT_HASH = '{content_hash}'", '',
+             'NETWORK_SLUG = {']
+    lines += [f'    {name!r}: {network_slug[name]!r},'
+              for name in sorted(network_slug)]
+    lines += ['}', '', 'SCORE_REGIONS = {']
+    lines += [f'    {key!r}: {json.dumps(score_regions[key])},'
+              for key in sorted(score_regions)]
+    lines += ['}', '', 'GAMES = {']
+    for key in sorted(games):
+        lines.append(f'    {key!r}: [')
+        lines += [f'        {tuple(record)!r},' for record in games[key]]
+        lines.append('    ],')
+    lines += ['}', '']
+    return '\n'.join(lines)
+
+
+def _line_ending(path: str) -> str:
+    """The line ending `path` already uses ('\\n' if it doesn't exist), so
+    regenerating unchanged tables leaves the file as it was."""
+    try:
+        with open(path, 'rb') as f:
+            first = f.readline()
+    except OSError:
+        return '\n'
+    return '\r\n' if first.endswith(b'\r\n') else '\n'
+
+
+def build(network_slug, score_regions, games,
+          pack_path: str = scoreblock_pack.DEFAULT_PACK_PATH,
+          module_path: str = MODULE_PATH) -> str:
+    """Write the pack and the Python module. Returns the content hash."""
+    scoreblock_pack.write_pack(pack_path, network_slug, score_regions, games)
+    pack = scoreblock_pack.DataPack(pack_path)
+    try:
+        digest = pack.content_hash
+    finally:
+        pack.close()
+    source = render_module(network_slug, score_regions, games, digest)
+    tmp = module_path + '.tmp'
+    with open(tmp, 'w', newline=_line_ending(module_path),
+              encoding='utf-8') as f:
+        f.write(source)
+    os.replace(tmp, module_path)
+    return digest
+
+
+def _write_failed(e: OSError) -> None:
+    """Report an output that couldn't be written (typically, on Windows,
+    the pack while a running ScoreBlocker has it mapped) and exit."""
+    target = e.filename2 or e.filename
+    print(f"error: can't write {target}: {e.strerror or e}", file=sys.stderr)
+    print('If a ScoreBlocker window is running it keeps the data pack open; '
+          'close it and try again.', file=sys.stderr)
+    sys.exit(1)
+
+
+def _report(errors: list[str]) -> bool:
+    for e in errors:
+        print(f'error: {e}', file=sys.stderr)
+    if errors:
+        print(f'{len(errors)} problem(s) found', file=sys.stderr)
+    return not errors
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compile auto-scoreblock data sources into '
+                    'auto_scoreblock_data.py and auto_scoreblock_data.sbpack')
+    parser.add_argument('command', choices=['build', 'check', 'export',
+                                            'apply-delta', 'compact'])
+    parser.add_argument('delta', nargs='?',
+                        help='Delta JSON file (apply-delta only)')
+    parser.add_argument('--update-sources', action='store_true',
+                        help='apply-delta: also merge the delta into the sources')
+    parser.add_argument('--sources', default=SOURCE_DIR,
+                        help='Directory holding the CSV sources')
+    parser.add_argument('--pack', default=scoreblock_pack.DEFAULT_PACK_PATH,
+                        help='Path of the data pack to write')
+    parser.add_argument('--module', default=MODULE_PATH,
+                        help='Path of the Python data module to write')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        from auto_scoreblock_data import SCORE_REGIONS, GAMES, NETWORK_SLUG
+        export_sources(NETWORK_SLUG, SCORE_REGIONS, GAMES, args.sources)
+        print(f'Exported sources to {args.sources}')
+        sys.exit(0)
+
+    if args.command == 'compact':
+        try:
+            old_size, new_size = scoreblock_pack.compact_pack(args.pack)
+        except OSError as e:
+            _write_failed(e)
+        print(f'Compacted {args.pack}: {old_size} -> {new_size} bytes')
+        sys.exit(0)
+
+    if args.command == 'apply-delta':
+        if not args.delta:
+            parser.error('apply-delta needs a delta file')
+        with open(args.delta, encoding='utf-8') as f:
+            delta = json.load(f)
+        pack = scoreblock_pack.DataPack(args.pack)
+        errors = validate_delta(pack, delta)
+        pack.close()
+        if not _report(errors):
+            sys.exit(1)
+        t0 = time.perf_counter()
+        try:
+            entry = scoreblock_pack.apply_delta(args.pack, delta)
+        except ValueError as e:
+            print(f'error: {e}', file=sys.stderr)
+            sys.exit(1)
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        print(f"Applied delta {entry['id']} to {args.pack}: {entry['games']} "
+              f"game(s), {len(entry['score_regions'])} cell(s) in "
+              f"{elapsed_ms:.1f} ms (content hash {entry['content_hash'][:16]})")
+        if args.update_sources:
+            tables = read_sources(args.sources)
+            merge_delta(*tables, delta)
+            export_sources(*tables, args.sources)
+            print(f'Merged delta into {args.sources}')
+        sys.exit(0)
+
+    tables = read_sources(args.sources)
+    if not _report(validate(*tables)):
+        sys.exit(1)
+    if args.command == 'check':
+        print('Sources OK')
+        sys.exit(0)
+    try:
+        digest = build(*tables, pack_path=args.pack, module_path=args.module)
+    except OSError as e:
+        _write_failed(e)
+    print(f'Wrote {args.pack} and {args.module} (content hash {digest[:16]})')
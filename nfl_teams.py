@@ -0,0 +1,192 @@
+"""
+Canonical NFL team registry.
+
+Every franchise has a stable small-integer team id (1-32). The data pack
+stores games as team ids, and page titles are resolved to ids by an exact
+dictionary lookup against every name a team has gone by since 2009:
+
+    team_id("Los Angeles Chargers") -> 18
+    team_id("San Diego Chargers")   -> 18
+    team_id("Washington Redskins")  -> 32
+    team_id("Chargers")             -> 18
+    team_id("LAC")                  -> 18
+
+    short_name(32, 2021) -> 'Washington'   (the name GAMES uses that season)
+    full_name(32, 2021)  -> 'Washington Football Team'
+
+Ids are part of the data-pack format: never renumber a team, only append.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+FIRST_YEAR = 1900
+LAST_YEAR = 9999
+
+
+@dataclass(frozen=True)
+class TeamEra:
+    first_year: int
+    last_year: int
+    city: str
+    nickname: str
+    # The short name the auto_scoreblock_data GAMES table uses in this era.
+    short: str
+
+    @property
+    def full_name(self) -> str:
+        return f'{self.city} {self.nickname}'
+
+
+@dataclass(frozen=True)
+class Team:
+    id: int
+    abbr: str
+    eras: tuple[TeamEra, ...]
+    # Extra names that aren't derivable from the eras (old abbreviations).
+    aliases: tuple[str, ...] = ()
+
+    def era(self, year: int) -> TeamEra:
+        for era in self.eras:
+            if era.first_year <= year <= era.last_year:
+                return era
+        return self.eras[-1] if year > self.eras[-1].last_year else self.eras[0]
+
+
+def _team(team_id, abbr, city, nickname, aliases=()):
+    return Team(team_id, abbr,
+                (TeamEra(FIRST_YEAR, LAST_YEAR, city, nickname, nickname),),
+                aliases)
+
+
+TEAMS = (
+    _team(1, 'ARI', 'Arizona', 'Cardinals'),
+    _team(2, 'ATL', 'Atlanta', 'Falcons'),
+    _team(3, 'BAL', 'Baltimore', 'Ravens'),
+    _team(4, 'BUF', 'Buffalo', 'Bills'),
+    _team(5, 'CAR', 'Carolina', 'Panthers'),
+    _team(6, 'CHI', 'Chicago', 'Bears'),
+    _team(7, 'CIN', 'Cincinnati', 'Bengals'),
+    _team(8, 'CLE', 'Cleveland', 'Browns'),
+    _team(9, 'DAL', 'Dallas', 'Cowboys'),
+    _team(10, 'DEN', 'Denver', 'Broncos'),
+    _team(11, 'DET', 'Detroit', 'Lions'),
+    _team(12, 'GB', 'Green Bay', 'Packers', ('GNB',)),
+    _team(13, 'HOU', 'Houston', 'Texans'),
+    _team(14, 'IND', 'Indianapolis', 'Colts'),
+    _team(15, 'JAX', 'Jacksonville', 'Jaguars', ('JAC',)),
+    _team(16, 'KC', 'Kansas City', 'Chiefs', ('KAN',)),
+    Team(17, 'LV', (
+        TeamEra(FIRST_YEAR, 2019, 'Oakland', 'Raiders', 'Raiders'),
+        TeamEra(2020, LAST_YEAR, 'Las Vegas', 'Raiders', 'Raiders'),
+    ), ('OAK', 'LVR')),
+    Team(18, 'LAC', (
+        TeamEra(FIRST_YEAR, 2016, 'San Diego', 'Chargers', 'Chargers'),
+        TeamEra(2017, LAST_YEAR, 'Los Angeles', 'Chargers', 'Chargers'),
+    ), ('SD', 'SDG')),
+    Team(19, 'LAR', (
+        TeamEra(FIRST_YEAR, 2015, 'St. Louis', 'Rams', 'Rams'),
+        TeamEra(2016, LAST_YEAR, 'Los Angeles', 'Rams', 'Rams'),
+    ), ('STL', 'LA')),
+    _team(20, 'MIA', 'Miami', 'Dolphins'),
+    _team(21, 'MIN', 'Minnesota', 'Vikings'),
+    _team(22, 'NE', 'New England', 'Patriots', ('NWE',)),
+    _team(23, 'NO', 'New Orleans', 'Saints', ('NOR',)),
+    _team(24, 'NYG', 'New York', 'Giants'),
+    _team(25, 'NYJ', 'New York', 'Jets'),
+    _team(26, 'PHI', 'Philadelphia', 'Eagles'),
+    _team(27, 'PIT', 'Pittsburgh', 'Steelers'),
+    _team(28, 'SF', 'San Francisco', '49ers', ('SFO',)),
+    _team(29, 'SEA', 'Seattle', 'Seahawks'),
+    _team(30, 'TB', 'Tampa Bay', 'Buccaneers', ('TAM',)),
+    _team(31, 'TEN', 'Tennessee', 'Titans'),
+    Team(32, 'WAS', (
+        TeamEra(FIRST_YEAR, 2019, 'Washington', 'Redskins', 'Redskins'),
+        TeamEra(2020, 2021, 'Washington', 'Football Team', 'Washington'),
+        TeamEra(2022, LAST_YEAR, 'Washington', 'Commanders', 'Commanders'),
+    ), ('WSH',)),
+)
+
+TEAMS_BY_ID = {team.id: team for team in TEAMS}
+
+
+def normalize_name(name: str) -> str:
+    """Case-fold, drop periods and collapse whitespace ("St. Louis" and
+    "st louis" normalize the same)."""
+    return ' '.join(name.casefold().replace('.', '').split())
+
+
+def _build_aliases() -> dict[str, int]:
+    """Map every name (as written, and normalized) to its team id."""
+    by_name: dict[str, int] = {}
+    city_teams: dict[str, set[int]] = {}
+    for team in TEAMS:
+        names = {team.abbr, *team.aliases}
+        for era in team.eras:
+            names.update((era.full_name, era.nickname, era.short))
+            city_teams.setdefault(era.city, set()).add(team.id)
+        for name in names:
+            by_name[name] = by_name[normalize_name(name)] = team.id
+    # A city alone identifies a team only where no other franchise has
+    # played there (not New York or Los Angeles).
+    for city, ids in city_teams.items():
+        if len(ids) == 1:
+            (tid,) = ids
+            by_name.setdefault(city, tid)
+            by_name.setdefault(normalize_name(city), tid)
+    return by_name
+
+
+TEAM_ALIASES = _build_aliases()
+
+
+def team_id(name: str) -> int | None:
+    """Return the team id for any known full name, nickname, unambiguous
+    city or abbreviation, or None."""
+    tid = TEAM_ALIASES.get(name)
+    if tid is None:
+        tid = TEAM_ALIASES.get(normalize_name(name))
+    return tid
+
+
+def team_id_suffix(text: str) -> int | None:
+    """Like team_id(), but tolerates leading noise before the name, e.g. the
+    "(2) " unread-count prefix some sites put in page titles. Tries the
+    whole string, then each shorter run of trailing words."""
+    tid = team_id(text)
+    if tid is None:
+        words = text.split()
+        for i in range(1, len(words)):
+            tid = team_id(' '.join(words[i:]))
+            if tid is not None:
+                break
+    return tid
+
+
+# Every "<city> <nickname>" a team has gone by, normalized, to its id.
+TEAM_FULL_NAMES = {normalize_name(era.full_name): team.id
+                   for team in TEAMS for era in team.eras}
+
+
+def full_name_id(text: str, noise: bool = False) -> int | None:
+    """The team id for a full "<city> <nickname>" name from any era, or
+    None; nicknames, cities and abbreviations alone don't count. With
+    `noise`, leading words before the name are skipped, as in
+    team_id_suffix()."""
+    words = normalize_name(text).split()
+    for i in range(len(words) if noise else 1):
+        tid = TEAM_FULL_NAMES.get(' '.join(words[i:]))
+        if tid is not None:
+            return tid
+    return None
+
+
+def short_name(tid: int, year: int) -> str:
+    """The GAMES short name for a team in a given season."""
+    return TEAMS_BY_ID[tid].era(year).short
+
+
+def full_name(tid: int, year: int) -> str:
+    """The nfl.com-style full name for a team in a given season."""
+    return TEAMS_BY_ID[tid].era(year).full_name
@@ -8,6 +8,9 @@ import os
 import argparse
 import subprocess
 import sys
+import threading
+import time
+from datetime import datetime
 from typing import Dict, Any
 
 # Enable unbuffered output
@@ -17,8 +20,93 @@ if hasattr(sys.stdout, 'reconfigure'):
     except:
         pass
 
+# Window title of every ScoreBlocker overlay (see setup_window).
+OVERLAY_TITLE = "ScoreBlocker2000"
+
+# Border colour while an auto-position lookup is running.
+BUSY_COLOR = '#3388ee'
+
+
+# Auto-position trace: one JSON line per lookup, in a rotating file next to
+# the settings file.
+TRACE_MAX_BYTES = 1_000_000
+TRACE_BACKUPS = 2
+
+
+# Auto-position lookups, run on a worker thread by _run_in_background. The
+# import is here too: the first one loads the ticker data. `trace` is
+# ScoreBlocker._trace.
+
+def _import_auto_position():
+    """Return (auto_position, milliseconds the import took)."""
+    start = time.perf_counter()
+    import auto_position
+    return auto_position, (time.perf_counter() - start) * 1000
+
+
+def _warm_up():
+    """Import auto_position and warm it up (see auto_position.warm_up) at
+    low priority."""
+    _lower_thread_priority()
+    start = time.perf_counter()
+    try:
+        auto_position, _import_ms = _import_auto_position()
+        auto_position.warm_up()
+    except Exception as e:
+        print(f"auto-position warm-up failed: {e}")
+        return
+    print(f"auto-position ready ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+
+def _lower_thread_priority():
+    """Best effort: run the calling thread below normal priority."""
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            THREAD_PRIORITY_BELOW_NORMAL = -1
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(),
+                                       THREAD_PRIORITY_BELOW_NORMAL)
+        elif sys.platform.startswith('linux'):
+            # A thread id here renices just that thread (and threads it starts).
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except (OSError, AttributeError):
+        pass
+
+
+def _decide_position(trace):
+    start = time.perf_counter()
+    auto_position, import_ms = _import_auto_position()
+    decision = auto_position.decide_position()
+    decision.timings['import'] = round(import_ms, 3)
+    trace('double_click', [decision], start)
+    return decision
+
+
+def _plan_all_overlays(own, trace):
+    """(source, [(overlay handle, Decision), ...], detail) for the a key;
+    source is None (and detail says why) if there's nothing to place."""
+    start = time.perf_counter()
+    auto_position, import_ms = _import_auto_position()
+    source = auto_position.get_window_source()
+    decisions = auto_position.decide_positions()
+    for decision in decisions:
+        decision.timings['import'] = round(import_ms, 3)
+    trace('place_all', decisions, start)
+    if source is None or not any(d.window is not None for d in decisions):
+        detail = decisions[0].detail if decisions else 'no NFL games found'
+        return None, [], detail
+
+    overlays = []
+    for handle in set(source.windows_titled(OVERLAY_TITLE)) | {own}:
+        rect = source.window_rect(handle)
+        if rect is not None:
+            overlays.append((handle, rect))
+    return source, auto_position.plan_overlays(overlays, decisions), ''
+
+
 class ScoreBlocker:
-    def __init__(self, config_file=None, position='primary'):
+    def __init__(self, config_file=None, position='primary', follow=False):
         import tkinter as tk
         self.tk = tk  # Store reference to tk module
         self.root = tk.Tk()
@@ -41,10 +129,23 @@ class ScoreBlocker:
         self.start_height = 0
         self.background_color = '#000000'
         self.border_color = '#D3D3D3'
+        # Follow mode: after a double-click finds a game, keep the overlay on
+        # that window's ticker as the window moves or changes game.
+        self.follow = follow
+        self._follower = None
+        self._follow_gen = 0
+        self.trace_file = os.path.join(
+            os.path.dirname(os.path.abspath(self.settings_file)),
+            f"auto_position_trace_{position}.jsonl")
+        self._trace_logger = None
 
         self.setup_window()
         self.load_settings()
         self.bind_events()
+
+        # Warm up auto-position in the background once the window has been
+        # drawn, so the first double-click is as quick as later ones.
+        self._warm_up_bind = self.root.bind('<Expose>', self._on_first_expose, '+')
         
     def setup_window(self):
         """Configure the main window properties"""
@@ -52,9 +153,10 @@ class ScoreBlocker:
         self.root.overrideredirect(True)
 
         # Set a recognizable WM_NAME so external tools (the geometry-capture
-        # script in auto-scoreblock) can find ScoreBlocker windows by title.
+        # script in auto-scoreblock) and other instances (the a key) can find
+        # ScoreBlocker windows by title.
         # Not visible since there's no title bar.
-        self.root.wm_title("ScoreBlocker2000")
+        self.root.wm_title(OVERLAY_TITLE)
         
         # Set initial size and position
         self.root.geometry("200x100+100+100")
@@ -107,6 +209,7 @@ class ScoreBlocker:
                     # Load color settings
                     self.background_color = settings.get('background_color', '#000000')
                     self.border_color = settings.get('border_color', '#D3D3D3')
+                    self.follow = self.follow or settings.get('follow', False)
 
                     # Apply colors to UI
                     self.root.configure(
@@ -169,6 +272,8 @@ class ScoreBlocker:
         # the ScoreBlocker is currently on.
         self.root.bind('<KeyPress-c>', lambda e: self._snap_to_network('cbs'))
         self.root.bind('<KeyPress-f>', lambda e: self._snap_to_network('fox'))
+        # a = auto-position every running ScoreBlocker, one per NFL game.
+        self.root.bind('<KeyPress-a>', lambda e: self._place_all_overlays())
         
     def on_enter(self, event):
         """Show text when mouse enters window"""
@@ -321,7 +426,11 @@ class ScoreBlocker:
         Flash colour signals the outcome:
           green  - found a game; either moved the window onto the ticker, or
                    the cell is known to have no ticker (window unchanged)
-          yellow - found a game but this (network, year) cell isn't yet annotated
+          orange - found a game whose (network, year) cell isn't annotated
+                   yet; moved the window to that network's ticker from the
+                   nearest year it has one annotated
+          yellow - found a game but this (network, year) cell isn't yet
+                   annotated, and the network has no ticker to guess from
           red    - couldn't find an NFL game in any browser window, or the
                    feature isn't supported on this OS
         In every "no rect" case the window position is left alone.
@@ -331,20 +440,23 @@ class ScoreBlocker:
         self.resizing = False
         self.resize_edge = None
 
-        try:
-            from auto_position import decide_position
-        except ImportError as e:
-            print(f"auto_position not available: {e}")
-            self._flash_border('red')
-            return
+        # Enumerating windows (and, the first time, loading the data) happens
+        # off the tk thread so the overlay keeps repainting and dragging.
+        self._run_in_background(lambda: _decide_position(self._trace),
+                                self._apply_decision)
 
-        decision = decide_position()
+    def _apply_decision(self, decision):
+        """Move and flash for a double-click's Decision (on the tk thread)."""
         print(f"auto-position: {decision.kind} - {decision.detail}")
 
         if decision.kind == 'ticker' and decision.rect:
             x, y, w, h = decision.rect
             self.root.geometry(f"{w}x{h}+{x}+{y}")
             self._flash_border('green')
+        elif decision.kind == 'ticker_guess' and decision.rect:
+            x, y, w, h = decision.rect
+            self.root.geometry(f"{w}x{h}+{x}+{y}")
+            self._flash_border('orange')
         elif decision.kind == 'no_ticker':
             self._flash_border('green')
         elif decision.kind == 'unreviewed':
@@ -352,6 +464,151 @@ class ScoreBlocker:
         else:  # 'no_game', 'unsupported', or anything else
             self._flash_border('red')
 
+        if self.follow and decision.window is not None:
+            self._follow_window(decision.window)
+
+    def _run_in_background(self, work, on_done):
+        """Run work() on a worker thread and on_done(result) back on the tk
+        thread, with the border showing the busy colour in between.
+
+        Generation counter handles overlapping jobs (a second double-click
+        before the first has finished): only the most recent job's result is
+        delivered. If work() raises, the border flashes red instead.
+        """
+        self._job_gen = getattr(self, '_job_gen', 0) + 1
+        my_gen = self._job_gen
+        self._set_border_color(BUSY_COLOR)
+
+        def _deliver(result, error):
+            if self._job_gen != my_gen:
+                return
+            if error is not None:
+                if isinstance(error, ImportError):
+                    print(f"auto_position not available: {error}")
+                else:
+                    print(f"auto-position failed: {error}")
+                self._flash_border('red')
+            else:
+                on_done(result)
+
+        def _worker():
+            result = error = None
+            try:
+                result = work()
+            except Exception as e:
+                error = e
+            try:
+                self.root.after(0, _deliver, result, error)
+            except RuntimeError:
+                pass  # main loop has gone
+
+        threading.Thread(target=_worker, name='scoreblocker-job',
+                         daemon=True).start()
+
+    def _on_first_expose(self, event):
+        self.root.unbind('<Expose>', self._warm_up_bind)
+        # Idle callbacks queued after the Expose run after tk has drawn it.
+        self.root.after_idle(
+            lambda: threading.Thread(target=_warm_up, name='scoreblocker-warm-up',
+                                     daemon=True).start())
+
+    def _trace(self, action, decisions, start=None):
+        """Append an auto-position lookup to the trace file: what it decided,
+        the per-stage timings and the total time since `start` (a
+        perf_counter value; without one, the sum of the stages). Safe to
+        call from any thread."""
+        timings = decisions[0].timings if decisions else {}
+        if start is not None:
+            total_ms = (time.perf_counter() - start) * 1000
+        else:
+            total_ms = sum(timings.values())
+        record = {
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'action': action,
+            'total_ms': round(total_ms, 3),
+            'timings_ms': timings,
+            'windows_examined': decisions[0].windows_examined if decisions else 0,
+            'decisions': [{'kind': d.kind, 'detail': d.detail, 'rect': d.rect}
+                          for d in decisions],
+        }
+        try:
+            if self._trace_logger is None:
+                self._trace_logger = _trace_logger(self.trace_file)
+            self._trace_logger.info(json.dumps(record))
+        except Exception as e:
+            print(f"Error writing auto-position trace: {e}")
+
+    def _follow_window(self, handle):
+        """Keep the overlay on the ticker for the game in window `handle`
+        until it closes (or the next double-click picks a window)."""
+        from auto_position import follow_window
+
+        self._stop_following()
+        my_gen = self._follow_gen
+        self._follower = follow_window(
+            handle, lambda decision: self._on_follow_decision(decision, my_gen))
+
+    def _stop_following(self):
+        """Stop the follower without waiting for its thread (it may be
+        blocked handing us a decision); the generation bump drops anything
+        it still delivers."""
+        self._follow_gen += 1
+        if self._follower is not None:
+            self._follower.stop()
+            self._follower = None
+
+    def _on_follow_decision(self, decision, gen):
+        """Called on the follower's thread; hand the decision to tk's."""
+        if gen != self._follow_gen:
+            return
+        self._trace('follow', [decision])
+        try:
+            self.root.after(0, self._apply_follow_decision, decision, gen)
+        except RuntimeError:
+            pass  # main loop has gone
+
+    def _apply_follow_decision(self, decision, gen):
+        # Generation counter handles replaced followers: a decision from one
+        # that has since been stopped (e.g. its window closing) is ignored.
+        if gen != self._follow_gen:
+            return
+        print(f"follow: {decision.kind} - {decision.detail}")
+        if decision.window is None:
+            self._follower = None
+        elif decision.kind in ('ticker', 'ticker_guess') and decision.rect:
+            x, y, w, h = decision.rect
+            self.root.geometry(f"{w}x{h}+{x}+{y}")
+        # Anything else (e.g. the tab left the game) leaves the overlay put.
+
+    def _place_all_overlays(self):
+        """Auto-position every running ScoreBlocker window (this one and any
+        other instances) from a single pass over the browser windows: each
+        overlay goes to the game on its own monitor if there is one, else to
+        the next unclaimed game. Bound to the a key.
+        """
+        own = int(self.root.wm_frame(), 16)
+        self._run_in_background(lambda: _plan_all_overlays(own, self._trace),
+                                lambda result: self._apply_overlay_plan(own, *result))
+
+    def _apply_overlay_plan(self, own, source, plan, detail):
+        if source is None:
+            print(f"place-all: {detail}")
+            self._flash_border('red')
+            return
+
+        placed = 0
+        for handle, decision in plan:
+            print(f"place-all: {handle:#x} {decision.kind} - {decision.detail}")
+            if decision.kind not in ('ticker', 'ticker_guess') or not decision.rect:
+                continue
+            if handle == own:
+                x, y, w, h = decision.rect
+                self.root.geometry(f"{w}x{h}+{x}+{y}")
+                placed += 1
+            elif source.move_window(handle, decision.rect):
+                placed += 1
+        self._flash_border('green' if placed else 'yellow')
+
     def _snap_to_network(self, slug: str):
         """Snap the window onto the most-recent ticker rect for a network,
         on whichever monitor the window is currently on. Bound to c/f keys.
@@ -396,12 +653,10 @@ class ScoreBlocker:
             'green':  '#22cc44',
             'red':    '#cc2222',
             'yellow': '#ddcc22',
+            'orange': '#ee8822',
         }
         c = flash_colors.get(color, color)
-        self.root.configure(highlightbackground=c, highlightcolor=c)
-        # Generation counter handles overlapping flashes: only the most recent
-        # flash gets to restore the original colour.
-        self._flash_gen = getattr(self, '_flash_gen', 0) + 1
+        self._set_border_color(c)
         my_gen = self._flash_gen
         def _restore():
             if self._flash_gen == my_gen:
@@ -411,8 +666,17 @@ class ScoreBlocker:
                 )
         self.root.after(duration_ms, _restore)
 
+    def _set_border_color(self, c):
+        """Tint the border until the next flash or colour change. Any
+        pending flash restore is cancelled."""
+        self.root.configure(highlightbackground=c, highlightcolor=c)
+        # Generation counter handles overlapping flashes: only the most recent
+        # flash gets to restore the original colour.
+        self._flash_gen = getattr(self, '_flash_gen', 0) + 1
+
     def on_right_release(self, event):
         """Handle right-click release - close the application"""
+        self._stop_following()
         self.root.quit()
         return "break"  # Prevent event from propagating to windows below
 
@@ -453,6 +717,30 @@ class ScoreBlocker:
         self.root.mainloop()
 
 
+_trace_logger_lock = threading.Lock()
+
+
+def _trace_logger(path):
+    """A logger that writes bare messages to a rotating file at `path`.
+    The worker and follower threads can both ask for it first, so it's set
+    up under a lock: two handlers on one file would duplicate lines and
+    break rotation."""
+    import logging
+    from logging.handlers import RotatingFileHandler
+
+    with _trace_logger_lock:
+        logger = logging.getLogger(f'scoreblocker.trace.{path}')
+        if not logger.handlers:
+            handler = RotatingFileHandler(path, maxBytes=TRACE_MAX_BYTES,
+                                          backupCount=TRACE_BACKUPS,
+                                          encoding='utf-8', delay=True)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+        return logger
+
+
 def close_all_instances():
     """Close all running ScoreBlocker instances"""
     killed_count = 0
@@ -522,6 +810,9 @@ if __name__ == "__main__":
                        default='primary', help='Which position to load from config (primary or secondary)')
     parser.add_argument('--close_all', action='store_true',
                        help='Close all running ScoreBlocker instances and exit')
+    parser.add_argument('--follow', action='store_true',
+                       help='After a double-click auto-position, keep the window '
+                            'on the game\'s ticker as the browser moves or changes game')
 
     args = parser.parse_args()
 
@@ -537,7 +828,8 @@ if __name__ == "__main__":
             sys.exit(1)
 
     try:
-        app = ScoreBlocker(config_file=args.config_file, position=args.position)
+        app = ScoreBlocker(config_file=args.config_file, position=args.position,
+                           follow=args.follow)
         app.run()
     except Exception as e:
         print(f"Error running ScoreBlocker: {e}")
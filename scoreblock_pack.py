@@ -0,0 +1,1021 @@
+"""
+Compact binary data pack for the auto-scoreblock lookup tables.
+
+Importing auto_scoreblock_data.py means compiling (or at least unmarshalling)
+and executing a ~5.5k-line literal with thousands of tuple constructors on
+the Tk thread. The pack holds the same three tables in a small, versioned,
+memory-mappable file that's read lazily:
+
+    load_data() -> DataPack
+
+    DataPack exposes the same read-only views callers already use:
+      NETWORK_SLUG:  {display network name: slug}
+      SCORE_REGIONS: {"<slug>_<year>": {"status": ..., "rect": [...]}}
+      GAMES:         {(year, season_type, week): [(away, home, network), ...]}
+
+    SCORE_REGIONS is a view over `regions`, a RegionMatrix: dense
+    [network_id, year] arrays of status codes and float32 rects, with
+    NumPy queries across networks and years (numpy is optional and only
+    imported by those queries).
+
+    plus find_game(year, season_type, week, away, home): a dict lookup in
+    a per-season (season_type, week, away, home) -> row index, built when
+    the season's shard is decoded and cached with it in the season LRU;
+    and latest_ticker_rect() / nearest_annotated_year(), bisect lookups in
+    a per-network index of annotated years built when the pack is opened. Games are stored as nfl_teams team ids; GAMES renders
+    them back to the short name each team used that season.
+
+File layout (all integers little-endian):
+
+    header    b'SBPK' | u16 version | u16 flags
+    sections  each starts on an 8-byte boundary
+    toc       count x (4-byte tag | u32 key | u32 offset | u32 length)
+    trailer   u32 toc_offset | u32 toc_count | b'SBPK'
+
+Sections:
+    STRS  string table: u32 n, (n + 1) x u32 offsets into the UTF-8 blob, blob
+    NETS  networks, indexed by network id: u16 name_sid | u16 slug_sid
+    HASH  32-byte SHA-256 content hash of every other section (tag, key and
+          payload, in TOC order), stamped by the compiler
+    REGS  score regions: u8 network_id | u8 status | u16 year | 4 x f32 rect
+    GAMS  season shard segments, TOC key = year:
+            u16 n_buckets | pad
+            n_buckets x (u8 season_type | u8 week | u16 first | u16 count)
+            records: u8 away_team_id | u8 home_team_id | u8 network_id | pad
+    DLTA  (optional) manifest of applied deltas, UTF-8 JSON list
+
+A full build writes one GAMS segment per season. apply_delta() appends: new
+games go into new GAMS segments (a season may have several; their buckets
+are concatenated in TOC order), and replacement STRS / NETS / REGS sections
+are written only when the delta changes networks or score regions. A new
+DLTA manifest, HASH, table of contents and trailer follow; the new table
+points at the existing bytes of everything else. Existing bytes are never
+rewritten, so historic season shards are untouched and applying a one-week
+delta costs a few milliseconds and a few hundred bytes, plus a copy of the
+region table (about 3 KB) when it touches networks or score regions.
+compact_pack() drops the superseded sections.
+
+The trailer lives at the end of the file so readers find the table of
+contents without scanning. Season shards are only decoded when a game from
+that season is looked up, and only the SEASON_CACHE_SIZE most recently used
+seasons are kept decoded. If the pack is missing or unreadable,
+load_data() falls back to auto_scoreblock_data: the module is imported and
+packed once, and the result is cached in __pycache__ under a hash of the
+module's source, so later launches read that snapshot instead.
+
+Packs are produced by build_scoreblocker_data.py, which validates the data
+once at build time and stamps the content hash. The loader trusts a stamped
+pack: beyond the magic and version it does no validation at startup.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from nfl_teams import TEAMS_BY_ID, short_name, team_id
+
+PACK_MAGIC = b'SBPK'
+PACK_VERSION = 5
+
+# Decoded season shards kept in memory (the current season, plus a couple of
+# others for the odd replay of an old game).
+SEASON_CACHE_SIZE = 3
+
+DEFAULT_PACK_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'auto_scoreblock_data.sbpack')
+DEFAULT_MODULE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'auto_scoreblock_data.py')
+
+_HEADER = struct.Struct('<4sHH')
+_TOC_ENTRY = struct.Struct('<4sIII')
+_TRAILER = struct.Struct('<II4s')
+_U32 = struct.Struct('<I')
+_NET = struct.Struct('<HH')
+_REG = struct.Struct('<BBH4f')
+_SHARD_HEADER = struct.Struct('<Hxx')
+_BUCKET = struct.Struct('<BBHH')
+_GREC = struct.Struct('<BBBx')
+
+STATUS_CODES = {'ticker': 1, 'no_ticker': 2}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+_TICKER = STATUS_CODES['ticker']
+
+SEASON_TYPE_CODES = {'reg': 0, 'post': 1}
+SEASON_TYPE_NAMES = {code: name for name, code in SEASON_TYPE_CODES.items()}
+
+
+class PackFormatError(ValueError):
+    """The file isn't a data pack this loader understands."""
+
+
+# ----- Writing ---------------------------------------------------------------
+
+class _StringTable:
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.strings: list[str] = []
+
+    def add(self, s: str) -> int:
+        sid = self.ids.get(s)
+        if sid is None:
+            sid = self.ids[s] = len(self.strings)
+            self.strings.append(s)
+        return sid
+
+    def encode(self) -> bytes:
+        blobs = [s.encode('utf-8') for s in self.strings]
+        offsets = [0]
+        for b in blobs:
+            offsets.append(offsets[-1] + len(b))
+        return (_U32.pack(len(blobs))
+                + struct.pack(f'<{len(offsets)}I', *offsets)
+                + b''.join(blobs))
+
+
+def _encode_networks(network_slug, net_names) -> tuple[bytes, bytes]:
+    """Encode STRS and NETS for networks in id order."""
+    strings = _StringTable()
+    nets = b''.join(_NET.pack(strings.add(name), strings.add(network_slug[name]))
+                    for name in net_names)
+    return strings.encode(), nets
+
+
+def _encode_regions(score_regions, slug_net_id) -> bytes:
+    regs = []
+    for key in sorted(score_regions):
+        slug, _, year = key.rpartition('_')
+        if slug not in slug_net_id:
+            raise ValueError(f'SCORE_REGIONS key {key!r}: unknown network slug')
+        cell = score_regions[key]
+        rect = cell.get('rect') or (0.0, 0.0, 0.0, 0.0)
+        regs.append(_REG.pack(slug_net_id[slug], STATUS_CODES[cell['status']],
+                              int(year), *rect))
+    return b''.join(regs)
+
+
+def _encode_season_shards(games, net_id) -> list[tuple[bytes, int, bytes]]:
+    """Encode {(year, season_type, week): records} as one GAMS section per
+    season, buckets in sorted order."""
+    seasons: dict[int, list] = {}
+    for key in sorted(games):
+        seasons.setdefault(key[0], []).append(key)
+    shards = []
+    for year, keys in seasons.items():
+        buckets = []
+        grec = []
+        n = 0
+        for (_year, season_type, week) in keys:
+            records = games[(year, season_type, week)]
+            buckets.append(_BUCKET.pack(SEASON_TYPE_CODES[season_type], week,
+                                        n, len(records)))
+            for away, home, network in records:
+                away_id = team_id(away)
+                home_id = team_id(home)
+                if away_id is None or home_id is None:
+                    raise ValueError(f'GAMES {year} {season_type} {week}: '
+                                     f'unknown team in {away!r} at {home!r}')
+                grec.append(_GREC.pack(away_id, home_id, net_id[network]))
+            n += len(records)
+        shards.append((b'GAMS', year, _SHARD_HEADER.pack(len(buckets))
+                       + b''.join(buckets) + b''.join(grec)))
+    return shards
+
+
+def _layout(out: bytearray, sections, base: int = 0) -> list[bytes]:
+    """Append sections to `out` on 8-byte boundaries; return TOC entries.
+    `base` is the file offset `out` will be written at."""
+    toc = []
+    for tag, key, data in sections:
+        out += b'\0' * (-(base + len(out)) % 8)
+        toc.append(_TOC_ENTRY.pack(tag, key, base + len(out), len(data)))
+        out += data
+    return toc
+
+
+def _finish(out: bytearray, toc: list[bytes], base: int = 0) -> None:
+    """Append the table of contents and trailer."""
+    out += b'\0' * (-(base + len(out)) % 8)
+    toc_offset = base + len(out)
+    out += b''.join(toc)
+    out += _TRAILER.pack(toc_offset, len(toc), PACK_MAGIC)
+
+
+def build_pack(network_slug, score_regions, games) -> bytes:
+    """Serialize the three lookup tables into pack bytes.
+
+    Output is deterministic for a given input: networks, regions and game
+    buckets are written in sorted order, game records in their given order.
+    The tables are expected to be validated already (see
+    build_scoreblocker_data.validate); this only raises for data the format
+    can't represent.
+    """
+    net_names = sorted(network_slug)
+    net_id = {name: i for i, name in enumerate(net_names)}
+    slug_net_id = {network_slug[name]: i for i, name in enumerate(net_names)}
+    strs, nets = _encode_networks(network_slug, net_names)
+
+    sections = [
+        (b'STRS', 0, strs),
+        (b'NETS', 0, nets),
+        (b'REGS', 0, _encode_regions(score_regions, slug_net_id)),
+    ] + _encode_season_shards(games, net_id)
+    sections.insert(0, (b'HASH', 0, content_hash(sections)))
+
+    out = bytearray(_HEADER.pack(PACK_MAGIC, PACK_VERSION, 0))
+    _finish(out, _layout(out, sections))
+    return bytes(out)
+
+
+def content_hash(sections) -> bytes:
+    """SHA-256 over (tag, key, payload) of each section, in order."""
+    import hashlib
+    h = hashlib.sha256()
+    for tag, key, data in sections:
+        h.update(_TOC_ENTRY.pack(tag, key, 0, len(data)))
+        h.update(data)
+    return h.digest()
+
+
+def _replace_file(path: str, data: bytes) -> None:
+    """Write `data` to `path` through a temporary file. On Windows the
+    replace fails (PermissionError) while another process, such as a
+    running overlay, has the pack mapped; the temporary file is removed and
+    the error re-raised."""
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        os.remove(tmp)
+        raise
+
+
+def write_pack(path: str, network_slug, score_regions, games) -> int:
+    """Build a pack and write it to `path`. Returns the size in bytes."""
+    data = build_pack(network_slug, score_regions, games)
+    _replace_file(path, data)
+    return len(data)
+
+
+def compact_pack(path: str) -> tuple[int, int]:
+    """Rewrite the pack at `path` with only the sections its table of
+    contents uses, dropping what applied deltas superseded. The sections
+    and their order are unchanged, so the content hash is too. Returns
+    (old size, new size) in bytes."""
+    pack = DataPack(path)
+    try:
+        old_size = len(pack._buf)
+        sections = [(tag, key, bytes(pack._buf[offset:offset + length]))
+                    for tag, key, offset, length in pack._toc]
+    finally:
+        pack.close()
+    out = bytearray(_HEADER.pack(PACK_MAGIC, PACK_VERSION, 0))
+    _finish(out, _layout(out, sections))
+    _replace_file(path, bytes(out))
+    return old_size, len(out)
+
+
+def apply_delta(path: str, delta: dict) -> dict:
+    """Apply a season delta to the pack at `path`, in place.
+
+    `delta` is a dict (usually loaded from JSON) with:
+      id:             unique name, e.g. "2025-reg-7"; a pack refuses to apply
+                      the same id twice
+      networks:       optional {network name: slug} additions
+      score_regions:  optional {"<slug>_<year>": cell} new or changed cells
+      games:          optional [[year, season_type, week, away, home,
+                      network], ...] games to add
+
+    Like build_pack(), this expects validated input (see
+    build_scoreblocker_data.validate_delta). Only new sections are appended;
+    nothing already in the file is rewritten. Returns the manifest entry.
+    """
+    pack = DataPack(path)
+    try:
+        manifest = pack.deltas
+        if any(d['id'] == delta['id'] for d in manifest):
+            raise ValueError(f"delta {delta['id']!r} is already applied")
+
+        # Network ids are baked into existing shards, so keep their order and
+        # append new networks at the end.
+        network_slug = dict(pack.NETWORK_SLUG)
+        network_slug.update(delta.get('networks', {}))
+        net_names = pack.network_names + sorted(
+            set(network_slug) - set(pack.network_names))
+        net_id = {name: i for i, name in enumerate(net_names)}
+        slug_net_id = {network_slug[name]: i for i, name in enumerate(net_names)}
+
+        score_regions = dict(pack.SCORE_REGIONS.items())
+        score_regions.update(delta.get('score_regions', {}))
+
+        games: dict[tuple, list] = {}
+        for year, season_type, week, away, home, network in delta.get('games', []):
+            games.setdefault((year, season_type, week), []).append(
+                (away, home, network))
+
+        # Only sections the delta changes are written again; the rest of the
+        # new table of contents points at the existing bytes.
+        rewritten = {}
+        if network_slug != pack.NETWORK_SLUG:
+            rewritten[b'STRS'], rewritten[b'NETS'] = _encode_networks(
+                network_slug, net_names)
+        if rewritten or delta.get('score_regions'):
+            rewritten[b'REGS'] = _encode_regions(score_regions, slug_net_id)
+        new_shards = _encode_season_shards(games, net_id)
+        entry = {
+            'id': delta['id'],
+            'games': len(delta.get('games', [])),
+            'score_regions': sorted(delta.get('score_regions', {})),
+            'networks': sorted(delta.get('networks', {})),
+        }
+        tail = [(b'DLTA', 0, json.dumps(manifest + [entry]).encode('utf-8'))]
+
+        # (tag, key, new payload or None, existing TOC entry or None), in
+        # TOC order: tables, old season shards, new shards, manifest.
+        old = {e[0]: e for e in pack._toc}
+        parts = [(tag, 0, rewritten[tag], None) if tag in rewritten
+                 else (tag, 0, None, old[tag])
+                 for tag in (b'STRS', b'NETS', b'REGS')]
+        parts += [(b'GAMS', e[1], None, e) for e in pack._toc if e[0] == b'GAMS']
+        parts += [(tag, key, data, None) for tag, key, data in new_shards + tail]
+        digest = content_hash(
+            (tag, key, data if e is None else pack._buf[e[2]:e[2] + e[3]])
+            for tag, key, data, e in parts)
+        parts.insert(0, (b'HASH', 0, digest, None))
+    finally:
+        pack.close()
+
+    with open(path, 'r+b') as f:
+        end = f.seek(0, os.SEEK_END)
+        out = bytearray()
+        new_toc = iter(_layout(out, [(tag, key, data)
+                                     for tag, key, data, e in parts if e is None],
+                               base=end))
+        toc = [next(new_toc) if e is None else _TOC_ENTRY.pack(*e)
+               for _tag, _key, _data, e in parts]
+        _finish(out, toc, base=end)
+        f.write(out)
+        f.flush()
+        os.fsync(f.fileno())
+    entry['content_hash'] = digest.hex()
+    return entry
+
+
+# ----- Reading ---------------------------------------------------------------
+
+class GameRecord:
+    """A view of one row of a season's game columns.
+
+    Unpacks and compares like the (away, home, network) tuples GAMES has
+    always held, but is only created when a caller asks for a game.
+    """
+
+    __slots__ = ('_season', '_row')
+
+    def __init__(self, season: _Season, row: int):
+        self._season = season
+        self._row = row
+
+    @property
+    def away_id(self) -> int:
+        return self._season.away[self._row]
+
+    @property
+    def home_id(self) -> int:
+        return self._season.home[self._row]
+
+    @property
+    def away(self) -> str:
+        return self._season.team_names[self.away_id]
+
+    @property
+    def home(self) -> str:
+        return self._season.team_names[self.home_id]
+
+    @property
+    def network(self) -> str:
+        return self._season.network_names[self._season.network[self._row]]
+
+    @property
+    def cell_key(self) -> str | None:
+        """The SCORE_REGIONS key for this game's network and year, or None if
+        the network has no slug."""
+        return self._season.cell_keys[self._season.network[self._row]]
+
+    def __iter__(self):
+        yield self.away
+        yield self.home
+        yield self.network
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, i):
+        return tuple(self)[i]
+
+    def __eq__(self, other):
+        if isinstance(other, (GameRecord, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return repr(tuple(self))
+
+
+class _Season:
+    """One season's games as parallel byte columns (away team id, home team
+    id, network id), with the rows of each (season_type, week) contiguous.
+
+    `index` maps (season_type, week, away_id, home_id) to a game's row. It's
+    built when the shard is decoded and cached with the season, so a lookup
+    is one dict probe; the columns back records() without per-game objects.
+    """
+
+    __slots__ = ('year', 'away', 'home', 'network', 'buckets', 'index',
+                 'network_names', 'network_slugs', 'team_names', 'cell_keys')
+
+    def __init__(self, year: int, rows, network_names, network_slugs):
+        """`rows` yields (season_type, week, away_id, home_id, network_id);
+        rows of the same week needn't be contiguous."""
+        self.year = year
+        self.network_names = network_names
+        self.network_slugs = network_slugs
+        by_bucket: dict[tuple[str, int], list] = {}
+        for season_type, week, away_id, home_id, net in rows:
+            by_bucket.setdefault((season_type, week), []).append(
+                (away_id, home_id, net))
+        self.away = bytearray()
+        self.home = bytearray()
+        self.network = bytearray()
+        self.buckets: dict[tuple[str, int], tuple[int, int]] = {}
+        self.index: dict[tuple[str, int, int, int], int] = {}
+        for key, games in sorted(by_bucket.items()):
+            self.buckets[key] = (len(self.away), len(games))
+            season_type, week = key
+            for away_id, home_id, net in games:
+                self.index[(season_type, week, away_id, home_id)] = len(self.away)
+                self.away.append(away_id)
+                self.home.append(home_id)
+                self.network.append(net)
+        # Per-id lookups for building results: team id -> that season's
+        # short name, network id -> SCORE_REGIONS key (or None without a slug).
+        self.team_names = [short_name(tid, year) if tid in TEAMS_BY_ID else None
+                           for tid in range(max(TEAMS_BY_ID) + 1)]
+        self.cell_keys = [f'{slug}_{year}' if slug is not None else None
+                          for slug in network_slugs]
+
+    def records(self, season_type: str, week: int) -> list[GameRecord]:
+        first, count = self.buckets[(season_type, week)]
+        return [GameRecord(self, row) for row in range(first, first + count)]
+
+    def find(self, season_type: str, week: int, away_id: int,
+             home_id: int) -> int | None:
+        """Return the row of a game, or None."""
+        return self.index.get((season_type, week, away_id, home_id))
+
+
+class RegionMatrix:
+    """SCORE_REGIONS as a dense [network_id, year] table.
+
+    `status` holds one code per cell (0 = not annotated, else a STATUS_CODES
+    value) and `rects` four float32s per cell (the normalized [xmin, ymin,
+    xmax, ymax] of ticker cells, zeros elsewhere), both flat and row-major
+    over (network id, year - first_year). A cell lookup is two small-int
+    index computations instead of formatting and hashing a key.
+
+    The array queries (arrays(), ticker_rects(), missing_cells()) view the
+    same buffers through NumPy, which is imported on first use; nothing else
+    needs it.
+    """
+
+    def __init__(self, slugs: list[str | None], cells):
+        """`slugs` is indexed by network id; `cells` yields (network_id,
+        year, status_code, rect) for annotated cells."""
+        cells = list(cells)
+        self.slugs = slugs
+        self.slug_ids = {slug: i for i, slug in enumerate(slugs)
+                         if slug is not None}
+        self.first_year = min((c[1] for c in cells), default=0)
+        self.n_years = max((c[1] for c in cells), default=-1) - self.first_year + 1
+        size = len(slugs) * self.n_years
+        self.status = array('B', [0]) * size
+        self.rects = array('f', [0.0]) * (4 * size)
+        for net, year, status, rect in cells:
+            i = net * self.n_years + year - self.first_year
+            self.status[i] = status
+            if status == _TICKER:
+                self.rects[4 * i:4 * i + 4] = array('f', rect)
+        self._arrays = None
+
+    def index(self, slug: str, year: int) -> int | None:
+        """Return the flat cell index for (slug, year), or None if the slug
+        is unknown or the year is outside the table."""
+        net = self.slug_ids.get(slug)
+        y = year - self.first_year
+        if net is None or not 0 <= y < self.n_years:
+            return None
+        return net * self.n_years + y
+
+    def get(self, slug: str, year: int) -> dict | None:
+        """Return the SCORE_REGIONS-style cell for (slug, year), or None if
+        it isn't annotated."""
+        i = self.index(slug, year)
+        if i is None:
+            return None
+        status = self.status[i]
+        if status == _TICKER:
+            return {'status': 'ticker',
+                    'rect': [round(v, 5) for v in self.rects[4 * i:4 * i + 4]]}
+        if status:
+            return {'status': STATUS_NAMES[status]}
+        return None
+
+    def cells(self):
+        """Yield (slug, year, cell) for every annotated cell, by network id
+        then year."""
+        for net, slug in enumerate(self.slugs):
+            for y in range(self.n_years):
+                if self.status[net * self.n_years + y]:
+                    year = self.first_year + y
+                    yield slug, year, self.get(slug, year)
+
+    def __len__(self):
+        return len(self.status) - self.status.count(0)
+
+    def arrays(self):
+        """Return read-only NumPy views (status, rects), shaped
+        (networks, years) and (networks, years, 4)."""
+        if self._arrays is None:
+            import numpy as np
+            shape = (len(self.slugs), self.n_years)
+            status = np.frombuffer(self.status, dtype=np.uint8).reshape(shape)
+            rects = np.frombuffer(self.rects, dtype=np.float32).reshape(shape + (4,))
+            status.flags.writeable = rects.flags.writeable = False
+            self._arrays = (status, rects)
+        return self._arrays
+
+    def ticker_cells(self, year: int | None = None):
+        """Return (cells, rects) for every ticker cell, or only those of
+        `year`: a list of (slug, year) and a float32 (n, 4) array."""
+        import numpy as np
+        status, rects = self.arrays()
+        mask = status == _TICKER
+        if year is not None:
+            y = year - self.first_year
+            if not 0 <= y < self.n_years:
+                return [], np.empty((0, 4), dtype=np.float32)
+            mask[:, :y] = mask[:, y + 1:] = False
+        nets, ys = np.nonzero(mask)
+        return ([(self.slugs[n], self.first_year + int(y)) for n, y in zip(nets, ys)],
+                rects[nets, ys])
+
+    def missing_cells(self):
+        """Return (slug, year) for every unannotated cell from the year a
+        network was first annotated onward, i.e. the gaps the annotator
+        still has to fill."""
+        import numpy as np
+        status, _rects = self.arrays()
+        annotated = status != 0
+        seen = np.logical_or.accumulate(annotated, axis=1)
+        nets, ys = np.nonzero(seen & ~annotated)
+        return [(self.slugs[n], self.first_year + int(y)) for n, y in zip(nets, ys)]
+
+
+class _ScoreRegionsView(Mapping):
+    """Read-only {"<slug>_<year>": {"status", "rect"}} view over a
+    RegionMatrix, for callers of the original dict."""
+
+    def __init__(self, matrix: RegionMatrix):
+        self._matrix = matrix
+
+    def __getitem__(self, key):
+        cell = None
+        if isinstance(key, str):
+            slug, _, year = key.rpartition('_')
+            if year.isdigit():
+                cell = self._matrix.get(slug, int(year))
+        if cell is None:
+            raise KeyError(key)
+        return cell
+
+    def __iter__(self):
+        return iter(sorted(f'{slug}_{year}'
+                           for slug, year, _cell in self._matrix.cells()))
+
+    def __len__(self):
+        return len(self._matrix)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+
+class _NetworkYears:
+    """The annotated SCORE_REGIONS cells of one network, sorted by year."""
+
+    __slots__ = ('years', 'cells', 'ticker_years', 'ticker_rects')
+
+    def __init__(self):
+        self.years: list[int] = []
+        self.cells: list[dict] = []
+        self.ticker_years: list[int] = []
+        self.ticker_rects: list[list[float]] = []
+
+
+def _build_network_index(regions: RegionMatrix) -> dict[str, _NetworkYears]:
+    """Group a region matrix's annotated cells into {slug: _NetworkYears}."""
+    index: dict[str, _NetworkYears] = {}
+    for slug, year, cell in regions.cells():
+        entry = index.get(slug)
+        if entry is None:
+            entry = index[slug] = _NetworkYears()
+        entry.years.append(year)
+        entry.cells.append(cell)
+        if cell['status'] == 'ticker':
+            entry.ticker_years.append(year)
+            entry.ticker_rects.append(cell['rect'])
+    return index
+
+
+def _nearest(years: list[int], year: int) -> int:
+    """Index of the entry of a sorted, non-empty `years` closest to `year`;
+    ties go to the later year."""
+    i = bisect_left(years, year)
+    if i == len(years):
+        return i - 1
+    if years[i] != year and i > 0 and year - years[i - 1] < years[i] - year:
+        return i - 1
+    return i
+
+
+class _LookupTables:
+    """Shared lookups for the pack and the module fallback.
+
+    Subclasses set self.regions (a RegionMatrix), self.networks (see
+    _build_network_index) and self.seasons (the years with games, sorted),
+    and implement season_games().
+    """
+
+    regions: RegionMatrix
+    networks: dict[str, _NetworkYears] = {}
+
+    def latest_ticker_rect(self, slug: str, as_of: int | None = None):
+        """Return the rect of the most recent 'ticker' cell for a network
+        slug, optionally only considering years <= as_of, or None."""
+        entry = self.networks.get(slug)
+        if entry is None or not entry.ticker_years:
+            return None
+        if as_of is None:
+            return entry.ticker_rects[-1]
+        i = bisect_right(entry.ticker_years, as_of)
+        return entry.ticker_rects[i - 1] if i else None
+
+    def nearest_annotated_year(self, slug: str, year: int) -> int | None:
+        """Return the annotated year (any status) closest to `year` for a
+        network slug, or None if the network has no annotated cells. Ties go
+        to the later year, since broadcast graphics tend to carry forward."""
+        nearest = self.nearest_cell(slug, year)
+        return nearest[0] if nearest else None
+
+    def nearest_cell(self, slug: str, year: int):
+        """Return (year, cell) for the annotated cell nearest to `year` (see
+        nearest_annotated_year), or None."""
+        entry = self.networks.get(slug)
+        if entry is None or not entry.years:
+            return None
+        i = _nearest(entry.years, year)
+        return entry.years[i], entry.cells[i]
+
+    def nearest_ticker(self, slug: str, year: int):
+        """Return (year, rect) for the 'ticker' cell nearest to `year` for a
+        network slug, skipping 'no_ticker' years (ties go to the later
+        year), or None if the network has no ticker annotated."""
+        entry = self.networks.get(slug)
+        if entry is None or not entry.ticker_years:
+            return None
+        i = _nearest(entry.ticker_years, year)
+        return entry.ticker_years[i], entry.ticker_rects[i]
+
+    def season_games(self, year: int) -> _Season | None:
+        raise NotImplementedError
+
+    def find_game(self, year: int, season_type: str, week: int,
+                  away: str, home: str):
+        """Return (away, home, network, cell_key) for a game, or None.
+
+        `away` / `home` may be any name nfl_teams knows (full names,
+        nicknames, abbreviations).
+        """
+        away_id = team_id(away)
+        home_id = team_id(home)
+        if away_id is None or home_id is None:
+            return None
+        return self.find_game_ids(year, season_type, week, away_id, home_id)
+
+    def find_game_ids(self, year: int, season_type: str, week: int,
+                      away_id: int, home_id: int):
+        """Like find_game(), for callers that already have team ids."""
+        season = self.season_games(year)
+        if season is None:
+            return None
+        row = season.find(season_type, week, away_id, home_id)
+        if row is None:
+            return None
+        net = season.network[row]
+        names = season.team_names
+        return (names[away_id], names[home_id], season.network_names[net],
+                season.cell_keys[net])
+
+
+def _shard_buckets(shard):
+    """Yield (season_type, week, first, count) from a season shard header."""
+    (n,) = _SHARD_HEADER.unpack_from(shard, 0)
+    end = _SHARD_HEADER.size + n * _BUCKET.size
+    for stype, week, first, count in _BUCKET.iter_unpack(
+            shard[_SHARD_HEADER.size:end]):
+        yield SEASON_TYPE_NAMES[stype], week, first, count
+
+
+class _GamesView(Mapping):
+    """Read-only {(year, season_type, week): [(away, home, network)]} view.
+
+    Each season is a separate shard in the pack (one or more GAMS segments).
+    A shard is decoded the first time one of its weeks is looked up and kept
+    in a small LRU, so resolving a 2025 game never touches 2009-2024. The
+    LRU is shared by every thread that looks games up (ScoreBlocker's
+    worker, warm-up and follower threads), so it's guarded by a lock.
+    """
+
+    def __init__(self, pack: DataPack, shards: dict):
+        self._pack = pack
+        self._shards = shards
+        self._loaded: OrderedDict[int, _Season] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def season(self, year: int) -> _Season:
+        """Return a season's decoded games, decoding its shard if it isn't
+        already loaded. Raises KeyError for seasons that aren't in the pack."""
+        with self._lock:
+            loaded = self._loaded
+            season = loaded.get(year)
+            if season is not None:
+                loaded.move_to_end(year)
+                return season
+            season = loaded[year] = _Season(
+                year, self._shard_rows(year),
+                self._pack.network_names, self._pack.network_slugs)
+            if len(loaded) > SEASON_CACHE_SIZE:
+                loaded.popitem(last=False)
+            return season
+
+    def _shard_rows(self, year: int):
+        for shard in self._shards[year]:
+            (n,) = _SHARD_HEADER.unpack_from(shard, 0)
+            records = shard[_SHARD_HEADER.size + n * _BUCKET.size:]
+            for stype, week, first, count in _shard_buckets(shard):
+                for away_id, home_id, net in _GREC.iter_unpack(
+                        records[first * _GREC.size:(first + count) * _GREC.size]):
+                    yield stype, week, away_id, home_id, net
+
+    def __getitem__(self, key):
+        year, season_type, week = key
+        if year not in self._shards:
+            raise KeyError(key)
+        try:
+            return self.season(year).records(season_type, week)
+        except KeyError:
+            raise KeyError(key) from None
+
+    def _season_keys(self, year: int) -> dict:
+        return {(stype, week): None
+                for shard in self._shards[year]
+                for stype, week, _first, _count in _shard_buckets(shard)}
+
+    def __iter__(self):
+        for year in self._shards:
+            for stype, week in self._season_keys(year):
+                yield (year, stype, week)
+
+    def __len__(self):
+        return sum(len(self._season_keys(year)) for year in self._shards)
+
+    def __bool__(self):
+        return bool(self._shards)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except (KeyError, TypeError, ValueError):
+            return False
+        return True
+
+
+class DataPack(_LookupTables):
+    """A memory-mapped data pack with lazily-decoded table views."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buf = memoryview(self._mm)
+
+        magic, version, _flags = _HEADER.unpack_from(self._buf, 0)
+        if magic != PACK_MAGIC:
+            raise PackFormatError(f'{path}: not a data pack')
+        if version != PACK_VERSION:
+            raise PackFormatError(f'{path}: pack version {version}, '
+                                  f'expected {PACK_VERSION}')
+        toc_offset, toc_count, magic = _TRAILER.unpack_from(
+            self._buf, len(self._buf) - _TRAILER.size)
+        if magic != PACK_MAGIC:
+            raise PackFormatError(f'{path}: truncated pack')
+        self._sections = {}
+        self._toc = list(_TOC_ENTRY.iter_unpack(
+            self._buf[toc_offset:toc_offset + toc_count * _TOC_ENTRY.size]))
+        shards: dict[int, list] = {}
+        for tag, key, offset, length in self._toc:
+            section = self._buf[offset:offset + length]
+            if tag == b'GAMS':
+                shards.setdefault(key, []).append(section)
+            else:
+                self._sections[(tag, key)] = section
+        self.seasons = sorted(shards)
+        self.content_hash = bytes(self._section(b'HASH')).hex()
+
+        strs = self._section(b'STRS')
+        (n,) = _U32.unpack_from(strs, 0)
+        self._str_offsets = struct.unpack_from(f'<{n + 1}I', strs, _U32.size)
+        self._str_blob = strs[_U32.size * (n + 2):]
+        self._str_cache: list[str | None] = [None] * n
+
+        names = []
+        slugs = []
+        for name_sid, slug_sid in _NET.iter_unpack(self._section(b'NETS')):
+            names.append(self.string(name_sid))
+            slugs.append(self.string(slug_sid))
+        self.network_names = names
+        self.network_slugs = slugs
+
+        self.NETWORK_SLUG = dict(zip(names, slugs))
+        self.regions = RegionMatrix(
+            slugs, ((net, year, status, rect) for net, status, year, *rect
+                    in _REG.iter_unpack(self._section(b'REGS'))))
+        self.SCORE_REGIONS = _ScoreRegionsView(self.regions)
+        self.networks = _build_network_index(self.regions)
+        self.GAMES = _GamesView(self, {year: shards[year] for year in self.seasons})
+
+    def season_games(self, year: int) -> _Season | None:
+        if year not in self.GAMES._shards:
+            return None
+        return self.GAMES.season(year)
+
+    @property
+    def deltas(self) -> list[dict]:
+        """The manifest of deltas applied to this pack, oldest first."""
+        manifest = self._sections.get((b'DLTA', 0))
+        return json.loads(bytes(manifest)) if manifest is not None else []
+
+    def close(self) -> None:
+        """Release the mapping. The table views are unusable afterwards.
+
+        Every memoryview this pack took of the mapping is released first;
+        mmap.close() raises BufferError while any is still exported."""
+        with self.GAMES._lock:
+            for shards in self.GAMES._shards.values():
+                for shard in shards:
+                    shard.release()
+            self.GAMES._shards.clear()
+            self.GAMES._loaded.clear()
+        for section in self._sections.values():
+            section.release()
+        self._sections.clear()
+        self._str_blob.release()
+        self._buf.release()
+        self._mm.close()
+
+    def _section(self, tag: bytes, key: int = 0):
+        try:
+            return self._sections[(tag, key)]
+        except KeyError:
+            raise PackFormatError(f'{self.path}: missing {tag.decode()} section')
+
+    def string(self, sid: int) -> str:
+        s = self._str_cache[sid]
+        if s is None:
+            lo = self._str_offsets[sid]
+            hi = self._str_offsets[sid + 1]
+            s = self._str_cache[sid] = bytes(self._str_blob[lo:hi]).decode('utf-8')
+        return s
+
+
+class _ModuleData(_LookupTables):
+    """Fallback: the plain dicts from the auto_scoreblock_data literal."""
+
+    def __init__(self):
+        from auto_scoreblock_data import SCORE_REGIONS, GAMES, NETWORK_SLUG
+        import auto_scoreblock_data
+        self.path = None
+        self.content_hash = getattr(auto_scoreblock_data, 'CONTENT_HASH', None)
+        self.NETWORK_SLUG = NETWORK_SLUG
+        self.GAMES = GAMES
+        self.seasons = sorted({year for year, _stype, _week in GAMES})
+        self.network_names = sorted(NETWORK_SLUG)
+        self.network_slugs = [NETWORK_SLUG[name] for name in self.network_names]
+        slug_net_id = {slug: i for i, slug in enumerate(self.network_slugs)}
+        cells = []
+        for key, cell in SCORE_REGIONS.items():
+            slug, _, year = key.rpartition('_')
+            cells.append((slug_net_id[slug], int(year),
+                          STATUS_CODES[cell['status']], cell.get('rect')))
+        self.regions = RegionMatrix(self.network_slugs, cells)
+        self.SCORE_REGIONS = _ScoreRegionsView(self.regions)
+        self.networks = _build_network_index(self.regions)
+        self._seasons: dict[int, _Season | None] = {}
+
+    def season_games(self, year: int) -> _Season | None:
+        if year not in self._seasons:
+            net_id = {name: i for i, name in enumerate(self.network_names)}
+            rows = [(stype, week, team_id(away),
+                     team_id(home), net_id[network])
+                    for (y, stype, week), records in self.GAMES.items()
+                    if y == year
+                    for away, home, network in records]
+            self._seasons[year] = _Season(
+                year, rows, self.network_names, self.network_slugs) if rows else None
+        return self._seasons[year]
+
+
+def _module_snapshot(module_path: str = DEFAULT_MODULE_PATH):
+    """Open a pack built from the auto_scoreblock_data module, building and
+    caching it on first use. Returns None if the module can't be packed.
+
+    The snapshot lives in __pycache__ next to the module and is named for
+    a hash of the module's source and the pack version, so an edited or
+    replaced module (or a format change) simply misses the cache and
+    rebuilds it; older snapshots of the module are removed then.
+    """
+    import hashlib
+    try:
+        with open(module_path, 'rb') as f:
+            source_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+    except OSError:
+        return None
+    cache_dir = os.path.join(os.path.dirname(module_path), '__pycache__')
+    stem = os.path.splitext(os.path.basename(module_path))[0]
+    snapshot = os.path.join(
+        cache_dir, f'{stem}.{source_hash}.v{PACK_VERSION}.sbpack')
+    try:
+        return DataPack(snapshot)
+    except (OSError, ValueError, struct.error):
+        pass
+
+    try:
+        import auto_scoreblock_data as module
+        data = build_pack(module.NETWORK_SLUG, module.SCORE_REGIONS, module.GAMES)
+        os.makedirs(cache_dir, exist_ok=True)
+        for name in os.listdir(cache_dir):
+            if name.startswith(stem + '.') and name.endswith('.sbpack'):
+                os.remove(os.path.join(cache_dir, name))
+        tmp = f'{snapshot}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, snapshot)
+        return DataPack(snapshot)
+    except (ImportError, OSError, ValueError, struct.error) as e:
+        print(f'scoreblock_pack: could not cache a snapshot of '
+              f'auto_scoreblock_data ({e})')
+        return None
+
+
+def load_data(path: str = DEFAULT_PACK_PATH):
+    """Open the data pack, falling back to a cached snapshot of the
+    auto_scoreblock_data module (see _module_snapshot), then to the module
+    itself.
+
+    Raises ImportError if none is available.
+    """
+    try:
+        return DataPack(path)
+    except (OSError, ValueError, struct.error) as e:
+        print(f'scoreblock_pack: {e}; falling back to auto_scoreblock_data')
+    snapshot = _module_snapshot()
+    if snapshot is not None:
+        return snapshot
+    return _ModuleData()
+
@@ -0,0 +1,33 @@
+"""Tests for auto_position's decisions: run with python -m pytest."""
+
+from __future__ import annotations
+
+import auto_position
+
+VIDEO = (0, 0, 1920, 1080)
+
+
+def test_guess_skips_nearer_no_ticker_years():
+    # ABC is annotated no_ticker for 2015-2021, then has a ticker in 2022.
+    data = auto_position._data
+    assert data.nearest_cell('abc', 2014)[0] == 2015
+    assert data.nearest_ticker('abc', 2014) == (
+        2022, data.regions.get('abc', 2022)['rect'])
+    # Equally far ticker years either side: the later one wins.
+    assert data.nearest_ticker('abc', 2023)[0] == 2024
+    assert data.nearest_ticker('amazon-prime-video', 2021) is None
+
+
+def test_unannotated_cell_uses_nearest_ticker_year():
+    guess = auto_position._data.nearest_ticker('abc', 2014)
+    decision = auto_position._decision_for_cell(
+        None, guess, VIDEO, 'abc_2014', 'Bills', 'Jets', 1, VIDEO)
+    assert decision.kind == 'ticker_guess'
+    assert 'using 2022' in decision.detail
+    assert decision.rect == auto_position.normalized_to_screen(guess[1], VIDEO)
+
+
+def test_unannotated_cell_without_any_ticker_is_unreviewed():
+    decision = auto_position._decision_for_cell(
+        None, None, VIDEO, 'amazon-prime-video_2021', 'Bills', 'Jets', 1, VIDEO)
+    assert decision.kind == 'unreviewed'
@@ -0,0 +1,141 @@
+"""Tests for the data pack's delta path: run with python -m pytest.
+
+A pack that has had deltas applied (and been compacted) must read back the
+same tables as a pack built from scratch from the merged sources."""
+
+from __future__ import annotations
+
+import os
+import shutil
+
+import pytest
+
+import scoreblock_pack
+from build_scoreblocker_data import (SOURCE_DIR, merge_delta, read_sources,
+                                     validate_delta)
+
+# Two deltas as a new season's weeks would add them: the first adds a
+# network, a cell for it and a changed cell for an existing network.
+DELTAS = [
+    {'id': '2026-reg-1',
+     'networks': {'Foo TV': 'foo-tv'},
+     'score_regions': {
+         'foo-tv_2026': {'status': 'ticker', 'rect': [0.1, 0.8, 0.9, 0.9]},
+         'cbs_2025': {'status': 'ticker', 'rect': [0.02, 0.03, 0.1, 0.14]}},
+     'games': [[2026, 'reg', 1, 'Bills', 'Jets', 'CBS'],
+               [2026, 'reg', 1, 'Ravens', 'Steelers', 'Foo TV']]},
+    {'id': '2026-reg-2',
+     'games': [[2026, 'reg', 2, 'Bills', 'Ravens', 'CBS']]},
+]
+
+
+def _tables(pack):
+    return (dict(pack.NETWORK_SLUG), dict(pack.SCORE_REGIONS.items()),
+            {key: [tuple(r) for r in records]
+             for key, records in pack.GAMES.items()})
+
+
+@pytest.fixture
+def pack_path(tmp_path):
+    path = str(tmp_path / 'data.sbpack')
+    shutil.copy(scoreblock_pack.DEFAULT_PACK_PATH, path)
+    return path
+
+
+@pytest.fixture
+def pack(pack_path):
+    pack = scoreblock_pack.DataPack(pack_path)
+    yield pack
+    pack.close()
+
+
+def test_deltas_then_compact_match_a_full_rebuild(pack_path, tmp_path):
+    for delta in DELTAS:
+        scoreblock_pack.apply_delta(pack_path, delta)
+    appended = os.path.getsize(pack_path)
+    old_size, new_size = scoreblock_pack.compact_pack(pack_path)
+    assert old_size == appended and new_size < appended
+
+    sources = read_sources(SOURCE_DIR)
+    for delta in DELTAS:
+        merge_delta(*sources, delta)
+    rebuilt_path = str(tmp_path / 'rebuilt.sbpack')
+    scoreblock_pack.write_pack(rebuilt_path, *sources)
+
+    pack = scoreblock_pack.DataPack(pack_path)
+    rebuilt = scoreblock_pack.DataPack(rebuilt_path)
+    try:
+        assert [d['id'] for d in pack.deltas] == [d['id'] for d in DELTAS]
+        assert _tables(pack) == _tables(rebuilt)
+        for year, season_type, week, away, home, _network in (
+                DELTAS[0]['games'] + DELTAS[1]['games']):
+            found = pack.find_game(year, season_type, week, away, home)
+            assert found is not None
+            assert found == rebuilt.find_game(year, season_type, week, away, home)
+        assert pack.find_game(2026, 'reg', 1, 'Ravens', 'Steelers')[3] == 'foo-tv_2026'
+    finally:
+        pack.close()
+        rebuilt.close()
+
+
+def test_compact_keeps_the_content_hash(pack_path):
+    entry = scoreblock_pack.apply_delta(pack_path, DELTAS[0])
+    scoreblock_pack.compact_pack(pack_path)
+    pack = scoreblock_pack.DataPack(pack_path)
+    try:
+        assert pack.content_hash == entry['content_hash']
+    finally:
+        pack.close()
+
+
+def test_apply_delta_refuses_an_applied_id(pack_path):
+    scoreblock_pack.apply_delta(pack_path, DELTAS[1])
+    with pytest.raises(ValueError, match='already applied'):
+        scoreblock_pack.apply_delta(pack_path, DELTAS[1])
+
+
+def test_valid_deltas_pass(pack):
+    for delta in DELTAS:
+        assert validate_delta(pack, delta) == []
+
+
+def test_validate_delta_reports_an_applied_id(pack_path):
+    scoreblock_pack.apply_delta(pack_path, DELTAS[1])
+    pack = scoreblock_pack.DataPack(pack_path)
+    try:
+        assert validate_delta(pack, DELTAS[1]) == [
+            "delta '2026-reg-2': already applied to this pack"]
+    finally:
+        pack.close()
+
+
+@pytest.mark.parametrize('delta, expected', [
+    ({'games': []}, 'missing id'),
+    ({'id': '', 'games': []}, 'missing id'),
+    ({'id': 7, 'games': []}, 'missing id'),
+    ({'id': 'x', 'games': [[2025, 'post', 1, 'Bills', 'Jets']]},
+     'must be [year, season_type, week, away, home, network] rows'),
+    ({'id': 'x', 'games': [7]},
+     'must be [year, season_type, week, away, home, network] rows'),
+    ({'id': 'x', 'games': [['2025', 'post', 1, 'Bills', 'Jets', 'CBS']]},
+     'year and week must be integers'),
+    ({'id': 'x', 'games': [[2025, 'post', 1.0, 'Bills', 'Jets', 'CBS']]},
+     'year and week must be integers'),
+    ({'id': 'x', 'games': [[2025, 'post', 1, 'Bills', None, 'CBS']]},
+     'must be strings'),
+    ({'id': 'x', 'games': [[2025, 'post', 1, 'Bills', 'Sharks', 'CBS']]},
+     "unknown team 'Sharks'"),
+    ({'id': 'x', 'games': [[2025, 'post', 1, 'Bills', 'Jets', 'Foo TV']]},
+     "network 'Foo TV' not in NETWORK_SLUG"),
+    ({'id': 'x', 'games': [[2025, 'reg', 18, 'Jets', 'Dolphins', 'CBS']]},
+     'Jets plays twice'),
+    ({'id': 'x', 'games': [[2025, 'half', 1, 'Bills', 'Jets', 'CBS']]},
+     'unknown season type'),
+    ({'id': 'x', 'score_regions': {'foo-tv_2025': {'status': 'no_ticker'}}},
+     "unknown network slug 'foo-tv'"),
+    ({'id': 'x', 'score_regions': {'cbs_2025': {'status': 'ticker'}}},
+     'ticker without a 4-value rect'),
+])
+def test_validate_delta_rejects(pack, delta, expected):
+    errors = validate_delta(pack, delta)
+    assert any(expected in e for e in errors), errors
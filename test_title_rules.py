@@ -0,0 +1,101 @@
+"""Tests for title_rules: run with python -m pytest."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from title_rules import TitleRules, season_week
+
+RULES = TitleRules()
+
+# (title, (site, away_id, home_id, year, season_type, week))
+BASELINE_TITLES = [
+    ('Los Angeles Chargers at Denver Broncos 2024 REG 6 - Game Center',
+     ('nfl.com', 18, 10, 2024, 'reg', 6)),
+    ('Los Angeles Chargers at Denver Broncos 2024 REG 6 - Game Center'
+     ' - Google Chrome', ('nfl.com', 18, 10, 2024, 'reg', 6)),
+    ('Kansas City Chiefs at Buffalo Bills 2024 REG 11 - Google Chrome',
+     ('nfl.com', 16, 4, 2024, 'reg', 11)),
+    ('Kansas City Chiefs at Buffalo Bills 2024 REG 11 | NFL.com',
+     ('nfl.com', 16, 4, 2024, 'reg', 11)),
+    ('Kansas City Chiefs at Buffalo Bills 2024 REG 11 — Mozilla Firefox',
+     ('nfl.com', 16, 4, 2024, 'reg', 11)),
+    ('(2) Houston Texans at Kansas City Chiefs 2024 POST 2 - Game Center',
+     ('nfl.com', 13, 16, 2024, 'post', 2)),
+    ('Kansas City Chiefs at Philadelphia Eagles 2024 post 4',
+     ('nfl.com', 16, 26, 2024, 'post', 4)),
+]
+
+
+@pytest.mark.parametrize('title, expected', BASELINE_TITLES)
+def test_baseline_title_shapes_parse(title, expected):
+    parsed = RULES.parse(title)
+    assert parsed is not None
+    assert (parsed.site, parsed.away_id, parsed.home_id, parsed.year,
+            parsed.season_type, parsed.week) == expected
+
+
+@pytest.mark.parametrize('title', [
+    'NFL Scores - Week 6 2024 | NFL.com',
+    'Weather at Lambeau Field 2024 - Google Search',
+    'Foo at Bar 2024 REG 3 - Game Center',
+    'Game Center',
+])
+def test_other_titles_do_not_parse(title):
+    assert RULES.parse(title) is None
+
+
+@pytest.mark.parametrize('title', [
+    'Cardinals at Giants - YouTube TV',
+    'Cardinals vs. Giants | NFL+',
+    'Arizona Cardinals at Giants | Fubo',
+    'St. Louis Cardinals at San Francisco Giants - YouTube TV',
+])
+def test_live_titles_need_full_team_names(title):
+    assert RULES.parse(title) is None
+
+
+def test_live_title_with_full_names_parses():
+    parsed = RULES.parse('Watch Arizona Cardinals at New York Giants - YouTube TV')
+    assert (parsed.site, parsed.away_id, parsed.home_id) == ('youtube-tv', 1, 24)
+
+
+def test_live_titles_are_looked_up_in_the_current_week_only():
+    parsed = RULES.parse('Arizona Cardinals vs New York Giants | NFL+')
+    assert parsed.lookups(date(2024, 9, 8)) == [
+        (2024, 'reg', 1, 1, 24), (2024, 'reg', 1, 24, 1)]
+
+
+def test_dated_titles_try_the_weeks_either_side():
+    parsed = RULES.parse('Ravens @ Chiefs (Sep 5, 2024) Live Score - ESPN')
+    assert [key[2] for key in parsed.lookups(date(2020, 1, 1))] == [1, 0, 2]
+
+
+@pytest.mark.parametrize('day, expected', [
+    # 2024: kickoff Thu Sep 5, 18 regular-season weeks, a week off after
+    # preseason week 3.
+    (date(2024, 8, 1), (2024, 'pre', 0)),      # Hall of Fame game
+    (date(2024, 8, 10), (2024, 'pre', 1)),
+    (date(2024, 8, 17), (2024, 'pre', 2)),
+    (date(2024, 8, 22), (2024, 'pre', 3)),
+    (date(2024, 9, 5), (2024, 'reg', 1)),
+    (date(2024, 9, 9), (2024, 'reg', 1)),      # Monday night
+    (date(2024, 9, 11), (2024, 'reg', 2)),
+    (date(2025, 1, 5), (2024, 'reg', 18)),
+    (date(2025, 1, 12), (2024, 'post', 1)),
+    (date(2025, 1, 19), (2024, 'post', 2)),
+    (date(2025, 1, 26), (2024, 'post', 3)),
+    (date(2025, 2, 9), (2024, 'post', 4)),     # Super Bowl, after a week off
+    # 2019: kickoff Thu Sep 5, 17 weeks, four preseason weeks.
+    (date(2019, 8, 1), (2019, 'pre', 0)),
+    (date(2019, 8, 8), (2019, 'pre', 1)),
+    (date(2019, 8, 29), (2019, 'pre', 4)),
+    (date(2019, 12, 29), (2019, 'reg', 17)),
+    (date(2020, 1, 4), (2019, 'post', 1)),
+    # 2012 opened on a Wednesday.
+    (date(2012, 9, 5), (2012, 'reg', 1)),
+])
+def test_season_week(day, expected):
+    assert season_week(day) == expected
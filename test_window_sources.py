@@ -0,0 +1,124 @@
+"""Tests for window_sources: run with python -m pytest.
+
+The X11 backend is exercised against a live display only when one is
+available ($DISPLAY, e.g. under Xvfb); the replay tests use a desktop in
+the shape X11Source records it."""
+
+from __future__ import annotations
+
+import ctypes.util
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import auto_position
+from window_sources import (ReplaySource, X11Source, _LinuxProcessPins,
+                            record_snapshot)
+
+GAME_TITLE = ('Los Angeles Chargers at Denver Broncos 2024 REG 6 - Game Center'
+              ' — Mozilla Firefox')
+
+# A recorded X11 desktop: client-window rects, no window classes, Linux
+# executable names, and a second monitor left of and above the primary.
+X11_SNAPSHOT = {
+    'backend': 'x11',
+    'windows': [
+        {'handle': 0x1a00003, 'title': 'Inbox - Gmail — Mozilla Firefox',
+         'exe': 'firefox', 'rect': [0, 30, 1920, 1080]},
+        {'handle': 0x2e00007, 'title': GAME_TITLE, 'exe': 'firefox-esr',
+         'rect': [-1920, -200, 0, 880]},
+        {'handle': 0x3400001, 'title': GAME_TITLE, 'exe': 'gedit',
+         'rect': [100, 100, 900, 700]},
+    ],
+    'monitors': [[0, 0, 1920, 1080], [-1920, -200, 1920, 1080]],
+}
+
+
+@pytest.fixture
+def replay():
+    source = ReplaySource(json.loads(json.dumps(X11_SNAPSHOT)))
+    yield source
+    auto_position.set_window_source(None)
+
+
+def test_x11_snapshot_filters_to_browser_windows(replay):
+    handles = [handle for handle, _title, _exe in replay.browser_windows()]
+    assert handles == [0x1a00003, 0x2e00007]
+
+
+def test_x11_snapshot_round_trips_through_record(replay):
+    recorded = json.loads(json.dumps(record_snapshot(replay)))
+    again = ReplaySource(recorded)
+    assert again.browser_windows() == replay.browser_windows()
+    assert again.monitors() == replay.monitors()
+    for handle, _title, _exe in replay.browser_windows():
+        assert again.window_rect(handle) == replay.window_rect(handle)
+
+
+def test_x11_snapshot_monitor_lookup(replay):
+    assert replay.monitor_for_point(-10, 0) == (-1920, -200, 1920, 1080)
+    assert replay.monitor_for_point(10, 0) == (0, 0, 1920, 1080)
+
+
+def test_x11_snapshot_places_overlay_on_game_monitor(replay):
+    auto_position.set_window_source(replay)
+    decision = auto_position.decide_position()
+    assert decision.window == 0x2e00007
+    assert decision.monitor == (-1920, -200, 1920, 1080)
+    assert decision.kind in ('ticker', 'ticker_guess', 'no_ticker')
+
+
+@pytest.mark.skipif(not os.environ.get('DISPLAY')
+                    or not ctypes.util.find_library('xcb'),
+                    reason='needs an X display and libxcb')
+def test_live_x11_source_records_a_replayable_snapshot():
+    source = X11Source()
+    try:
+        snapshot = json.loads(json.dumps(record_snapshot(source)))
+        assert snapshot['backend'] == 'x11'
+        assert snapshot['monitors']
+        replay = ReplaySource(snapshot)
+        assert ([h for h, _t, _e in replay.browser_windows()]
+                == [w['handle'] for w in snapshot['windows']])
+    finally:
+        source.close()
+
+
+@pytest.mark.parametrize('backend, chrome', [('x11', 0), ('win32', 85)])
+def test_chrome_height_is_only_estimated_from_win32_rects(backend, chrome):
+    # X11 client rects are in physical pixels, so the unscaled Windows
+    # chrome heights would be wrong on a HiDPI desktop.
+    snapshot = dict(X11_SNAPSHOT, backend=backend)
+    source = ReplaySource(snapshot)
+    monitor = (-1920, -200, 1920, 1080)
+    container = auto_position._measure_container(
+        source, 0x1a00003, 'firefox', monitor)
+    assert container == (0, 30 + chrome, 1920, 1050 - chrome)
+
+
+@pytest.mark.skipif(not hasattr(os, 'pidfd_open'), reason='needs pidfd_open')
+def test_process_pins_above_fd_setsize():
+    # select() can't watch fds past FD_SETSIZE (1024); pins must still work.
+    pins = _LinuxProcessPins()
+    filler = []
+    try:
+        while len(filler) < 1100:
+            filler.append(os.open(os.devnull, os.O_RDONLY))
+    except OSError:
+        pytest.skip('fd limit too low')
+    try:
+        child = subprocess.Popen([sys.executable, '-c', 'pass'])
+        pin = pins.pin(child.pid)
+        assert pin > 1024
+        child.wait()
+        assert not pins.alive(pin)
+        pins.release(pin)
+        pin = pins.pin(os.getpid())
+        assert pins.alive(pin)
+        pins.release(pin)
+    finally:
+        for fd in filler:
+            os.close(fd)
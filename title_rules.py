@@ -0,0 +1,250 @@
+"""
+Browser-tab title rules for the sites NFL games are watched on.
+
+Game pages on these sites have tab titles like these:
+
+    nfl.com        Los Angeles Chargers at Denver Broncos 2024 REG 6 - Game Center
+    ESPN           Ravens vs. Chiefs (Sep 5, 2024) Live Score - ESPN
+    YouTube TV     Baltimore Ravens at Kansas City Chiefs - YouTube TV
+    NFL+           Baltimore Ravens at Kansas City Chiefs | NFL+
+    Sunday Ticket  Baltimore Ravens vs. Kansas City Chiefs - NFL Sunday Ticket
+    Fubo           Baltimore Ravens at Kansas City Chiefs | Fubo
+
+Each title is the page's parts joined by " - ", " | " or " — ", with the
+browser's name added as one more part.
+
+Each TitleRule names one site by its `tags`: the title parts that only that
+site's pages have, such as "Game Center" or "YouTube TV". TitleRules keeps
+every rule's tags in a single dict. A title is split into its parts once,
+and each part costs one dict lookup, so adding a site doesn't slow down
+matching. Only the matching rule's `marker` regex then runs. It matches the
+end of the part before the tag, such as " 2024 REG 6" or
+" (Sep 5, 2024) Live Score". The team names are the text before the marker,
+split at the last " at ", " @ ", " vs " or " vs. ".
+
+A rule whose marker is distinctive enough on its own can also be marked
+`untagged`. Its marker is then searched for anywhere in titles where no tag
+matched. nfl.com's " 2024 REG 6" is one of these, so its pages still parse
+without "Game Center" in the title (e.g. "... 2024 REG 11 | NFL.com").
+
+The marker says how the game's week is known. A 'week' rule captures the
+(year, season type, week). A 'date' rule captures a (month, day, year) date.
+A 'live' rule captures nothing, which means the game is on today.
+season_week() maps a date to the NFL week it falls in. GameTitle.lookups()
+gives the (year, season type, week, away, home) keys to try, best first.
+
+The services behind 'live' rules also carry other sports and replays of old
+games, and their titles say nothing about the season. So 'live' titles need
+full team names ("Arizona Cardinals", not "Cardinals", which is also a
+baseball team). They are looked up in the current week only: a game that
+isn't on this week is an old one, not a game to place the overlay for.
+
+    rules = TitleRules(DEFAULT_RULES)
+    rules.parse('Ravens vs. Chiefs (Sep 5, 2024) Live Score - ESPN')
+      -> GameTitle(site='espn', away_id=3, home_id=16, either_order=True,
+                   day=datetime.date(2024, 9, 5), ...)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from nfl_teams import full_name_id, team_id, team_id_suffix
+
+RULE_KINDS = ('week', 'date', 'live')
+
+# What sites and browsers join the parts of a title with.
+_PART_SEPARATOR_RE = re.compile(' [-|\u2014] ')
+
+# " vs " titles don't say which team is at home; " at " and " @ " ones do.
+_SEPARATORS = ((' at ', False), (' @ ', False), (' vs ', True), (' vs. ', True))
+
+_MONTHS = {name: i for i, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun',
+     'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), 1)}
+
+# Seasons from this year on have 18 regular-season weeks and 3 preseason
+# weeks (before, 17 and 4).
+EIGHTEEN_WEEK_SEASON = 2021
+
+
+@dataclass(frozen=True)
+class TitleRule:
+    site: str
+    # Title parts (matched case-insensitively) that mark this site's game
+    # pages; the teams are in the part before.
+    tags: tuple[str, ...]
+    # Regex for the end of that part, after the team names, with groups as
+    # `kind` says: 'week' (year, season type, week), 'date' (month name,
+    # day, year), 'live' none (and usually an empty marker).
+    marker: str
+    kind: str
+    # Also search for the marker anywhere in a title none of the tags
+    # matched (checked last, in rule order).
+    untagged: bool = False
+
+
+DEFAULT_RULES = (
+    TitleRule('nfl.com', ('Game Center',), r' (\d{4}) (REG|POST|PRE) (\d+)', 'week',
+              untagged=True),
+    TitleRule('espn', ('ESPN',),
+              r' \(([a-z]{3})[a-z]*\.? (\d{1,2}), (\d{4})\)[^()]*', 'date'),
+    TitleRule('youtube-tv', ('YouTube TV',), '', 'live'),
+    TitleRule('nfl+', ('NFL+',), '', 'live'),
+    TitleRule('sunday-ticket', ('NFL Sunday Ticket',), '', 'live'),
+    TitleRule('fubo', ('Fubo', 'fuboTV'), '', 'live'),
+)
+
+
+@dataclass(frozen=True)
+class GameTitle:
+    """A parsed game-page title. Exactly one of `week` (with `year` and
+    `season_type`) and `day` is known for 'week' and 'date' rules, neither
+    for 'live' ones."""
+
+    site: str
+    away_id: int
+    home_id: int
+    either_order: bool = False
+    year: int | None = None
+    season_type: str | None = None
+    week: int | None = None
+    day: date | None = None
+
+    def lookups(self, today: date):
+        """(year, season_type, week, away_id, home_id) keys to look the game
+        up by, best first. A date only pins down the week up to the
+        calendar's edge cases, so the weeks either side are tried too. A
+        'live' title (neither week nor date) is only looked up in `today`'s
+        week."""
+        if self.week is not None:
+            weeks = [(self.year, self.season_type, self.week)]
+        elif self.day is None:
+            weeks = [season_week(today)]
+        else:
+            year, season_type, week = season_week(self.day)
+            weeks = [(year, season_type, week), (year, season_type, week - 1),
+                     (year, season_type, week + 1)]
+        orders = [(self.away_id, self.home_id)]
+        if self.either_order:
+            orders.append((self.home_id, self.away_id))
+        return [(year, season_type, week, away_id, home_id)
+                for year, season_type, week in weeks
+                for away_id, home_id in orders]
+
+
+def split_teams(text: str, full_names: bool = False):
+    """(away_id, home_id, either_order) from "<away> at <home>" (or @ / vs /
+    vs.) at the end of `text`, or None. The away side may have leading noise,
+    such as an unread-count prefix or "Watch". With `full_names`, both
+    teams must be named in full (see nfl_teams.full_name_id())."""
+    folded = text.lower()
+    at, sep, either_order = max(
+        (folded.rfind(sep), sep, either) for sep, either in _SEPARATORS)
+    if at < 0:
+        return None
+    if full_names:
+        away_id = full_name_id(text[:at], noise=True)
+        home_id = full_name_id(text[at + len(sep):])
+    else:
+        away_id = team_id_suffix(text[:at])
+        home_id = team_id(text[at + len(sep):])
+    if away_id is None or home_id is None:
+        return None
+    return away_id, home_id, either_order
+
+
+def season_week(day: date) -> tuple[int, str, int]:
+    """(season year, season type, week) of the NFL week `day` falls in.
+
+    Weeks run Wednesday to Tuesday from the season opener, the Thursday
+    after Labor Day. January and February games belong to the previous
+    year's season. The postseason is weeks 1-4: wild card, divisional,
+    conference and the Super Bowl, which follows a week off. Preseason
+    weeks count back from the opener, with week 0 the Hall of Fame game;
+    from 2021 on a week off separates the last of them (week 3) from the
+    opener."""
+    year = day.year if day.month >= 3 else day.year - 1
+    labor_day = date(year, 9, 1)
+    labor_day += timedelta(days=-labor_day.weekday() % 7)
+    week_one = labor_day + timedelta(days=2)  # the Wednesday before kickoff
+    week = (day - week_one).days // 7 + 1
+    regular_weeks = 18 if year >= EIGHTEEN_WEEK_SEASON else 17
+    if week < 1:
+        if year >= EIGHTEEN_WEEK_SEASON:
+            # Week 0 is the week off; it counts as the last preseason week.
+            return year, 'pre', max(0, min(week + 4, 3))
+        return year, 'pre', max(0, week + 4)
+    if week <= regular_weeks:
+        return year, 'reg', week
+    return year, 'post', min(week - regular_weeks, 4)
+
+
+class TitleRules:
+    """A set of TitleRules, looked up by tag."""
+
+    def __init__(self, rules=DEFAULT_RULES):
+        self.rules = tuple(rules)
+        # tag (case-folded) -> (rule, compiled marker anchored at the end)
+        self._by_tag = {}
+        # (rule, compiled marker) searched for in titles without a tag
+        self._untagged = []
+        for rule in self.rules:
+            if rule.kind not in RULE_KINDS:
+                raise ValueError(f'{rule.site}: unknown rule kind {rule.kind!r}')
+            marker = re.compile(f'(?:{rule.marker})$', re.IGNORECASE)
+            for tag in rule.tags:
+                if tag.casefold() in self._by_tag:
+                    raise ValueError(f'{rule.site}: tag {tag!r} is already '
+                                     f'{self._by_tag[tag.casefold()][0].site}\'s')
+                self._by_tag[tag.casefold()] = (rule, marker)
+            if rule.untagged:
+                self._untagged.append(
+                    (rule, re.compile(rule.marker, re.IGNORECASE)))
+
+    def parse(self, title: str) -> GameTitle | None:
+        """The GameTitle for a browser window title, or None if no rule
+        matches or a team name isn't in the nfl_teams registry."""
+        parts = _PART_SEPARATOR_RE.split(title)
+        for i in range(1, len(parts)):
+            found = self._by_tag.get(parts[i].casefold())
+            if found is not None:
+                rule, marker = found
+                head = parts[i - 1]
+                m = marker.search(head)
+                break
+        else:
+            for rule, marker in self._untagged:
+                head = title
+                m = marker.search(head)
+                if m:
+                    break
+            else:
+                return None
+        if not m:
+            return None
+        return self._game_title(rule, m, head[:m.start()])
+
+    @staticmethod
+    def _game_title(rule: TitleRule, m, teams_text: str) -> GameTitle | None:
+        """The GameTitle for `rule`'s marker match `m`, with the teams in
+        `teams_text`, or None."""
+        teams = split_teams(teams_text, full_names=rule.kind == 'live')
+        if teams is None:
+            return None
+        away_id, home_id, either_order = teams
+        if rule.kind == 'week':
+            year, season_type, week = m.groups()
+            return GameTitle(rule.site, away_id, home_id, either_order,
+                             int(year), season_type.lower(), int(week))
+        if rule.kind == 'date':
+            month, day, year = m.groups()
+            try:
+                when = date(int(year), _MONTHS[month.lower()], int(day))
+            except (KeyError, ValueError):
+                return None
+            return GameTitle(rule.site, away_id, home_id, either_order,
+                             day=when)
+        return GameTitle(rule.site, away_id, home_id, either_order)
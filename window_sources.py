@@ -0,0 +1,1539 @@
+"""
+Window-system backends for auto_position.
+
+A WindowSource answers the three questions auto_position asks of the
+desktop:
+
+    browser_windows()        -> [(handle, title, exe_basename), ...]
+                                visible, titled top-level browser windows
+    window_rect(handle)      -> (left, top, right, bottom) or None
+    monitor_for_point(x, y)  -> (left, top, width, height) of the monitor
+                                containing (or nearest to) the point, or None
+    window_title(handle)     -> the window's current title, or None
+    windows_titled(title)    -> handles of the top-level windows with that
+                                exact title (e.g. other ScoreBlocker overlays)
+    move_window(handle, rect) moves and resizes a window to (x, y, w, h)
+    client_rect(handle)      -> the window's client area, inside any frame
+    content_rect(handle)     -> the page area below the browser's tabs and
+                                toolbars, where the backend can measure it
+
+Monitor lookups are answered from a MonitorLayout enumerated once and kept
+until the backend's topology signature changes (display metrics on Win32,
+root/RandR events on X11) or invalidate_monitors() is called.
+
+Backends:
+
+    Win32Source   EnumWindows + QueryFullProcessImageNameW (Windows)
+    X11Source     EWMH properties over libxcb (X11 sessions, including
+                  XWayland), e.g. under Xvfb for testing
+    ReplaySource  a desktop recorded to (or synthesized as) a JSON snapshot,
+                  for reproducing bug reports and benchmarking off Windows
+
+A WindowFollower watches one window's rect, monitor and title through the
+source's window_feed() and reports changes, for overlays that stay locked
+to the game window.
+
+default_source() returns the backend for the running session, or None.
+record_snapshot() captures a live desktop for ReplaySource:
+
+    python window_sources.py record desktop.json
+
+Both backends call the native libraries through ctypes so there are no
+third-party dependencies. X11Source pipelines its requests: listing the
+windows is one round trip for _NET_CLIENT_LIST and one for every window's
+_NET_WM_NAME / WM_NAME / _NET_WM_PID together, however many windows there
+are.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import json
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from bisect import bisect_right
+
+
+class WindowSource:
+    """Interface for window-system backends (see the module docstring)."""
+
+    name = 'none'
+
+    # Whether the desktop behind this source changes (and so is worth
+    # watching with a WindowWatcher).
+    live = False
+
+    # Lower-cased executable basenames that count as browsers.
+    browser_exes: tuple[str, ...] = ()
+
+    # Window classes a browser window can have (Win32 class names, or
+    # lower-cased X11 WM_CLASS instance / class names).
+    browser_classes: tuple[str, ...] = ()
+
+    # Whether client rects are in unscaled (96 DPI) pixels, the units
+    # auto_position's browser chrome heights are measured in. Only then is
+    # the page area estimated from the client rect when content_rect()
+    # can't measure it.
+    unscaled_rects = False
+
+    def __init__(self):
+        # Windows surviving each filter stage, in the last pass and in total.
+        self.last_pass: dict[str, int] = {}
+        self.stage_totals: dict[str, int] = {}
+        self._layout: MonitorLayout | None = None
+
+    def browser_windows(self, title_stages=()) -> list[tuple[int, str, str]]:
+        """Return (handle, title, exe) for visible, titled top-level browser
+        windows.
+
+        Windows go through a pipeline of filters, cheapest first: the window
+        class (browser_classes), then each (name, predicate) of
+        `title_stages` in turn, and only then the owning process's executable
+        (browser_exes). The windows surviving each stage are counted in
+        last_pass and stage_totals under 'windows', 'class', each title
+        stage's name, and 'process'.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _new_pass(title_stages) -> dict[str, int]:
+        return dict.fromkeys(
+            ('windows', 'class', *(name for name, _ in title_stages), 'process'), 0)
+
+    @staticmethod
+    def _title_passes(title: str, title_stages, counts: dict[str, int]) -> bool:
+        for name, stage in title_stages:
+            if not stage(title):
+                return False
+            counts[name] += 1
+        return True
+
+    def _end_pass(self, counts: dict[str, int]) -> None:
+        self.last_pass = counts
+        for stage, n in counts.items():
+            self.stage_totals[stage] = self.stage_totals.get(stage, 0) + n
+
+    def window_rect(self, handle: int) -> tuple[int, int, int, int] | None:
+        raise NotImplementedError
+
+    def window_title(self, handle: int) -> str | None:
+        """The window's current title, or None if the window has gone."""
+        raise NotImplementedError
+
+    def client_rect(self, handle: int) -> tuple[int, int, int, int] | None:
+        """(left, top, right, bottom) of the window's client area in screen
+        coordinates: the window less any window-manager frame."""
+        return self.window_rect(handle)
+
+    def windows_titled(self, title: str) -> list[int]:
+        """Handles of the visible top-level windows titled exactly `title`,
+        whatever process they belong to."""
+        raise NotImplementedError
+
+    def move_window(self, handle: int, rect: tuple[int, int, int, int]) -> bool:
+        """Move and resize a window to (x, y, w, h) screen pixels, without
+        activating it or changing its stacking. Returns whether it worked."""
+        raise NotImplementedError
+
+    def content_rect(self, handle: int) -> tuple[int, int, int, int] | None:
+        """(left, top, right, bottom) of the browser's page area, below its
+        tab strip and toolbars, or None if the backend can't measure it."""
+        return None
+
+    def monitor_for_point(self, x: int, y: int) -> tuple[int, int, int, int] | None:
+        return self.monitor_layout().at(x, y)
+
+    def monitors(self) -> list[tuple[int, int, int, int]]:
+        """Every monitor's (left, top, width, height), sorted by position."""
+        return list(self.monitor_layout().monitors)
+
+    def monitor_layout(self) -> MonitorLayout:
+        """The cached monitor layout, re-enumerated when the backend's
+        topology signature changes (or after invalidate_monitors())."""
+        signature = self._topology_signature()
+        layout = self._layout
+        if layout is None or layout.signature != signature:
+            layout = self._layout = MonitorLayout(self._enumerate_monitors(),
+                                                  signature)
+        return layout
+
+    def invalidate_monitors(self) -> None:
+        """Forget the monitor layout, e.g. on a display-change notification."""
+        self._layout = None
+
+    def _enumerate_monitors(self) -> list[tuple[int, int, int, int]]:
+        raise NotImplementedError
+
+    def _topology_signature(self):
+        """A cheap value that changes whenever the monitor layout does."""
+        return None
+
+    def close(self) -> None:
+        pass
+
+    def change_feed(self):
+        """Return an object with wait(timeout) -> bool (block until the
+        window list or a title may have changed, or timeout seconds; None
+        waits indefinitely), wake() (thread-safe; makes a blocked wait()
+        return) and close(), or None if this source has no change
+        notifications. Called on, and only used from, the watcher thread."""
+        return None
+
+    def window_feed(self, handle: int):
+        """Like change_feed(), but for one window: wait() returns True after
+        the window may have moved, resized, been retitled or gone away.
+        None if this source can't watch a single window."""
+        return None
+
+
+class MonitorLayout:
+    """Monitors as (left, top, width, height), sorted by left then top,
+    with point lookup done in Python.
+
+    at() returns the monitor containing a point or, like Win32's
+    MONITOR_DEFAULTTONEAREST, the nearest one when the point is off every
+    monitor. Layouts are immutable; sources swap in a new one on change.
+    """
+
+    __slots__ = ('monitors', 'signature', '_lefts')
+
+    def __init__(self, monitors, signature=None):
+        self.monitors = tuple(sorted(tuple(m) for m in monitors))
+        self.signature = signature
+        self._lefts = [m[0] for m in self.monitors]
+
+    def at(self, x: int, y: int) -> tuple[int, int, int, int] | None:
+        # Only monitors starting at or left of x can contain it.
+        for i in range(bisect_right(self._lefts, x) - 1, -1, -1):
+            m = self.monitors[i]
+            if x < m[0] + m[2] and m[1] <= y < m[1] + m[3]:
+                return m
+        best = None
+        best_d = None
+        for m in self.monitors:
+            left, top, width, height = m
+            dx = max(left - x, 0, x - (left + width - 1))
+            dy = max(top - y, 0, y - (top + height - 1))
+            d = dx * dx + dy * dy
+            if best_d is None or d < best_d:
+                best, best_d = m, d
+        return best
+
+
+# ----- Process identity cache -----------------------------------------------
+
+class ProcessExeCache:
+    """pid -> lower-cased executable basename, without re-querying processes
+    it has already resolved.
+
+    Each entry holds a pin on the process it was resolved for (see
+    _Win32ProcessPins and _LinuxProcessPins). Checking that the pin's process
+    is still running is enough to know the pid hasn't been reused, so a
+    known pid costs no process query; a dead pin drops the entry and the pid
+    is resolved afresh. Entries for pids that weren't looked up during a pass
+    are released by end_pass(). Passes may run on several threads at once
+    (the watcher's, and a lookup on a worker thread), so the entries are
+    locked.
+    """
+
+    def __init__(self, pins):
+        self._pins = pins
+        self._lock = threading.Lock()
+        self._entries: dict[int, tuple[object, str]] = {}
+        self._seen: set[int] = set()
+        # Lookups answered from the cache / that had to query the process.
+        self.hits = 0
+        self.queries = 0
+
+    def exe(self, pid: int) -> str:
+        """Return the executable basename for `pid`, or '' if it can't be
+        determined (the process is gone, or belongs to someone else)."""
+        with self._lock:
+            return self._exe(pid)
+
+    def _exe(self, pid: int) -> str:
+        self._seen.add(pid)
+        entry = self._entries.get(pid)
+        if entry is not None:
+            pin, exe = entry
+            if self._pins.alive(pin):
+                self.hits += 1
+                return exe
+            del self._entries[pid]
+            self._pins.release(pin)
+        self.queries += 1
+        pin = self._pins.pin(pid)
+        if pin is None:
+            return ''
+        exe = self._pins.exe(pid, pin)
+        if exe:
+            self._entries[pid] = (pin, exe)
+        else:
+            self._pins.release(pin)
+        return exe
+
+    def end_pass(self) -> None:
+        """Release entries for pids not looked up since the last call."""
+        with self._lock:
+            for pid in self._entries.keys() - self._seen:
+                self._pins.release(self._entries.pop(pid)[0])
+            self._seen.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            for pin, _exe in self._entries.values():
+                self._pins.release(pin)
+            self._entries.clear()
+        self._seen.clear()
+
+
+class _Win32ProcessPins:
+    """Pins are open process handles. Windows doesn't reuse a pid while any
+    handle to its process is open, and WaitForSingleObject(handle, 0) tells
+    whether the process has exited."""
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    SYNCHRONIZE = 0x00100000
+    WAIT_TIMEOUT = 0x102
+
+    def __init__(self):
+        self._kernel32 = ctypes.windll.kernel32
+
+    def pin(self, pid: int):
+        h = self._kernel32.OpenProcess(
+            self.PROCESS_QUERY_LIMITED_INFORMATION | self.SYNCHRONIZE, False, pid)
+        return h or None
+
+    def alive(self, h) -> bool:
+        return self._kernel32.WaitForSingleObject(h, 0) == self.WAIT_TIMEOUT
+
+    def exe(self, _pid: int, h) -> str:
+        from ctypes import wintypes
+
+        buf = ctypes.create_unicode_buffer(1024)
+        size = wintypes.DWORD(len(buf))
+        if self._kernel32.QueryFullProcessImageNameW(h, 0, buf, ctypes.byref(size)):
+            # Basename only
+            return buf.value.rsplit('\\', 1)[-1].lower()
+        return ''
+
+    def release(self, h) -> None:
+        self._kernel32.CloseHandle(h)
+
+
+class _LinuxProcessPins:
+    """Pins are pidfds, which become readable once their process exits. On
+    kernels or Pythons without pidfd_open, a pin is the process start time
+    from /proc/<pid>/stat, which a reused pid can't match."""
+
+    def pin(self, pid: int):
+        if hasattr(os, 'pidfd_open'):
+            try:
+                return os.pidfd_open(pid)
+            except ProcessLookupError:
+                return None
+            except OSError:
+                pass
+        start = _process_start_time(pid)
+        return (pid, start) if start is not None else None
+
+    def alive(self, pin) -> bool:
+        if isinstance(pin, int):
+            poller = select.poll()  # select() fails on fds >= FD_SETSIZE
+            poller.register(pin, select.POLLIN)
+            return not poller.poll(0)
+        pid, start = pin
+        return _process_start_time(pid) == start
+
+    def exe(self, pid: int, _pin) -> str:
+        try:
+            return os.path.basename(os.readlink(f'/proc/{pid}/exe')).lower()
+        except OSError:
+            return ''
+
+    def release(self, pin) -> None:
+        if isinstance(pin, int):
+            os.close(pin)
+
+
+def _process_start_time(pid: int) -> int | None:
+    """Start time (clock ticks since boot) of a local process, or None."""
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # Fields after "(comm)", which may itself contain spaces or parens;
+    # starttime is field 22 overall, the 20th after comm.
+    return int(stat.rpartition(b')')[2].split()[19])
+
+
+# ----- Win32 ------------------------------------------------------------------
+
+class Win32Source(WindowSource):
+    """Top-level windows via EnumWindows, owning executable via psapi."""
+
+    name = 'win32'
+    # ScoreBlocker isn't DPI-aware, so Windows scales every rect to 96 DPI.
+    unscaled_rects = True
+    live = True
+    browser_exes = ('chrome.exe', 'firefox.exe', 'msedge.exe')
+    # Chrome and Edge top-level windows / Firefox top-level windows.
+    browser_classes = ('Chrome_WidgetWin_1', 'MozillaWindowClass')
+
+    def __init__(self):
+        from ctypes import wintypes
+
+        super().__init__()
+        self._user32 = ctypes.windll.user32
+        self.processes = ProcessExeCache(_Win32ProcessPins())
+        self._EnumWindowsProc = ctypes.WINFUNCTYPE(
+            wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+
+        self._MonitorEnumProc = ctypes.WINFUNCTYPE(
+            wintypes.BOOL, wintypes.HMONITOR, wintypes.HDC,
+            ctypes.POINTER(wintypes.RECT), wintypes.LPARAM)
+
+    def browser_windows(self, title_stages=()) -> list[tuple[int, str, str]]:
+        from ctypes import wintypes
+
+        user32 = self._user32
+        found: list[tuple[int, str, str]] = []
+        counts = self._new_pass(title_stages)
+        class_buf = ctypes.create_unicode_buffer(256)
+
+        def _callback(hwnd, _lparam):
+            if not user32.IsWindowVisible(hwnd):
+                return True
+            counts['windows'] += 1
+            user32.GetClassNameW(hwnd, class_buf, len(class_buf))
+            if class_buf.value not in self.browser_classes:
+                return True
+            counts['class'] += 1
+            length = user32.GetWindowTextLengthW(hwnd)
+            if length == 0:
+                return True
+            buf = ctypes.create_unicode_buffer(length + 1)
+            user32.GetWindowTextW(hwnd, buf, length + 1)
+            title = buf.value
+            if not self._title_passes(title, title_stages, counts):
+                return True
+            pid = wintypes.DWORD()
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            exe = self.processes.exe(pid.value)
+            if exe in self.browser_exes:
+                counts['process'] += 1
+                found.append((hwnd, title, exe))
+            return True
+
+        user32.EnumWindows(self._EnumWindowsProc(_callback), 0)
+        self.processes.end_pass()
+        self._end_pass(counts)
+        return found
+
+    def close(self) -> None:
+        self.processes.clear()
+
+    def change_feed(self):
+        return _Win32ChangeFeed()
+
+    def window_feed(self, handle: int):
+        return _Win32ChangeFeed(handle)
+
+    def window_rect(self, handle: int) -> tuple[int, int, int, int] | None:
+        from ctypes import wintypes
+
+        rect = wintypes.RECT()
+        if not self._user32.GetWindowRect(handle, ctypes.byref(rect)):
+            return None
+        return (rect.left, rect.top, rect.right, rect.bottom)
+
+    def client_rect(self, handle: int) -> tuple[int, int, int, int] | None:
+        from ctypes import wintypes
+
+        rect = wintypes.RECT()
+        origin = wintypes.POINT()
+        if not (self._user32.GetClientRect(handle, ctypes.byref(rect))
+                and self._user32.ClientToScreen(handle, ctypes.byref(origin))):
+            return None
+        return (origin.x, origin.y, origin.x + rect.right, origin.y + rect.bottom)
+
+    # Chrome and Edge draw the page into a child window of this class (one
+    # per visible page, including docked devtools); Firefox has none.
+    _CONTENT_CLASS = 'Chrome_RenderWidgetHostHWND'
+
+    def content_rect(self, handle: int) -> tuple[int, int, int, int] | None:
+        user32 = self._user32
+        class_buf = ctypes.create_unicode_buffer(64)
+        best = None
+        best_area = 0
+
+        def _callback(child, _lparam):
+            nonlocal best, best_area
+            user32.GetClassNameW(child, class_buf, len(class_buf))
+            if class_buf.value == self._CONTENT_CLASS and user32.IsWindowVisible(child):
+                rect = self.window_rect(child)
+                if rect is not None:
+                    area = (rect[2] - rect[0]) * (rect[3] - rect[1])
+                    if area > best_area:
+                        best, best_area = rect, area
+            return True
+
+        user32.EnumChildWindows(handle, self._EnumWindowsProc(_callback), 0)
+        return best
+
+    def window_title(self, handle: int) -> str | None:
+        user32 = self._user32
+        if not user32.IsWindow(handle):
+            return None
+        length = user32.GetWindowTextLengthW(handle)
+        buf = ctypes.create_unicode_buffer(length + 1)
+        user32.GetWindowTextW(handle, buf, length + 1)
+        return buf.value
+
+    def windows_titled(self, title: str) -> list[int]:
+        user32 = self._user32
+        found = []
+        buf = ctypes.create_unicode_buffer(len(title) + 2)
+
+        def _callback(hwnd, _lparam):
+            if (user32.IsWindowVisible(hwnd)
+                    and user32.GetWindowTextLengthW(hwnd) == len(title)):
+                user32.GetWindowTextW(hwnd, buf, len(buf))
+                if buf.value == title:
+                    found.append(hwnd)
+            return True
+
+        user32.EnumWindows(self._EnumWindowsProc(_callback), 0)
+        return found
+
+    SWP_NOZORDER = 0x0004
+    SWP_NOACTIVATE = 0x0010
+
+    def move_window(self, handle: int, rect: tuple[int, int, int, int]) -> bool:
+        x, y, w, h = rect
+        return bool(self._user32.SetWindowPos(
+            handle, None, x, y, w, h, self.SWP_NOZORDER | self.SWP_NOACTIVATE))
+
+    # GetSystemMetrics indices: monitor count, virtual screen, primary size.
+    _SIGNATURE_METRICS = (80, 76, 77, 78, 79, 0, 1)
+
+    def _topology_signature(self):
+        # Reads from user32's shared memory, no round trip to the window
+        # manager. Any change in monitor count, arrangement or primary
+        # resolution changes at least one of these.
+        metric = self._user32.GetSystemMetrics
+        return tuple(metric(i) for i in self._SIGNATURE_METRICS)
+
+    def _enumerate_monitors(self) -> list[tuple[int, int, int, int]]:
+        monitors = []
+
+        def _callback(_hmon, _hdc, rect, _lparam):
+            r = rect.contents
+            monitors.append((r.left, r.top, r.right - r.left, r.bottom - r.top))
+            return True
+
+        self._user32.EnumDisplayMonitors(None, None,
+                                         self._MonitorEnumProc(_callback), 0)
+        return monitors
+
+
+class _Win32ChangeFeed:
+    """WinEvent hooks for top-level windows being created, destroyed, shown,
+    hidden or renamed (a browser retitles its window when the tab changes).
+
+    Given a window, the hooks instead cover only that window's process and
+    also report it moving or resizing (EVENT_OBJECT_LOCATIONCHANGE, which
+    desktop-wide would fire for every caret and cursor movement), and only
+    that window's events count.
+
+    The hooks are out-of-context, so their callbacks run on this thread
+    while wait() pumps its message queue; the thread sleeps in
+    MsgWaitForMultipleObjects in between.
+    """
+
+    EVENT_OBJECT_CREATE = 0x8000
+    EVENT_OBJECT_DESTROY = 0x8001
+    EVENT_OBJECT_HIDE = 0x8003
+    EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    OBJID_WINDOW = 0
+    CHILDID_SELF = 0
+    GA_ROOT = 2
+    QS_ALLINPUT = 0x04FF
+    PM_REMOVE = 0x0001
+    PM_NOREMOVE = 0x0000
+    WM_APP = 0x8000
+    INFINITE = 0xFFFFFFFF
+
+    def __init__(self, hwnd: int | None = None):
+        from ctypes import wintypes
+
+        self._user32 = ctypes.windll.user32
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        self._hwnd = hwnd
+        self._changed = False
+        self._msg = wintypes.MSG()
+        # Make sure this thread has a message queue before wake() posts to it.
+        self._user32.PeekMessageW(ctypes.byref(self._msg), None, 0, 0,
+                                  self.PM_NOREMOVE)
+
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+        # Keep a reference: the hook calls back into it until close().
+        self._proc = WinEventProc(self._on_event)
+        flags = self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS
+        if hwnd is None:
+            pid = 0
+            ranges = ((self.EVENT_OBJECT_CREATE, self.EVENT_OBJECT_HIDE),
+                      (self.EVENT_OBJECT_NAMECHANGE, self.EVENT_OBJECT_NAMECHANGE))
+        else:
+            process = wintypes.DWORD()
+            self._user32.GetWindowThreadProcessId(hwnd, ctypes.byref(process))
+            pid = process.value
+            if not pid:
+                raise OSError('window has gone')
+            ranges = ((self.EVENT_OBJECT_DESTROY, self.EVENT_OBJECT_HIDE),
+                      (self.EVENT_OBJECT_LOCATIONCHANGE, self.EVENT_OBJECT_NAMECHANGE))
+        self._hooks = [
+            self._user32.SetWinEventHook(first, last, None, self._proc, pid, 0, flags)
+            for first, last in ranges]
+        if not all(self._hooks):
+            self.close()
+            raise OSError('SetWinEventHook failed')
+
+    def _on_event(self, _hook, _event, hwnd, id_object, id_child, _thread, _time):
+        if not (hwnd and id_object == self.OBJID_WINDOW
+                and id_child == self.CHILDID_SELF):
+            return
+        if self._hwnd is not None:
+            if hwnd == self._hwnd:
+                self._changed = True
+        elif self._user32.GetAncestor(hwnd, self.GA_ROOT) == hwnd:
+            self._changed = True
+
+    def wait(self, timeout: float | None) -> bool:
+        user32 = self._user32
+        deadline = None if timeout is None else time.monotonic() + timeout
+        woken = False
+        while not (self._changed or woken):
+            if deadline is None:
+                ms = self.INFINITE
+            else:
+                ms = max(0, int((deadline - time.monotonic()) * 1000))
+            user32.MsgWaitForMultipleObjects(0, None, False, ms, self.QS_ALLINPUT)
+            # Peeking delivers the pending hook callbacks.
+            while user32.PeekMessageW(ctypes.byref(self._msg), None, 0, 0,
+                                      self.PM_REMOVE):
+                if self._msg.message == self.WM_APP:
+                    woken = True
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+        changed, self._changed = self._changed, False
+        return changed
+
+    def wake(self) -> None:
+        self._user32.PostThreadMessageW(self._thread_id, self.WM_APP, 0, 0)
+
+    def close(self) -> None:
+        for hook in self._hooks:
+            if hook:
+                self._user32.UnhookWinEvent(hook)
+        self._hooks = []
+
+
+# ----- X11 (libxcb) -----------------------------------------------------------
+
+class _XcbCookie(ctypes.Structure):
+    _fields_ = [('sequence', ctypes.c_uint)]
+
+
+class _XcbScreenIterator(ctypes.Structure):
+    _fields_ = [('data', ctypes.c_void_p), ('rem', ctypes.c_int),
+                ('index', ctypes.c_int)]
+
+
+class _XcbScreen(ctypes.Structure):
+    # Leading fields of xcb_screen_t; only ever read through a pointer.
+    _fields_ = [('root', ctypes.c_uint32),
+                ('default_colormap', ctypes.c_uint32),
+                ('white_pixel', ctypes.c_uint32),
+                ('black_pixel', ctypes.c_uint32),
+                ('current_input_masks', ctypes.c_uint32),
+                ('width_in_pixels', ctypes.c_uint16),
+                ('height_in_pixels', ctypes.c_uint16)]
+
+
+class _XcbReplyHeader(ctypes.Structure):
+    _fields_ = [('response_type', ctypes.c_uint8), ('pad0', ctypes.c_uint8),
+                ('sequence', ctypes.c_uint16), ('length', ctypes.c_uint32)]
+
+
+class _XcbInternAtomReply(ctypes.Structure):
+    _fields_ = [('header', _XcbReplyHeader), ('atom', ctypes.c_uint32)]
+
+
+class _XcbGetPropertyReply(ctypes.Structure):
+    _fields_ = [('response_type', ctypes.c_uint8), ('format', ctypes.c_uint8),
+                ('sequence', ctypes.c_uint16), ('length', ctypes.c_uint32),
+                ('type', ctypes.c_uint32), ('bytes_after', ctypes.c_uint32),
+                ('value_len', ctypes.c_uint32), ('pad0', ctypes.c_uint8 * 12)]
+
+
+class _XcbGetGeometryReply(ctypes.Structure):
+    _fields_ = [('response_type', ctypes.c_uint8), ('depth', ctypes.c_uint8),
+                ('sequence', ctypes.c_uint16), ('length', ctypes.c_uint32),
+                ('root', ctypes.c_uint32), ('x', ctypes.c_int16),
+                ('y', ctypes.c_int16), ('width', ctypes.c_uint16),
+                ('height', ctypes.c_uint16), ('border_width', ctypes.c_uint16)]
+
+
+class _XcbRandrQueryVersionReply(ctypes.Structure):
+    _fields_ = [('header', _XcbReplyHeader), ('major_version', ctypes.c_uint32),
+                ('minor_version', ctypes.c_uint32)]
+
+
+# xcb_randr_monitor_info_t without its trailing output ids.
+_RANDR_MONITOR = struct.Struct('=IBBHhhHHII')
+
+
+class _XcbTranslateCoordinatesReply(ctypes.Structure):
+    _fields_ = [('response_type', ctypes.c_uint8), ('same_screen', ctypes.c_uint8),
+                ('sequence', ctypes.c_uint16), ('length', ctypes.c_uint32),
+                ('child', ctypes.c_uint32), ('dst_x', ctypes.c_int16),
+                ('dst_y', ctypes.c_int16)]
+
+
+_XCB_ATOM_ANY = 0
+_XCB_ATOM_CARDINAL = 6
+_XCB_ATOM_STRING = 31
+_XCB_ATOM_WINDOW = 33
+_XCB_ATOM_WM_NAME = 39
+_XCB_ATOM_WM_CLASS = 67
+
+# Longest title / WM_CLASS fetched, in 32-bit units.
+_TITLE_LONGS = 256
+_CLASS_LONGS = 32
+
+
+_XCB_CW_EVENT_MASK = 1 << 11
+_XCB_EVENT_MASK_STRUCTURE_NOTIFY = 1 << 17
+_XCB_EVENT_MASK_SUBSTRUCTURE_NOTIFY = 1 << 19
+_XCB_EVENT_MASK_PROPERTY_CHANGE = 1 << 22
+_XCB_RANDR_NOTIFY_MASK_SCREEN_CHANGE = 1
+_XCB_RANDR_NOTIFY_MASK_CRTC_CHANGE = 2
+_XCB_RANDR_NOTIFY_MASK_OUTPUT_CHANGE = 4
+_XCB_CREATE_NOTIFY = 16
+_XCB_DESTROY_NOTIFY = 17
+_XCB_MAP_NOTIFY = 19
+_XCB_CONFIGURE_NOTIFY = 22
+_XCB_PROPERTY_NOTIFY = 28
+
+
+def _load_xcb():
+    """Load libxcb and libc and declare the functions X11Source uses."""
+    import ctypes.util  # pulls in subprocess and friends; only X11 needs it
+    path = ctypes.util.find_library('xcb')
+    if path is None:
+        raise OSError('libxcb not found')
+    xcb = ctypes.CDLL(path)
+    libc = ctypes.CDLL(ctypes.util.find_library('c'))
+
+    conn = ctypes.c_void_p
+    reply_p = ctypes.c_void_p
+    err_pp = ctypes.POINTER(ctypes.c_void_p)
+    u8, u16, u32, i16 = ctypes.c_uint8, ctypes.c_uint16, ctypes.c_uint32, ctypes.c_int16
+
+    def declare(name, restype, *argtypes):
+        _declare(xcb, name, restype, *argtypes)
+
+    declare('xcb_connect', conn, ctypes.c_char_p, ctypes.POINTER(ctypes.c_int))
+    declare('xcb_connection_has_error', ctypes.c_int, conn)
+    declare('xcb_disconnect', None, conn)
+    declare('xcb_discard_reply', None, conn, ctypes.c_uint)
+    declare('xcb_get_setup', ctypes.c_void_p, conn)
+    declare('xcb_setup_roots_iterator', _XcbScreenIterator, ctypes.c_void_p)
+    declare('xcb_screen_next', None, ctypes.POINTER(_XcbScreenIterator))
+    declare('xcb_intern_atom', _XcbCookie, conn, u8, u16, ctypes.c_char_p)
+    declare('xcb_intern_atom_reply', ctypes.POINTER(_XcbInternAtomReply),
+            conn, _XcbCookie, err_pp)
+    declare('xcb_get_property', _XcbCookie, conn, u8, u32, u32, u32, u32, u32)
+    declare('xcb_get_property_reply', ctypes.POINTER(_XcbGetPropertyReply),
+            conn, _XcbCookie, err_pp)
+    declare('xcb_get_property_value', ctypes.c_void_p,
+            ctypes.POINTER(_XcbGetPropertyReply))
+    declare('xcb_get_property_value_length', ctypes.c_int,
+            ctypes.POINTER(_XcbGetPropertyReply))
+    declare('xcb_get_geometry', _XcbCookie, conn, u32)
+    declare('xcb_get_geometry_reply', ctypes.POINTER(_XcbGetGeometryReply),
+            conn, _XcbCookie, err_pp)
+    declare('xcb_translate_coordinates', _XcbCookie, conn, u32, u32, i16, i16)
+    declare('xcb_translate_coordinates_reply',
+            ctypes.POINTER(_XcbTranslateCoordinatesReply), conn, _XcbCookie, err_pp)
+    declare('xcb_query_tree', _XcbCookie, conn, u32)
+    declare('xcb_query_tree_reply', reply_p, conn, _XcbCookie, err_pp)
+    declare('xcb_query_tree_children', ctypes.POINTER(u32), reply_p)
+    declare('xcb_query_tree_children_length', ctypes.c_int, reply_p)
+    declare('xcb_change_window_attributes', _XcbCookie, conn, u32, u32,
+            ctypes.POINTER(u32))
+    declare('xcb_configure_window', _XcbCookie, conn, u32, u16,
+            ctypes.POINTER(u32))
+    declare('xcb_flush', ctypes.c_int, conn)
+    declare('xcb_get_file_descriptor', ctypes.c_int, conn)
+    declare('xcb_poll_for_event', ctypes.POINTER(ctypes.c_uint8), conn)
+    libc.free.restype = None
+    libc.free.argtypes = (ctypes.c_void_p,)
+    return xcb, libc
+
+
+def _load_xcb_randr():
+    """Load libxcb-randr for monitor layouts, or return None."""
+    import ctypes.util
+    path = ctypes.util.find_library('xcb-randr')
+    if path is None:
+        return None
+    randr = ctypes.CDLL(path)
+    conn = ctypes.c_void_p
+    err_pp = ctypes.POINTER(ctypes.c_void_p)
+    u8, u16, u32 = ctypes.c_uint8, ctypes.c_uint16, ctypes.c_uint32
+    _declare(randr, 'xcb_randr_query_version', _XcbCookie, conn, u32, u32)
+    _declare(randr, 'xcb_randr_query_version_reply',
+             ctypes.POINTER(_XcbRandrQueryVersionReply), conn, _XcbCookie, err_pp)
+    _declare(randr, 'xcb_randr_select_input', _XcbCookie, conn, u32, u16)
+    _declare(randr, 'xcb_randr_get_monitors', _XcbCookie, conn, u32, u8)
+    _declare(randr, 'xcb_randr_get_monitors_reply', ctypes.c_void_p,
+             conn, _XcbCookie, err_pp)
+    return randr
+
+
+def _declare(lib, name, restype, *argtypes):
+    fn = getattr(lib, name)
+    fn.restype = restype
+    fn.argtypes = argtypes
+
+
+def _parse_randr_monitors(reply_address: int) -> list[tuple[int, int, int, int]]:
+    """(x, y, width, height) of each monitor in an xcb_randr_get_monitors
+    reply: a 32-byte header (u32 length at 4, u32 n_monitors at 12), then
+    per monitor 24 bytes of xcb_randr_monitor_info_t and its output ids."""
+    length, = struct.unpack_from('=I', ctypes.string_at(reply_address + 4, 4))
+    data = ctypes.string_at(reply_address, 32 + 4 * length)
+    n_monitors, = struct.unpack_from('=I', data, 12)
+    monitors = []
+    offset = 32
+    for _ in range(n_monitors):
+        (_name, _primary, _automatic, n_outputs, x, y, width, height,
+         _mm_w, _mm_h) = _RANDR_MONITOR.unpack_from(data, offset)
+        monitors.append((x, y, width, height))
+        offset += _RANDR_MONITOR.size + 4 * n_outputs
+    return monitors
+
+
+class X11Source(WindowSource):
+    """Top-level windows of an X11 session, read through libxcb.
+
+    Windows come from the window manager's _NET_CLIENT_LIST (or, without
+    an EWMH window manager, e.g. a bare Xvfb, the root's children). Titles
+    come from _NET_WM_NAME (UTF-8) or WM_NAME, and the executable from
+    _NET_WM_PID and /proc/<pid>/exe, so only local clients are recognised.
+    Window rects are those of the client window, inside the window
+    manager's frame; the page area isn't measured.
+    """
+
+    name = 'x11'
+    live = True
+    browser_exes = ('chrome', 'chromium', 'chromium-browser', 'firefox',
+                    'firefox-bin', 'firefox-esr', 'msedge')
+    # WM_CLASS is (instance, class), e.g. ("Navigator", "firefox") or
+    # ("google-chrome", "Google-chrome"); either may match.
+    browser_classes = ('google-chrome', 'chromium', 'chromium-browser',
+                       'firefox', 'firefox-esr', 'navigator', 'microsoft-edge')
+
+    def __init__(self, display: str | None = None):
+        super().__init__()
+        self.display = display
+        self._xcb, self._libc = _load_xcb()
+        screen_num = ctypes.c_int(0)
+        self._conn = self._xcb.xcb_connect(
+            display.encode() if display else None, ctypes.byref(screen_num))
+        if self._xcb.xcb_connection_has_error(self._conn):
+            self._xcb.xcb_disconnect(self._conn)
+            self._conn = None
+            raise OSError(f'cannot connect to X display '
+                          f'{display or os.environ.get("DISPLAY", "")!r}')
+        it = self._xcb.xcb_setup_roots_iterator(self._xcb.xcb_get_setup(self._conn))
+        for _ in range(screen_num.value):
+            self._xcb.xcb_screen_next(ctypes.byref(it))
+        self.root = _XcbScreen.from_address(it.data).root
+        self._atoms = self._intern_atoms(
+            '_NET_CLIENT_LIST', '_NET_WM_NAME', '_NET_WM_PID', 'UTF8_STRING')
+        self.processes = ProcessExeCache(_LinuxProcessPins())
+        self._randr = self._init_randr()
+        self._topology_events = 0
+        # Root resizes and RandR changes arrive as events on this connection;
+        # nothing else is selected on it, so any event invalidates the
+        # monitor layout.
+        value = ctypes.c_uint32(_XCB_EVENT_MASK_STRUCTURE_NOTIFY)
+        self._xcb.xcb_change_window_attributes(
+            self._conn, self.root, _XCB_CW_EVENT_MASK, ctypes.byref(value))
+        self._xcb.xcb_flush(self._conn)
+
+    def close(self) -> None:
+        if getattr(self, '_conn', None):
+            self._xcb.xcb_disconnect(self._conn)
+            self._conn = None
+            self.processes.clear()
+
+    def __del__(self):
+        self.close()
+
+    def change_feed(self):
+        return _X11ChangeFeed(self.display)
+
+    def window_feed(self, handle: int):
+        return _X11WindowFeed(self.display, handle)
+
+    # Reply helpers: every xcb_*_reply() result and error is malloc'd and
+    # must be freed; errors are requested explicitly so they don't pile up
+    # in the event queue.
+
+    def _reply(self, reply_fn, cookie):
+        err = ctypes.c_void_p()
+        reply = reply_fn(self._conn, cookie, ctypes.byref(err))
+        if err.value:
+            self._libc.free(err)
+        return reply
+
+    def _free(self, reply) -> None:
+        if reply:
+            self._libc.free(ctypes.cast(reply, ctypes.c_void_p))
+
+    def _intern_atoms(self, *names: str) -> dict[str, int]:
+        xcb = self._xcb
+        cookies = [xcb.xcb_intern_atom(self._conn, 0, len(n), n.encode())
+                   for n in names]
+        atoms = {}
+        for name, cookie in zip(names, cookies):
+            reply = self._reply(xcb.xcb_intern_atom_reply, cookie)
+            atoms[name] = reply.contents.atom if reply else 0
+            self._free(reply)
+        return atoms
+
+    def _property_cookie(self, window: int, atom: int, type_: int, longs: int):
+        return self._xcb.xcb_get_property(self._conn, 0, window, atom, type_,
+                                          0, longs)
+
+    def _property_value(self, cookie) -> tuple[int, bytes]:
+        """Return (format, raw value) for a get_property cookie; (0, b'')
+        if the property is missing or the window has gone."""
+        xcb = self._xcb
+        reply = self._reply(xcb.xcb_get_property_reply, cookie)
+        if not reply:
+            return 0, b''
+        try:
+            length = xcb.xcb_get_property_value_length(reply)
+            value = ctypes.string_at(xcb.xcb_get_property_value(reply), length)
+            return reply.contents.format, value
+        finally:
+            self._free(reply)
+
+    def _top_level_windows(self) -> list[int]:
+        fmt, value = self._property_value(self._property_cookie(
+            self.root, self._atoms['_NET_CLIENT_LIST'], _XCB_ATOM_WINDOW, 4096))
+        if fmt == 32:
+            return list(memoryview(value).cast('I'))
+        # No EWMH window manager: fall back to the root's children.
+        return self._root_children()
+
+    def _root_children(self) -> list[int]:
+        xcb = self._xcb
+        reply = self._reply(xcb.xcb_query_tree_reply,
+                            xcb.xcb_query_tree(self._conn, self.root))
+        if not reply:
+            return []
+        try:
+            n = xcb.xcb_query_tree_children_length(reply)
+            return xcb.xcb_query_tree_children(reply)[:n]
+        finally:
+            self._free(reply)
+
+    def _discard(self, *cookies) -> None:
+        for cookie in cookies:
+            self._xcb.xcb_discard_reply(self._conn, cookie.sequence)
+
+    def browser_windows(self, title_stages=()) -> list[tuple[int, str, str]]:
+        atoms = self._atoms
+        windows = self._top_level_windows()
+        # Send every request before reading any reply: one round trip. The
+        # replies of windows an earlier stage rejects are discarded unread.
+        cookies = [(self._property_cookie(w, _XCB_ATOM_WM_CLASS,
+                                          _XCB_ATOM_STRING, _CLASS_LONGS),
+                    self._property_cookie(w, atoms['_NET_WM_NAME'],
+                                          atoms['UTF8_STRING'], _TITLE_LONGS),
+                    self._property_cookie(w, _XCB_ATOM_WM_NAME,
+                                          _XCB_ATOM_ANY, _TITLE_LONGS),
+                    self._property_cookie(w, atoms['_NET_WM_PID'],
+                                          _XCB_ATOM_CARDINAL, 1))
+                   for w in windows]
+        found: list[tuple[int, str, str]] = []
+        counts = self._new_pass(title_stages)
+        counts['windows'] = len(windows)
+        for window, (wm_class, net_name, wm_name, pid) in zip(windows, cookies):
+            names = self._property_value(wm_class)[1].lower().split(b'\0')
+            if not any(n.decode('latin-1') in self.browser_classes for n in names):
+                self._discard(net_name, wm_name, pid)
+                continue
+            counts['class'] += 1
+            title = self._property_value(net_name)[1].decode('utf-8', 'replace')
+            if title:
+                self._discard(wm_name)
+            else:
+                title = self._property_value(wm_name)[1].decode('latin-1')
+            if not title or not self._title_passes(title, title_stages, counts):
+                self._discard(pid)
+                continue
+            fmt, pid_value = self._property_value(pid)
+            if fmt != 32 or len(pid_value) < 4:
+                continue
+            exe = self.processes.exe(int.from_bytes(pid_value[:4], sys.byteorder))
+            if exe in self.browser_exes:
+                counts['process'] += 1
+                found.append((window, title, exe))
+        self.processes.end_pass()
+        self._end_pass(counts)
+        return found
+
+    def window_rect(self, handle: int) -> tuple[int, int, int, int] | None:
+        xcb = self._xcb
+        origin_cookie = xcb.xcb_translate_coordinates(
+            self._conn, handle, self.root, 0, 0)
+        geometry_cookie = xcb.xcb_get_geometry(self._conn, handle)
+        origin = self._reply(xcb.xcb_translate_coordinates_reply, origin_cookie)
+        geometry = self._reply(xcb.xcb_get_geometry_reply, geometry_cookie)
+        try:
+            if not origin or not geometry:
+                return None
+            x, y = origin.contents.dst_x, origin.contents.dst_y
+            return (x, y, x + geometry.contents.width, y + geometry.contents.height)
+        finally:
+            self._free(origin)
+            self._free(geometry)
+
+    def window_title(self, handle: int) -> str | None:
+        net_name = self._property_cookie(handle, self._atoms['_NET_WM_NAME'],
+                                         self._atoms['UTF8_STRING'], _TITLE_LONGS)
+        wm_name = self._property_cookie(handle, _XCB_ATOM_WM_NAME,
+                                        _XCB_ATOM_ANY, _TITLE_LONGS)
+        title = self._property_value(net_name)[1].decode('utf-8', 'replace')
+        if title:
+            self._discard(wm_name)
+            return title
+        fmt, value = self._property_value(wm_name)
+        # No WM_NAME at all (format 0) once the window has been destroyed.
+        return value.decode('latin-1') if fmt else None
+
+    def windows_titled(self, title: str) -> list[int]:
+        # Override-redirect windows such as ScoreBlocker's aren't managed,
+        # so they're only found among the root's children, not in
+        # _NET_CLIENT_LIST. One round trip for all the names.
+        windows = self._root_children()
+        cookies = [self._property_cookie(w, self._atoms['_NET_WM_NAME'],
+                                         self._atoms['UTF8_STRING'], _TITLE_LONGS)
+                   for w in windows]
+        wanted = title.encode('utf-8')
+        return [w for w, cookie in zip(windows, cookies)
+                if self._property_value(cookie)[1] == wanted]
+
+    def move_window(self, handle: int, rect: tuple[int, int, int, int]) -> bool:
+        x, y, w, h = rect
+        # X, Y, WIDTH, HEIGHT, in that order; coordinates are INT32 on the wire.
+        values = (ctypes.c_uint32 * 4)(x & 0xFFFFFFFF, y & 0xFFFFFFFF, w, h)
+        self._xcb.xcb_configure_window(self._conn, handle, 0x0F, values)
+        return self._xcb.xcb_flush(self._conn) > 0
+
+    def _init_randr(self):
+        """libxcb-randr, if the server has RandR 1.5 (GetMonitors) and the
+        connection is now selected for its screen-change events."""
+        randr = _load_xcb_randr()
+        if randr is None:
+            return None
+        reply = self._reply(randr.xcb_randr_query_version_reply,
+                            randr.xcb_randr_query_version(self._conn, 1, 5))
+        if not reply:
+            return None
+        version = (reply.contents.major_version, reply.contents.minor_version)
+        self._free(reply)
+        if version < (1, 5):
+            return None
+        randr.xcb_randr_select_input(
+            self._conn, self.root, _XCB_RANDR_NOTIFY_MASK_SCREEN_CHANGE
+            | _XCB_RANDR_NOTIFY_MASK_CRTC_CHANGE | _XCB_RANDR_NOTIFY_MASK_OUTPUT_CHANGE)
+        return randr
+
+    def _topology_signature(self):
+        # Polling for queued events is a non-blocking local read, not a
+        # round trip to the server.
+        while True:
+            event = self._xcb.xcb_poll_for_event(self._conn)
+            if not event:
+                break
+            self._topology_events += 1
+            self._free(event)
+        return self._topology_events
+
+    def _enumerate_monitors(self) -> list[tuple[int, int, int, int]]:
+        xcb = self._xcb
+        if self._randr is not None:
+            reply = self._reply(self._randr.xcb_randr_get_monitors_reply,
+                                self._randr.xcb_randr_get_monitors(
+                                    self._conn, self.root, 1))
+            if reply:
+                try:
+                    monitors = _parse_randr_monitors(reply)
+                finally:
+                    self._free(reply)
+                if monitors:
+                    return monitors
+        # No RandR 1.5: the whole X screen is one monitor.
+        geometry = self._reply(xcb.xcb_get_geometry_reply,
+                               xcb.xcb_get_geometry(self._conn, self.root))
+        if not geometry:
+            return []
+        try:
+            return [(0, 0, geometry.contents.width, geometry.contents.height)]
+        finally:
+            self._free(geometry)
+
+
+class _X11ChangeFeed:
+    """PropertyNotify / structure events on a connection of its own.
+
+    The root window is watched for _NET_CLIENT_LIST changes and for windows
+    being created, destroyed, mapped or unmapped; every top-level window for
+    title changes (re-selected whenever the window list changes). wait()
+    sleeps in select() on the X connection and a wake-up pipe.
+    """
+
+    def __init__(self, display: str | None):
+        self._x = X11Source(display)
+        self._xcb = self._x._xcb
+        self._conn = self._x._conn
+        self._title_atoms = {self._x._atoms['_NET_WM_NAME'], _XCB_ATOM_WM_NAME}
+        self._list_atom = self._x._atoms['_NET_CLIENT_LIST']
+        self._wake_r, self._wake_w = os.pipe()
+        self._poller = select.poll()
+        self._poller.register(self._xcb.xcb_get_file_descriptor(self._conn),
+                              select.POLLIN)
+        self._poller.register(self._wake_r, select.POLLIN)
+        self._watch()
+
+    def _watch(self) -> None:
+        self._select(self._x.root, _XCB_EVENT_MASK_PROPERTY_CHANGE
+                     | _XCB_EVENT_MASK_SUBSTRUCTURE_NOTIFY)
+        self._select_windows()
+
+    def _select(self, window: int, mask: int) -> None:
+        value = ctypes.c_uint32(mask)
+        self._xcb.xcb_change_window_attributes(
+            self._conn, window, _XCB_CW_EVENT_MASK, ctypes.byref(value))
+
+    def _select_windows(self) -> None:
+        for window in self._x._top_level_windows():
+            self._select(window, _XCB_EVENT_MASK_PROPERTY_CHANGE)
+        self._xcb.xcb_flush(self._conn)
+
+    def _drain(self) -> bool:
+        """Consume queued events; True if any is a relevant change."""
+        changed = windows_changed = False
+        while True:
+            event = self._xcb.xcb_poll_for_event(self._conn)
+            if not event:
+                break
+            kind = event[0] & 0x7f
+            if kind == _XCB_PROPERTY_NOTIFY:
+                atom = int.from_bytes(bytes(event[8:12]), sys.byteorder)
+                if atom == self._list_atom:
+                    changed = windows_changed = True
+                elif atom in self._title_atoms:
+                    changed = True
+            elif _XCB_CREATE_NOTIFY <= kind <= _XCB_MAP_NOTIFY:
+                changed = windows_changed = True
+            self._x._free(event)
+        if windows_changed:
+            self._select_windows()
+        return changed
+
+    def wait(self, timeout: float | None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._drain():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            ready = self._poller.poll(
+                None if remaining is None else remaining * 1000)
+            if any(fd == self._wake_r for fd, _events in ready):
+                os.read(self._wake_r, 64)
+                return self._drain()
+            if self._xcb.xcb_connection_has_error(self._conn):
+                raise OSError('X connection lost')
+        return True
+
+    def wake(self) -> None:
+        os.write(self._wake_w, b'w')
+
+    def close(self) -> None:
+        self._x.close()
+        for fd in (self._wake_r, self._wake_w):
+            os.close(fd)
+
+
+class _X11WindowFeed(_X11ChangeFeed):
+    """Structure and title events of a single window.
+
+    ConfigureNotify covers resizes and fullscreen toggles, and the
+    synthetic ConfigureNotify a reparenting window manager sends when it
+    moves the frame. The connection's root StructureNotify selection (see
+    X11Source) reports screen resizes too.
+    """
+
+    def __init__(self, display: str | None, window: int):
+        self._window = window
+        super().__init__(display)
+
+    def _watch(self) -> None:
+        self._select(self._window, _XCB_EVENT_MASK_STRUCTURE_NOTIFY
+                     | _XCB_EVENT_MASK_PROPERTY_CHANGE)
+        self._xcb.xcb_flush(self._conn)
+
+    def _drain(self) -> bool:
+        changed = False
+        while True:
+            event = self._xcb.xcb_poll_for_event(self._conn)
+            if not event:
+                break
+            kind = event[0] & 0x7f
+            if kind == _XCB_PROPERTY_NOTIFY:
+                atom = int.from_bytes(bytes(event[8:12]), sys.byteorder)
+                if atom in self._title_atoms:
+                    changed = True
+            elif _XCB_DESTROY_NOTIFY <= kind <= _XCB_CONFIGURE_NOTIFY:
+                changed = True
+            self._x._free(event)
+        return changed
+
+
+# ----- Replay -----------------------------------------------------------------
+
+class ReplaySource(WindowSource):
+    """Replays a recorded (or synthetic) desktop from a snapshot dict:
+
+        {"backend": "win32",
+         "windows":  [{"handle": 1, "title": "...", "exe": "chrome.exe",
+                       "class": "Chrome_WidgetWin_1",
+                       "rect": [left, top, right, bottom],
+                       "client": [...], "content": [...]}, ...],
+         "monitors": [[left, top, width, height], ...]}
+
+    Windows go through the same filter stages as on a live backend ("class"
+    is optional; windows without one pass the class stage). "client"
+    defaults to "rect", and without "content" the page area is unknown.
+    Monitor lookup picks the monitor containing the point, else the nearest.
+    """
+
+    name = 'replay'
+    browser_exes = Win32Source.browser_exes + X11Source.browser_exes
+    browser_classes = Win32Source.browser_classes + X11Source.browser_classes
+
+    def __init__(self, snapshot: dict):
+        super().__init__()
+        self.snapshot = snapshot
+        self._windows = [(w['handle'], w['title'], w['exe'], w.get('class'))
+                         for w in snapshot['windows']]
+        self._rects = {w['handle']: tuple(w['rect']) for w in snapshot['windows']}
+        self._clients = {w['handle']: tuple(w['client'])
+                         for w in snapshot['windows'] if w.get('client')}
+        self._contents = {w['handle']: tuple(w['content'])
+                          for w in snapshot['windows'] if w.get('content')}
+        self._monitors = [tuple(m) for m in snapshot['monitors']]
+        self.unscaled_rects = snapshot.get('backend') == 'win32'
+
+    @classmethod
+    def load(cls, path: str) -> ReplaySource:
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def browser_windows(self, title_stages=()) -> list[tuple[int, str, str]]:
+        found = []
+        counts = self._new_pass(title_stages)
+        counts['windows'] = len(self._windows)
+        for handle, title, exe, window_class in self._windows:
+            if window_class is not None and window_class not in self.browser_classes:
+                continue
+            counts['class'] += 1
+            if not title or not self._title_passes(title, title_stages, counts):
+                continue
+            if exe in self.browser_exes:
+                counts['process'] += 1
+                found.append((handle, title, exe))
+        self._end_pass(counts)
+        return found
+
+    def window_rect(self, handle: int) -> tuple[int, int, int, int] | None:
+        return self._rects.get(handle)
+
+    def client_rect(self, handle: int) -> tuple[int, int, int, int] | None:
+        return self._clients.get(handle) or self._rects.get(handle)
+
+    def windows_titled(self, title: str) -> list[int]:
+        return [handle for handle, t, _exe, _class in self._windows if t == title]
+
+    def move_window(self, handle: int, rect: tuple[int, int, int, int]) -> bool:
+        if handle not in self._rects:
+            return False
+        x, y, w, h = rect
+        self._rects[handle] = (x, y, x + w, y + h)
+        self._clients.pop(handle, None)
+        self._contents.pop(handle, None)
+        return True
+
+    def content_rect(self, handle: int) -> tuple[int, int, int, int] | None:
+        return self._contents.get(handle)
+
+    def window_title(self, handle: int) -> str | None:
+        for window in self._windows:
+            if window[0] == handle:
+                return window[1]
+        return None
+
+    def _enumerate_monitors(self) -> list[tuple[int, int, int, int]]:
+        return self._monitors
+
+
+def record_snapshot(source: WindowSource) -> dict:
+    """Capture the browser windows (with rects) and the monitor layout from a
+    live source, in ReplaySource's snapshot format."""
+    windows = []
+    for handle, title, exe in source.browser_windows():
+        rect = source.window_rect(handle)
+        if rect is None:
+            continue
+        window = {'handle': handle, 'title': title, 'exe': exe,
+                  'rect': list(rect)}
+        for key, area in (('client', source.client_rect(handle)),
+                          ('content', source.content_rect(handle))):
+            if area is not None and area != rect:
+                window[key] = list(area)
+        windows.append(window)
+    monitors = [list(m) for m in source.monitors()]
+    return {'backend': source.name, 'windows': windows, 'monitors': monitors}
+
+
+# ----- Watching ----------------------------------------------------------------
+
+class WindowWatcher:
+    """Keeps a source's browser_windows(title_stages) up to date on a
+    background thread, so readers get the answer without enumerating.
+
+    The thread sleeps in the source's change feed (WinEvent hooks, X11
+    PropertyNotify) and re-enumerates only after something changed, once
+    a burst of events has settled, so it uses no CPU on an idle desktop. If
+    the feed can't be set up it polls every POLL_INTERVAL seconds instead.
+    """
+
+    POLL_INTERVAL = 5.0
+    # Events usually come in bursts (a page load retitles a window several
+    # times); wait this long for quiet before re-enumerating.
+    SETTLE = 0.05
+
+    def __init__(self, source: WindowSource, title_stages=()):
+        self.source = source
+        self.title_stages = title_stages
+        self.refreshes = 0
+        self._windows: list[tuple[int, str, str]] | None = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._feed = None
+        self._thread = threading.Thread(
+            target=self._run, name='window-watcher', daemon=True)
+
+    def start(self) -> WindowWatcher:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._feed is not None:
+            self._feed.wake()
+        self._thread.join(timeout=1.0)
+
+    def windows(self, timeout: float | None = None):
+        """The latest browser_windows() result, waiting up to `timeout`
+        seconds for the first enumeration; None if it isn't ready."""
+        if not self._ready.wait(timeout):
+            return None
+        return self._windows
+
+    def _refresh(self) -> None:
+        # Replace, never mutate: readers hold on to the list they got.
+        self._windows = self.source.browser_windows(self.title_stages)
+        self.refreshes += 1
+        self._ready.set()
+
+    def _run(self) -> None:
+        try:
+            self._feed = self.source.change_feed()
+        except OSError as e:
+            print(f'window_sources: no change notifications ({e}); polling')
+        try:
+            self._refresh()
+            while not self._stop.is_set():
+                if self._feed is None:
+                    self._stop.wait(self.POLL_INTERVAL)
+                elif not self._feed.wait(None):
+                    continue
+                else:
+                    while self._feed.wait(self.SETTLE):
+                        pass
+                if not self._stop.is_set():
+                    self._refresh()
+        except Exception as e:
+            print(f'window_sources: watcher stopped ({e})')
+            # Readers fall back to enumerating themselves.
+            self._windows = None
+        finally:
+            if self._feed is not None:
+                self._feed.close()
+
+
+class WindowFollower:
+    """Watches one window on a background thread and calls on_change()
+    (on that thread) whenever its rect, monitor or title changes, and a
+    last time when the window goes away.
+
+    Like WindowWatcher it sleeps in a change feed, here the source's
+    window_feed(), and looks at the window only once a burst of events has
+    settled; calls are at least MIN_INTERVAL seconds apart, however busy
+    the window is. Without a feed it polls every POLL_INTERVAL seconds.
+    """
+
+    POLL_INTERVAL = 1.0
+    # A drag or a fullscreen toggle is a stream of location events; wait
+    # for it to end.
+    SETTLE = 0.15
+    MIN_INTERVAL = 0.5
+
+    def __init__(self, source: WindowSource, handle: int, on_change):
+        self.source = source
+        self.handle = handle
+        self.on_change = on_change
+        self.changes = 0
+        self.state = self._read_state()
+        self._stop = threading.Event()
+        self._feed = None
+        self._thread = threading.Thread(
+            target=self._run, name='window-follower', daemon=True)
+
+    def start(self) -> WindowFollower:
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Ask the thread to end and wake it. By default this doesn't wait:
+        on_change() may be blocked handing a result to the thread calling
+        stop() (e.g. tk's), so joining there could deadlock. With `timeout`,
+        wait up to that long for the thread to finish."""
+        self._stop.set()
+        feed = self._feed
+        if feed is not None:
+            feed.wake()
+        if timeout is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    @property
+    def alive(self) -> bool:
+        return self.state is not None
+
+    def _read_state(self):
+        """(rect, monitor, title), or None once the window has gone."""
+        rect = self.source.window_rect(self.handle)
+        title = self.source.window_title(self.handle)
+        if rect is None or title is None:
+            return None
+        monitor = self.source.monitor_for_point((rect[0] + rect[2]) // 2,
+                                                (rect[1] + rect[3]) // 2)
+        return rect, monitor, title
+
+    def _run(self) -> None:
+        try:
+            self._feed = self.source.window_feed(self.handle)
+        except OSError as e:
+            print(f'window_sources: no events for window {self.handle} ({e}); '
+                  f'polling')
+        try:
+            last_call = 0.0
+            while self.state is not None and not self._stop.is_set():
+                if self._feed is None:
+                    self._stop.wait(self.POLL_INTERVAL)
+                elif not self._feed.wait(None):
+                    continue
+                else:
+                    while self._feed.wait(self.SETTLE):
+                        pass
+                delay = last_call + self.MIN_INTERVAL - time.monotonic()
+                if delay > 0:
+                    self._stop.wait(delay)
+                if self._stop.is_set():
+                    break
+                state = self._read_state()
+                if state != self.state:
+                    self.state = state
+                    self.changes += 1
+                    last_call = time.monotonic()
+                    self.on_change()
+        except Exception as e:
+            print(f'window_sources: follower stopped ({e})')
+        finally:
+            if self._feed is not None:
+                self._feed.close()
+
+
+# ----- Backend selection ------------------------------------------------------
+
+def default_source() -> WindowSource | None:
+    """Return the window source for this session, or None if there is none
+    (e.g. macOS, or Linux without an X display)."""
+    if sys.platform == 'win32':
+        return Win32Source()
+    if os.environ.get('DISPLAY'):
+        try:
+            return X11Source()
+        except OSError as e:
+            print(f'window_sources: X11 unavailable ({e})')
+    return None
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Record the browser windows and monitors of this desktop '
+                    'as a ReplaySource snapshot')
+    parser.add_argument('command', choices=['record'])
+    parser.add_argument('path', help='Snapshot JSON file to write')
+    args = parser.parse_args()
+
+    source = default_source()
+    if source is None:
+        sys.exit('No window source for this session')
+    snapshot = record_snapshot(source)
+    with open(args.path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, indent=1, ensure_ascii=False)
+    print(f"Recorded {len(snapshot['windows'])} browser windows on "
+          f"{len(snapshot['monitors'])} monitors to {args.path}")